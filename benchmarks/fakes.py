@@ -0,0 +1,397 @@
+# benchmarks/fakes.py
+"""
+In-process stand-ins for the Bedrock, S3 and DynamoDB calls the app makes.
+
+install_fakes() plugs them in through src.aws_clients.set_client_factory, so
+the application code runs unchanged. Each fake counts its calls and can add a
+fixed latency per call to model network round trips.
+"""
+import copy
+import hashlib
+import io
+import json
+import re
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.aws_clients import set_client_factory
+
+EMBEDDING_DIM = 1536
+
+
+def _sleep_ms(latency_ms: float):
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+
+
+class FakeBedrockRuntime:
+    """Answers Titan embedding and Claude Messages API calls with deterministic synthetic output."""
+
+    def __init__(self, latency_ms: float = 0.0, embedding_latency_ms: float = 0.0, dim: int = EMBEDDING_DIM):
+        self.latency_ms = latency_ms
+        self.embedding_latency_ms = embedding_latency_ms
+        self.dim = dim
+        self.calls = Counter()
+        self.tokens = Counter()
+
+    def invoke_model(self, body, modelId, accept=None, contentType=None, **kwargs):
+        payload = json.loads(body)
+        if "inputText" in payload:
+            self.calls["embedding"] += 1
+            _sleep_ms(self.embedding_latency_ms)
+            result = {"embedding": self._embed(payload["inputText"]), "inputTextTokenCount": len(payload["inputText"]) // 4}
+        else:
+            prompt = payload["messages"][-1]["content"]
+            kind, text = self._complete(prompt)
+            self.calls[f"claude:{kind}"] += 1
+            self.tokens["input"] += len(prompt) // 4
+            self.tokens["output"] += len(text) // 4
+            _sleep_ms(self.latency_ms)
+            result = {
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+            }
+        return {"body": io.BytesIO(json.dumps(result).encode("utf-8"))}
+
+    def invoke_model_with_response_stream(self, body, modelId, accept=None, contentType=None, chunk_chars: int = 64, **kwargs):
+        """Claude Messages API streaming; latency_ms is spread across the chunks like token generation."""
+        prompt = json.loads(body)["messages"][-1]["content"]
+        kind, text = self._complete(prompt)
+        self.calls[f"claude:{kind}"] += 1
+        self.tokens["input"] += len(prompt) // 4
+        self.tokens["output"] += len(text) // 4
+        chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+
+        def events():
+            yield {"type": "message_start", "message": {"usage": {"input_tokens": len(prompt) // 4, "output_tokens": 0}}}
+            yield {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}
+            for chunk in chunks:
+                _sleep_ms(self.latency_ms / len(chunks))
+                yield {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}}
+            yield {"type": "content_block_stop", "index": 0}
+            yield {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": len(text) // 4}}
+            yield {"type": "message_stop"}
+
+        return {"body": ({"chunk": {"bytes": json.dumps(event).encode("utf-8")}} for event in events())}
+
+    def _embed(self, text: str):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dim)
+        return (vector / np.linalg.norm(vector)).round(6).tolist()
+
+    def _complete(self, prompt: str):
+        if "<feedback id=" in prompt:
+            ids = re.findall(r'<feedback id="([^"]+)">', prompt)
+            return "feedback_packed", json.dumps([self._feedback_analysis(i) for i in ids])
+        if "interview feedback" in prompt:
+            analysis = self._feedback_analysis("single")
+            return "feedback", f"Summary: {analysis['summary']}\nStrengths: {', '.join(analysis['strengths'])}"
+        if "career path documents" in prompt:
+            return "job_description", json.dumps(self._career_levels(prompt))
+        if "from resumes" in prompt:
+            return "resume", json.dumps(self._profile(prompt))
+        if "interview question generator" in prompt:
+            return "questions", "\n".join(f"{i}. Describe a project where you used skill #{i}." for i in range(1, 11))
+        return "other", "OK"
+
+    @staticmethod
+    def _feedback_analysis(feedback_id: str) -> Dict:
+        return {
+            "id": feedback_id,
+            "summary": "Technically solid candidate with room to grow in system design.",
+            "strengths": ["Python", "Problem solving"],
+            "improvements": ["System design trade-offs"],
+            "examples": ["Solved the coding exercise with clean code"],
+        }
+
+    @staticmethod
+    def _profile(prompt: str) -> Dict:
+        text = prompt.split('"""', 1)[-1]
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        skills_line = next((line for line in lines if line.startswith("Skills:")), "Skills: ")
+        email = re.search(r"[\w.+-]+@[\w.-]+", text)
+        return {
+            "name": lines[0] if lines else "Unknown",
+            "contact": {"email": email.group(0) if email else None, "phone": None, "linkedin": None},
+            "education": [],
+            "experience": [{"title": "Engineer", "company": "Acme", "start_date": "January 2020", "end_date": "Present",
+                            "duration": "4 years", "responsibilities": ["Built pipelines"]}],
+            "projects": [],
+            "skills": [s.strip() for s in skills_line[len("Skills:"):].split(",") if s.strip()],
+        }
+
+    @staticmethod
+    def _career_levels(prompt: str):
+        levels = []
+        for level, emoji, years in (("Junior", "🟢", "0-2 years"), ("Mid-Level", "🔵", "2-5 years"),
+                                    ("Senior", "🔴", "5-8 years"), ("Principal", "⚫", "8+ years")):
+            levels.append({
+                "level": level, "title": f"{emoji} {level} Engineer", "experience": years,
+                "focus": "Delivery", "core_requirements": ["Python"], "soft_skills": ["Communication"],
+                "technologies_mentioned": ["Python", "AWS"],
+            })
+        return levels
+
+
+class _FakePaginator:
+    def __init__(self, s3: "FakeS3"):
+        self.s3 = s3
+
+    def paginate(self, Bucket, Prefix="", PageSize=1000, **kwargs):
+        keys = sorted(k for k in self.s3.objects if k.startswith(Prefix))
+        for start in range(0, max(len(keys), 1), PageSize):
+            self.s3.calls["list_objects_v2"] += 1
+            _sleep_ms(self.s3.latency_ms)
+            page = keys[start:start + PageSize]
+            yield {"Contents": [{"Key": k, "Size": len(self.s3.objects[k])} for k in page]} if page else {}
+
+
+class FakeS3:
+    """Serves a dict of key -> bytes; bucket names are ignored."""
+
+    def __init__(self, objects: Optional[Dict[str, bytes]] = None, latency_ms: float = 0.0):
+        self.objects = dict(objects or {})
+        self.latency_ms = latency_ms
+        self.calls = Counter()
+
+    def get_paginator(self, operation_name):
+        assert operation_name == "list_objects_v2", operation_name
+        return _FakePaginator(self)
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        page = next(iter(_FakePaginator(self).paginate(Bucket, Prefix)))
+        return page
+
+    def download_fileobj(self, Bucket, Key, Fileobj, **kwargs):
+        self.calls["download"] += 1
+        _sleep_ms(self.latency_ms)
+        Fileobj.write(self.objects[Key])
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.calls["get_object"] += 1
+        _sleep_ms(self.latency_ms)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def _attribute(item: Dict, name: str):
+    value = item
+    for part in name.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _evaluate_condition(condition, item: Dict) -> bool:
+    """Evaluates the subset of boto3.dynamodb.conditions the app uses against a stored item."""
+    expression = condition.get_expression()
+    operator, values = expression["operator"], expression["values"]
+    if operator == "AND":
+        return all(_evaluate_condition(v, item) for v in values)
+    if operator == "OR":
+        return any(_evaluate_condition(v, item) for v in values)
+    if operator == "NOT":
+        return not _evaluate_condition(values[0], item)
+    attribute, *operands = values
+    actual = _attribute(item, attribute.name)
+    if operator == "=":
+        return actual == operands[0]
+    if operator == "<>":
+        return actual != operands[0]
+    if operator == "IN":
+        return actual in operands[0]
+    if operator == "begins_with":
+        return isinstance(actual, str) and actual.startswith(operands[0])
+    if operator == "attribute_exists":
+        return actual is not None
+    if operator == "attribute_not_exists":
+        return actual is None
+    raise NotImplementedError(f"FakeDynamoTable does not support operator {operator!r}")
+
+
+def _project(item: Dict, projection: Optional[str], names: Optional[Dict[str, str]]) -> Dict:
+    """Applies a ProjectionExpression (placeholders resolved through ExpressionAttributeNames)."""
+    if not projection:
+        return item
+    projected: Dict = {}
+    for path in projection.split(","):
+        *parents, leaf = [(names or {}).get(part, part) for part in path.strip().split(".")]
+        source, target = item, projected
+        for part in parents:
+            source = source.get(part) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(part, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return projected
+
+
+def _reject_floats(value):
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, dict):
+        for v in value.values():
+            _reject_floats(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _reject_floats(v)
+
+
+class FakeDynamoTable:
+    """Dict-backed table keyed by 'id'. Items are deep-copied in and out, like a real round trip."""
+
+    def __init__(self, name: str, latency_ms: float = 0.0, scan_page_size: Optional[int] = None):
+        self.name = name
+        self.items: Dict[str, Dict] = {}
+        self.latency_ms = latency_ms
+        self.scan_page_size = scan_page_size
+        self.calls = Counter()
+
+    def put_item(self, Item, ConditionExpression=None, **kwargs):
+        self.calls["put_item"] += 1
+        _reject_floats(Item)
+        _sleep_ms(self.latency_ms)
+        if ConditionExpression is not None and not _evaluate_condition(ConditionExpression, self.items.get(Item["id"], {})):
+            from botocore.exceptions import ClientError
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException",
+                                         "Message": "The conditional request failed"}}, "PutItem")
+        self.items[Item["id"]] = copy.deepcopy(Item)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        self.calls["get_item"] += 1
+        _sleep_ms(self.latency_ms)
+        item = self.items.get(Key["id"])
+        return {"Item": copy.deepcopy(item)} if item is not None else {}
+
+    def delete_item(self, Key, **kwargs):
+        self.calls["delete_item"] += 1
+        _sleep_ms(self.latency_ms)
+        self.items.pop(Key["id"], None)
+        return {}
+
+    def scan(self, FilterExpression=None, ExclusiveStartKey=None, ProjectionExpression=None,
+             ExpressionAttributeNames=None, **kwargs):
+        self.calls["scan"] += 1
+        _sleep_ms(self.latency_ms)
+        ids = sorted(self.items)
+        start = ids.index(ExclusiveStartKey["id"]) + 1 if ExclusiveStartKey else 0
+        end = start + self.scan_page_size if self.scan_page_size else len(ids)
+        page = [self.items[i] for i in ids[start:end]]
+        if FilterExpression is not None:
+            page = [item for item in page if _evaluate_condition(FilterExpression, item)]
+        page = [_project(item, ProjectionExpression, ExpressionAttributeNames) for item in page]
+        response = {"Items": copy.deepcopy(page), "Count": len(page), "ScannedCount": len(ids[start:end])}
+        if end < len(ids):
+            response["LastEvaluatedKey"] = {"id": ids[end - 1]}
+        return response
+
+    def load(self, items):
+        """Bulk-loads records, converting floats to Decimals the way DynamoDBHandler does."""
+        for item in items:
+            self.items[item["id"]] = _to_decimal(copy.deepcopy(item))
+
+
+def _to_decimal(value):
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_decimal(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_decimal(v) for v in value]
+    return value
+
+
+class FakeDynamoResource:
+    def __init__(self, latency_ms: float = 0.0, scan_page_size: Optional[int] = None,
+                 batch_get_limit: Optional[int] = None):
+        """
+        Args:
+            batch_get_limit: Keys served per batch_get_item call; the rest come back as
+                UnprocessedKeys, like a throttled or >16 MB request.
+        """
+        self.latency_ms = latency_ms
+        self.scan_page_size = scan_page_size
+        self.batch_get_limit = batch_get_limit
+        self.tables: Dict[str, FakeDynamoTable] = {}
+
+    def Table(self, name):
+        if name not in self.tables:
+            self.tables[name] = FakeDynamoTable(name, self.latency_ms, self.scan_page_size)
+        return self.tables[name]
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        responses, unprocessed = {}, {}
+        budget = self.batch_get_limit
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            keys = request["Keys"]
+            if len(keys) > 100:
+                raise ValueError("Too many items requested for the BatchGetItem call")
+            served = keys if budget is None else keys[:budget]
+            table.calls["batch_get_item"] += 1
+            _sleep_ms(table.latency_ms)
+            responses[name] = [copy.deepcopy(table.items[k["id"]]) for k in served if k["id"] in table.items]
+            if len(served) < len(keys):
+                unprocessed[name] = {"Keys": keys[len(served):]}
+            if budget is not None:
+                budget -= len(served)
+        return {"Responses": responses, "UnprocessedKeys": unprocessed}
+
+
+class FakeAWS:
+    """Bundle of fakes sharing one configuration; see install_fakes()."""
+
+    def __init__(self, s3_objects=None, bedrock_latency_ms=0.0, embedding_latency_ms=0.0,
+                 s3_latency_ms=0.0, dynamodb_latency_ms=0.0, scan_page_size=None, batch_get_limit=None):
+        self.bedrock = FakeBedrockRuntime(bedrock_latency_ms, embedding_latency_ms)
+        self.s3 = FakeS3(s3_objects, s3_latency_ms)
+        self.dynamodb = FakeDynamoResource(dynamodb_latency_ms, scan_page_size, batch_get_limit)
+
+    def factory(self, kind, service_name, region_name):
+        if kind == "client" and service_name == "bedrock-runtime":
+            return self.bedrock
+        if kind == "client" and service_name == "s3":
+            return self.s3
+        if kind == "resource" and service_name == "dynamodb":
+            return self.dynamodb
+        raise NotImplementedError(f"No fake for {kind} {service_name!r}")
+
+    def call_counts(self) -> Dict[str, int]:
+        counts = Counter({f"bedrock.{k}": v for k, v in self.bedrock.calls.items()})
+        counts.update({f"s3.{k}": v for k, v in self.s3.calls.items()})
+        for table in self.dynamodb.tables.values():
+            counts.update({f"dynamodb.{k}": v for k, v in table.calls.items()})
+        return dict(counts)
+
+    def reset_counts(self):
+        self.bedrock.calls.clear()
+        self.bedrock.tokens.clear()
+        self.s3.calls.clear()
+        for table in self.dynamodb.tables.values():
+            table.calls.clear()
+
+
+def install_fakes(**kwargs) -> FakeAWS:
+    """Routes every src.aws_clients client to a fresh FakeAWS (kwargs go to FakeAWS) and returns it."""
+    from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+
+    fakes = FakeAWS(**kwargs)
+    set_client_factory(fakes.factory)
+    get_dynamodb_handler.cache_clear()  # Cached handlers hold tables from the previous factory
+    return fakes
+
+
+def uninstall_fakes():
+    """Restores real boto3 clients."""
+    from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+
+    set_client_factory(None)
+    get_dynamodb_handler.cache_clear()
@@ -0,0 +1,473 @@
+# benchmarks/run_benchmarks.py
+"""
+Offline benchmarks for the app's hot paths.
+
+Runs against a synthetic corpus (benchmarks/synthetic.py) with Bedrock, S3 and
+DynamoDB replaced by in-process fakes (benchmarks/fakes.py), so no AWS access
+is needed. Results are written as JSON so runs can be compared over time.
+
+Usage:
+    python -m benchmarks.run_benchmarks --resumes 5000 --repeat 5
+    python -m benchmarks.run_benchmarks --only matching --compare benchmarks/results/bench_<earlier>.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from benchmarks.fakes import install_fakes, uninstall_fakes
+from benchmarks.synthetic import build_s3_objects, career_path_to_text, generate_corpus, resume_to_text
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# name -> setup(ctx) returning {"items": int, "run": callable} and optionally
+# "report": callable returning extra fields (e.g. quality metrics) for the results
+BENCHMARKS: Dict[str, Callable[[Dict], Dict]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _stored_records(ctx: Dict, kind: str) -> List[Dict]:
+    """Records as they come back from DynamoDB (embeddings as Decimals)."""
+    table = ctx["fakes"].dynamodb.Table("ResumeJobMatcher")
+    return [item for item in table.items.values() if item.get("type") == kind]
+
+
+def _preload_table(ctx: Dict):
+    table = ctx["fakes"].dynamodb.Table("ResumeJobMatcher")
+    table.items.clear()
+    table.load(ctx["corpus"]["resumes"])
+    table.load(ctx["corpus"]["job_descriptions"])
+
+
+# --- Matching -------------------------------------------------------------------
+
+@benchmark("matching.find_top_matches")
+def bench_find_top_matches(ctx):
+    from src.matching.semantic_matcher import find_top_matches
+
+    _preload_table(ctx)
+    resumes = _stored_records(ctx, "resume")
+    jds = _stored_records(ctx, "job_description")
+    return {"items": len(resumes), "run": lambda: find_top_matches(jds[0], resumes, similarity_threshold=0.0)}
+
+
+@benchmark("matching.find_top_matches_float")
+def bench_find_top_matches_float(ctx):
+    from src.matching.semantic_matcher import find_top_matches
+
+    resumes = ctx["corpus"]["resumes"]
+    jd = ctx["corpus"]["job_descriptions"][0]
+    return {"items": len(resumes), "run": lambda: find_top_matches(jd, resumes, similarity_threshold=0.0)}
+
+
+@benchmark("matching.find_top_matches_threshold_sweep")
+def bench_threshold_sweep(ctx):
+    from src.matching.semantic_matcher import clear_score_cache, find_top_matches
+    from src.storage.corpus_version import compute_corpus_version
+
+    resumes = ctx["corpus"]["resumes"]
+    jd = ctx["corpus"]["job_descriptions"][0]
+    version = compute_corpus_version(resumes)
+    thresholds = [round(0.5 + 0.01 * i, 2) for i in range(46)]  # Every stop of the app's slider
+
+    def run():
+        clear_score_cache()
+        return [find_top_matches(jd, resumes, similarity_threshold=t, corpus_version=version) for t in thresholds]
+
+    return {"items": len(thresholds), "run": run}
+
+
+@benchmark("matching.find_top_matches_prefiltered")
+def bench_find_top_matches_prefiltered(ctx):
+    from datetime import date
+    from src.matching.semantic_matcher import find_top_matches
+    from src.resume_processing.experience_parser import experience_fields
+    from src.search.filter_index import ResumeFilterIndex
+
+    # Experience parsed the way ingest does it, as of the synthetic corpus' storage date
+    resumes = [{**r, **experience_fields(r, today=date(2024, 1, 1))} for r in ctx["corpus"]["resumes"]]
+    jd = ctx["corpus"]["job_descriptions"][0]
+    start = time.perf_counter()
+    index = ResumeFilterIndex.build(resumes)
+    build_s = time.perf_counter() - start
+    filters = {"levels": ["Senior", "Principal"], "skills": ["python"]}
+
+    def report():
+        return {"index_build_s": round(build_s, 4), "candidates": int(len(index.select(**filters)))}
+
+    return {
+        "items": len(resumes),
+        "run": lambda: find_top_matches(jd, resumes, similarity_threshold=0.0, filters=filters, filter_index=index),
+        "report": report,
+    }
+
+
+@benchmark("matching.compressed_index")
+def bench_compressed_index(ctx):
+    from src.matching.compressed_index import CompressedEmbeddingIndex, recall_at_k
+
+    resumes = ctx["corpus"]["resumes"]
+    jds = ctx["corpus"]["job_descriptions"]
+    start = time.perf_counter()
+    index = CompressedEmbeddingIndex.build(resumes, n_components=ctx["args"].compressed_dims or None)
+    build_s = time.perf_counter() - start
+
+    def report():
+        return {
+            "build_s": round(build_s, 4),
+            "recall_at_10": round(recall_at_k(index, jds[:20], resumes, k=10), 4),
+            "memory": index.memory_stats(),
+        }
+
+    return {"items": len(resumes), "run": lambda: index.search(jds[0], similarity_threshold=0.0), "report": report}
+
+
+@benchmark("matching.materialized_lookup")
+def bench_materialized_lookup(ctx):
+    from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+    from src.matching.materialized_matches import get_materialized_matches, sync_match_tables
+
+    _preload_table(ctx)
+    handler = get_dynamodb_handler()
+    resumes = _stored_records(ctx, "resume")
+    jds = _stored_records(ctx, "job_description")
+    sync_match_tables(handler, resumes, jds)
+    return {"items": len(resumes),
+            "run": lambda: get_materialized_matches(handler, jds[0], resumes, similarity_threshold=0.0)}
+
+
+@benchmark("matching.perform_matching")
+def bench_perform_matching(ctx):
+    from src.matching.resume_job_matcher import perform_matching
+
+    resumes = ctx["corpus"]["resumes"][:ctx["args"].pairs]
+    jd = ctx["corpus"]["job_descriptions"][0]
+    return {"items": len(resumes), "run": lambda: [perform_matching(r, jd) for r in resumes]}
+
+
+# --- Loading and ingestion ------------------------------------------------------
+
+@benchmark("load_data.from_dynamodb")
+def bench_load_data_cached(ctx):
+    import main
+    from src.storage import corpus_snapshot
+
+    _preload_table(ctx)
+    corpus_snapshot.SNAPSHOT_PATH = ""  # Measure the scan, not the snapshot it writes
+    return {"items": len(ctx["corpus"]["resumes"]), "run": lambda: main.load_data(force_refresh=False)}
+
+
+@benchmark("load_data.from_snapshot")
+def bench_load_data_snapshot(ctx):
+    import tempfile
+    import main
+    from src.storage import corpus_snapshot
+
+    _preload_table(ctx)
+    corpus_snapshot.SNAPSHOT_PATH = os.path.join(tempfile.mkdtemp(), "corpus_snapshot.parquet")
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.load_data(force_refresh=False)  # First load scans storage and writes the snapshot
+    return {"items": len(ctx["corpus"]["resumes"]), "run": lambda: main.load_data(force_refresh=False)}
+
+
+@benchmark("load_data.refresh_from_s3")
+def bench_load_data_refresh(ctx):
+    import main
+
+    small = generate_corpus(ctx["args"].ingest_docs, max(1, ctx["args"].ingest_docs // 20), 0, ctx["args"].seed)
+    objects = build_s3_objects(small)
+
+    def run():
+        ctx["fakes"].s3.objects = objects
+        ctx["fakes"].dynamodb.Table("ResumeJobMatcher").items.clear()
+        return main.load_data(force_refresh=True)
+
+    return {"items": len(small["resumes"]) + len(small["job_descriptions"]) // 4, "run": run}
+
+
+@benchmark("storage.dynamodb_load_corpus")
+def bench_dynamodb_load_corpus(ctx):
+    from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
+
+    _preload_table(ctx)
+    handler = DynamoDBHandler("ResumeJobMatcher")
+    return {"items": len(ctx["corpus"]["resumes"]),
+            "run": lambda: (handler.get_all_resumes(), handler.get_all_job_descriptions())}
+
+
+@benchmark("storage.dynamodb_load_projections")
+def bench_dynamodb_load_projections(ctx):
+    from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
+
+    _preload_table(ctx)
+    handler = DynamoDBHandler("ResumeJobMatcher")
+    return {"items": len(ctx["corpus"]["resumes"]), "run": handler.get_resume_projections}
+
+
+@benchmark("storage.dynamodb_hydrate_top10")
+def bench_dynamodb_hydrate(ctx):
+    from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
+
+    _preload_table(ctx)
+    handler = DynamoDBHandler("ResumeJobMatcher")
+    pages = [[r["id"] for r in ctx["corpus"]["resumes"][i:i + 10]] for i in range(0, 500, 10)]
+
+    def run():
+        handler._hydrated.clear()
+        return [handler.hydrate(ids) for ids in pages]
+
+    return {"items": len(pages), "run": run}
+
+
+@benchmark("storage.sqlite_load_corpus")
+def bench_sqlite_load_corpus(ctx):
+    import tempfile
+    from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
+    from src.storage.sqlite_backend import SQLiteBackend
+
+    backend = SQLiteBackend(os.path.join(tempfile.mkdtemp(), "bench.sqlite3"))
+    backend.put_items(ctx["corpus"]["resumes"] + ctx["corpus"]["job_descriptions"])
+    handler = DynamoDBHandler("ResumeJobMatcher", backend=backend)
+    return {"items": len(ctx["corpus"]["resumes"]),
+            "run": lambda: (handler.get_all_resumes(), handler.get_all_job_descriptions())}
+
+
+@benchmark("ingestion.process_resume")
+def bench_process_resume(ctx):
+    from langchain_core.documents import Document
+    from src.resume_processing.information_extraction import process_resume
+
+    docs = [
+        Document(page_content=resume_to_text(r), metadata={"source": r["metadata"]["source"]})
+        for r in ctx["corpus"]["resumes"][:ctx["args"].ingest_docs]
+    ]
+
+    def run():
+        ctx["fakes"].dynamodb.Table("ResumeJobMatcher").items.clear()
+        return [process_resume(doc) for doc in docs]
+
+    return {"items": len(docs), "run": run}
+
+
+def _career_path_case(ctx, stream: bool):
+    from langchain_core.documents import Document
+    from src.job_description_processing.job_description_processor import extract_job_details_llm
+
+    by_source = {}
+    for jd in ctx["corpus"]["job_descriptions"]:
+        by_source.setdefault(jd["metadata"]["source"], []).append(jd)
+    docs = [Document(page_content=career_path_to_text(levels), metadata={"source": source})
+            for source, levels in by_source.items()]
+
+    def run():
+        ctx["fakes"].dynamodb.Table("ResumeJobMatcher").items.clear()
+        return [extract_job_details_llm(doc, stream=stream) for doc in docs]
+
+    return {"items": len(docs), "run": run}
+
+
+@benchmark("ingestion.extract_job_details_llm")
+def bench_extract_job_details(ctx):
+    return _career_path_case(ctx, stream=False)
+
+
+@benchmark("ingestion.extract_job_details_llm_streaming")
+def bench_extract_job_details_streaming(ctx):
+    return _career_path_case(ctx, stream=True)
+
+
+# --- Feedback -------------------------------------------------------------------
+
+def _feedback_texts(ctx):
+    return [item["text"] for item in ctx["corpus"]["feedback"]]
+
+
+@benchmark("feedback.keywords_single")
+def bench_keywords_single(ctx):
+    from src.feedback_processing.analysis.keyword_analyzer import analyze_keywords
+
+    texts = _feedback_texts(ctx)
+    return {"items": len(texts), "run": lambda: [analyze_keywords(t) for t in texts]}
+
+
+@benchmark("feedback.keywords_batch")
+def bench_keywords_batch(ctx):
+    from src.feedback_processing.analysis.keyword_analyzer import analyze_keywords_batch
+
+    texts = _feedback_texts(ctx)
+    return {"items": len(texts), "run": lambda: analyze_keywords_batch(texts)}
+
+
+@benchmark("feedback.sentiment_single")
+def bench_sentiment_single(ctx):
+    from src.feedback_processing.analysis.sentiment_analyzer import analyze_sentiment
+
+    texts = _feedback_texts(ctx)
+    return {"items": len(texts), "run": lambda: [analyze_sentiment(t) for t in texts]}
+
+
+@benchmark("feedback.sentiment_batch_uncached")
+def bench_sentiment_batch(ctx):
+    from src.feedback_processing.analysis.sentiment_analyzer import analyze_sentiment_batch
+
+    texts = _feedback_texts(ctx)
+    return {"items": len(texts), "run": lambda: analyze_sentiment_batch(texts, use_cache=False)}
+
+
+@benchmark("feedback.sentiment_lexicon")
+def bench_sentiment_lexicon(ctx):
+    from src.feedback_processing.analysis.sentiment_analyzer import score_sentiment_lexicon
+
+    texts = _feedback_texts(ctx)
+    score_sentiment_lexicon(texts[:1])  # Compile the lexicon outside the timed runs
+    return {"items": len(texts), "run": lambda: score_sentiment_lexicon(texts)}
+
+
+@benchmark("feedback.llm_single")
+def bench_llm_single(ctx):
+    from src.feedback_processing.analysis.llm_analyzer import analyze_feedback_with_llm
+
+    texts = _feedback_texts(ctx)[:ctx["args"].ingest_docs]
+    return {"items": len(texts), "run": lambda: [analyze_feedback_with_llm(t) for t in texts]}
+
+
+@benchmark("feedback.llm_packed")
+def bench_llm_packed(ctx):
+    from src.feedback_processing.analysis.llm_analyzer import analyze_feedback_batch_with_llm
+
+    items = ctx["corpus"]["feedback"][:ctx["args"].ingest_docs]
+    feedback = {item["feedback_file"]: item["text"] for item in items}
+    return {"items": len(items), "run": lambda: analyze_feedback_batch_with_llm(feedback)}
+
+
+@benchmark("feedback.pipeline")
+def bench_feedback_pipeline(ctx):
+    from src.feedback_processing.pipelines import feedback_pipeline
+
+    items = ctx["corpus"]["feedback"][:ctx["args"].ingest_docs]
+    objects = {item["feedback_file"]: item["text"].encode("utf-8") for item in items}
+
+    def run():
+        ctx["fakes"].s3.objects = objects
+        feedback_pipeline.process_feedback_files()
+
+    return {"items": len(items), "run": run}
+
+
+# --- Runner ---------------------------------------------------------------------
+
+def run_benchmark(name: str, ctx: Dict, repeat: int) -> Dict:
+    # The app reports progress with print(); keep it out of the benchmark output unless asked
+    quiet = contextlib.nullcontext() if ctx["args"].verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        try:
+            case = BENCHMARKS[name](ctx)
+        except ImportError as e:
+            return {"skipped": f"missing dependency: {e}"}
+
+        timings = []
+        for _ in range(repeat):
+            ctx["fakes"].reset_counts()
+            start = time.perf_counter()
+            case["run"]()
+            timings.append(time.perf_counter() - start)
+
+        extra = case["report"]() if "report" in case else {}
+
+    median = statistics.median(timings)
+    return {
+        **extra,
+        "items": case["items"],
+        "repeat": repeat,
+        "median_s": round(median, 6),
+        "min_s": round(min(timings), 6),
+        "max_s": round(max(timings), 6),
+        "items_per_s": round(case["items"] / median, 2) if median > 0 else None,
+        "aws_calls_per_run": ctx["fakes"].call_counts(),
+    }
+
+
+def compare(results: Dict, previous: Dict):
+    print(f"\nComparison with run from {previous.get('timestamp')}:")
+    for name, current in results["results"].items():
+        before = previous.get("results", {}).get(name, {})
+        if "median_s" in current and before.get("median_s"):
+            ratio = current["median_s"] / before["median_s"]
+            print(f"  {name:<40} {before['median_s']:>10.4f}s -> {current['median_s']:>10.4f}s  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline hot-path benchmarks on a synthetic corpus.")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--career-paths", type=int, default=5)
+    parser.add_argument("--feedback", type=int, default=1000)
+    parser.add_argument("--ingest-docs", type=int, default=50, help="Documents per ingestion/LLM benchmark")
+    parser.add_argument("--pairs", type=int, default=200, help="Resume/JD pairs for perform_matching")
+    parser.add_argument("--compressed-dims", type=int, default=0,
+                        help="PCA dimensions for matching.compressed_index (0 = int8 quantization only)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="Run only benchmarks whose name contains one of these strings")
+    parser.add_argument("--bedrock-latency-ms", type=float, default=0.0, help="Simulated Claude latency per call")
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0, help="Simulated Titan latency per call")
+    parser.add_argument("--s3-latency-ms", type=float, default=0.0)
+    parser.add_argument("--dynamodb-latency-ms", type=float, default=0.0)
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own print output")
+    parser.add_argument("--output", help="JSON output path (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.resumes, args.career_paths, args.feedback, args.seed)
+    fakes = install_fakes(
+        bedrock_latency_ms=args.bedrock_latency_ms,
+        embedding_latency_ms=args.embedding_latency_ms,
+        s3_latency_ms=args.s3_latency_ms,
+        dynamodb_latency_ms=args.dynamodb_latency_ms,
+    )
+    ctx = {"args": args, "corpus": corpus, "fakes": fakes}
+
+    names = [n for n in BENCHMARKS if not args.only or any(s in n for s in args.only)]
+    results = {
+        "benchmark": "hot_paths",
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "environment": {"python": sys.version.split()[0], "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": {},
+    }
+    try:
+        for name in names:
+            result = run_benchmark(name, ctx, args.repeat)
+            results["results"][name] = result
+            if "skipped" in result:
+                print(f"{name:<40} skipped ({result['skipped']})")
+            else:
+                print(f"{name:<40} {result['median_s']:>10.4f}s  {result['items_per_s'] or 0:>12.1f} items/s")
+    finally:
+        uninstall_fakes()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/startup_imports.py
+"""
+Measures the import cost of the app's entry points.
+
+Each target is imported in a fresh interpreter with `python -X importtime`, so
+numbers are cold-start costs and independent of each other. Results are saved
+as JSON; pass --baseline to fail when a module got slower than allowed.
+
+Usage:
+    python -m benchmarks.startup_imports
+    python -m benchmarks.startup_imports --baseline benchmarks/results/startup_baseline.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+TARGET_MODULES = [
+    "main",
+    "src.data_automation.pipelines.data_loader",
+    "src.data_automation.pipelines.dynamodb_operations",
+    "src.resume_processing.information_extraction",
+    "src.job_description_processing.job_description_processor",
+    "src.question_generation.question_generator",
+    "src.matching.resume_job_matcher",
+    "src.matching.semantic_matcher",
+    "src.feedback_processing.analysis.keyword_analyzer",
+    "src.feedback_processing.analysis.sentiment_analyzer",
+    "src.feedback_processing.analysis.llm_analyzer",
+]
+
+# "import time:       self [us] |  cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str, top_n: int = 10) -> Dict:
+    """
+    Imports one module in a fresh interpreter and parses the -X importtime report.
+
+    Returns:
+        A dict with the module's cumulative import time in ms, the number of modules
+        it pulled in, and its top_n most expensive top-level dependencies.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        return {"error": error[0]}
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us), "depth": len(indent) // 2})
+
+    target = next((e for e in reversed(entries) if e["module"] == module), None)
+    heaviest = sorted((e for e in entries if e["depth"] <= 1 and e["module"] != module), key=lambda e: e["cumulative_us"], reverse=True)
+    return {
+        "cumulative_ms": round((target or {}).get("cumulative_us", 0) / 1000, 2),
+        "modules_imported": len(entries),
+        "heaviest_dependencies": [
+            {"module": e["module"], "cumulative_ms": round(e["cumulative_us"] / 1000, 2)} for e in heaviest[:top_n]
+        ],
+    }
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, max_regression: float, min_delta_ms: float) -> List[str]:
+    """Returns a message for every module whose import time regressed beyond the allowed ratio."""
+    regressions = []
+    for module, current in results["modules"].items():
+        previous = baseline.get("modules", {}).get(module)
+        if not previous or "cumulative_ms" not in previous or "cumulative_ms" not in current:
+            continue
+        before, after = previous["cumulative_ms"], current["cumulative_ms"]
+        if after - before > min_delta_ms and after > before * (1 + max_regression):
+            regressions.append(f"{module}: {before:.1f} ms -> {after:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-module import (startup) cost.")
+    parser.add_argument("--modules", nargs="*", default=TARGET_MODULES, help="Modules to import")
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/startup_<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed relative slowdown per module")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="Ignore slowdowns smaller than this (noise)")
+    args = parser.parse_args()
+
+    results = {
+        "benchmark": "startup_imports",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "modules": {},
+    }
+    for module in args.modules:
+        results["modules"][module] = measure_import(module)
+        current = results["modules"][module]
+        if "error" in current:
+            print(f"{module:<60} ERROR: {current['error']}")
+        else:
+            print(f"{module:<60} {current['cumulative_ms']:>9.1f} ms  ({current['modules_imported']} modules)")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup_{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.max_regression, args.min_delta_ms)
+        if regressions:
+            print("Import time regressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("No import time regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# benchmarks/synthetic.py
+"""
+Seeded synthetic corpora for offline benchmarks.
+
+Records have the same shape as what the extraction code stores in DynamoDB
+(resumes, one item per JD level, feedback analyses), and raw documents can be
+rendered for the S3 ingestion path. Same seed + sizes = same corpus.
+"""
+import io
+import random
+import uuid
+from typing import Dict, List
+
+import numpy as np
+
+EMBEDDING_DIM = 1536
+# Records look as if they were saved before any benchmark run (DynamoDBHandler stamps last_updated)
+STORED_AT = "2024-01-01T00:00:00"
+
+FIRST_NAMES = ["Alice", "Bongani", "Chen", "Dmitri", "Esther", "Farai", "Grace", "Hiro", "Imani", "Jonas",
+               "Kagiso", "Lerato", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rutendo", "Sipho", "Tariro"]
+LAST_NAMES = ["Moyo", "Smith", "Naidoo", "Ivanova", "Dube", "Garcia", "Khumalo", "Tanaka", "Okafor", "Muller",
+              "Chikwanha", "Patel", "Nkosi", "Johnson", "Mahlangu", "Rossi", "Zulu", "Kim", "Ncube", "Brown"]
+SKILLS = ["Python", "SQL", "AWS", "Docker", "Kubernetes", "Terraform", "Spark", "Airflow", "Kafka", "Java",
+          "Scala", "React", "TypeScript", "PostgreSQL", "DynamoDB", "Athena", "Glue", "Redshift", "Snowflake", "dbt",
+          "Pandas", "PyTorch", "TensorFlow", "FastAPI", "Django", "Go", "Linux", "Git", "CI/CD", "Tableau"]
+TITLES = ["Data Engineer", "Software Engineer", "Backend Developer", "ML Engineer", "DevOps Engineer",
+          "Analytics Engineer", "Cloud Engineer", "Data Scientist"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark Industries", "Wayne Enterprises"]
+INSTITUTIONS = ["University of Cape Town", "Stellenbosch University", "University of Zimbabwe", "Wits University"]
+LEVELS = [("Junior", "🟢", "0-2 years"), ("Mid-Level", "🔵", "2-5 years"),
+          ("Senior", "🔴", "5-8 years"), ("Principal", "⚫", "8+ years")]
+CAREER_PATHS = ["Data Engineer", "Software Engineer", "Cloud Engineer", "ML Engineer", "Analytics Engineer"]
+FEEDBACK_PHRASES = [
+    "The candidate demonstrated strong technical skills in {skill}.",
+    "Their explanation of {skill} internals was shallow and needed prompting.",
+    "Communication was clear and they structured their answers well.",
+    "They struggled to articulate trade-offs in the system design round.",
+    "Solid problem solving on the coding exercise, with clean and tested code.",
+    "Needs more hands-on experience with {skill} in production.",
+    "Enthusiastic and eager to learn, asked good questions about the team.",
+    "The answer on {skill} was vague and lacked concrete examples.",
+]
+
+
+def random_embedding(rng: np.random.Generator, centers: np.ndarray, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Unit vector near one of the cluster centers, so similarity scores have a realistic spread."""
+    center = centers[rng.integers(len(centers))]
+    vector = center + 0.6 * rng.standard_normal(dim)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def make_embedding_centers(seed: int, n_clusters: int = 12, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim))
+    return centers / np.linalg.norm(centers, axis=1, keepdims=True)
+
+
+def make_resume(rnd: random.Random, rng: np.random.Generator, centers: np.ndarray, index: int) -> Dict:
+    first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+    experience = []
+    year = 2024
+    for _ in range(rnd.randint(1, 4)):
+        years = rnd.randint(1, 4)
+        experience.append({
+            "title": rnd.choice(TITLES),
+            "company": rnd.choice(COMPANIES),
+            "start_date": f"January {year - years}",
+            "end_date": "Present" if not experience else f"December {year}",
+            "duration": f"{years} years",
+            "responsibilities": [
+                f"Built {rnd.choice(SKILLS)} pipelines for {rnd.choice(['billing', 'analytics', 'search', 'payments'])}",
+                f"Maintained {rnd.choice(SKILLS)} and {rnd.choice(SKILLS)} services",
+            ],
+        })
+        year -= years + 1
+    return {
+        "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+        "type": "resume",
+        "name": f"{first} {last}",
+        "contact": {
+            "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+            "phone": f"+27 {rnd.randint(60, 84)} {rnd.randint(100, 999)} {rnd.randint(1000, 9999)}",
+            "linkedin": f"linkedin.com/in/{first.lower()}{last.lower()}{index}",
+        },
+        "education": [{
+            "degree": rnd.choice(["BSc", "MSc", "BEng"]),
+            "major": rnd.choice(["Computer Science", "Information Systems", "Mathematics"]),
+            "institution": rnd.choice(INSTITUTIONS),
+            "year": str(rnd.randint(2005, 2023)),
+        }],
+        "experience": experience,
+        "projects": [],
+        "skills": rnd.sample(SKILLS, rnd.randint(4, 10)),
+        "interview_status": "no",
+        "hired_status": "no interview",
+        "tags": [],
+        "interview_summaries": [],
+        "metadata": {"source": f"s3://synthetic/Data/Resumes/resume_{index:06d}.docx"},
+        "embedding": random_embedding(rng, centers),
+        "last_updated": STORED_AT,
+    }
+
+
+def make_job_levels(rnd: random.Random, rng: np.random.Generator, centers: np.ndarray, career_path: str) -> List[Dict]:
+    source = f"s3://synthetic/Data/Career Path/{career_path.replace(' ', '_')}.docx"
+    levels = []
+    for level, emoji, experience in LEVELS:
+        technologies = rnd.sample(SKILLS, 6)
+        levels.append({
+            "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+            "type": "job_description",
+            "level": level,
+            "title": f"{emoji} {level} {career_path}",
+            "experience": experience,
+            "focus": f"{level} ownership of {career_path.lower()} deliverables",
+            "core_requirements": [f"Experience with {t}" for t in technologies[:3]],
+            "soft_skills": ["Communication", "Collaboration"],
+            "technologies_mentioned": technologies,
+            "skills": technologies,
+            "full_text": f"{career_path} career path. " + " ".join(technologies) + "...",
+            "metadata": {"source": source},
+            "embedding": random_embedding(rng, centers),
+            "last_updated": STORED_AT,
+        })
+    return levels
+
+
+def make_feedback(rnd: random.Random, index: int, resume: Dict = None) -> Dict:
+    skills = (resume or {}).get("skills") or SKILLS
+    sentences = [rnd.choice(FEEDBACK_PHRASES).format(skill=rnd.choice(skills)) for _ in range(rnd.randint(3, 8))]
+    return {
+        "feedback_file": f"interview_feedback/feedback_{index:06d}.txt",
+        "candidate_id": (resume or {}).get("id"),
+        "text": " ".join(sentences),
+    }
+
+
+def generate_corpus(n_resumes: int = 1000, n_career_paths: int = 5, n_feedback: int = 500, seed: int = 42) -> Dict:
+    """
+    Builds a synthetic corpus.
+
+    Args:
+        n_resumes: Number of resume records.
+        n_career_paths: Number of career path documents (4 JD levels each).
+        n_feedback: Number of feedback notes, each attached to a random resume.
+        seed: Seed for every random choice.
+
+    Returns:
+        A dictionary with 'resumes', 'job_descriptions' and 'feedback' lists.
+    """
+    rnd = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    centers = make_embedding_centers(seed)
+
+    resumes = [make_resume(rnd, rng, centers, i) for i in range(n_resumes)]
+    job_descriptions = []
+    for i in range(n_career_paths):
+        path = CAREER_PATHS[i % len(CAREER_PATHS)] + ("" if i < len(CAREER_PATHS) else f" {i // len(CAREER_PATHS) + 1}")
+        job_descriptions.extend(make_job_levels(rnd, rng, centers, path))
+    feedback = [make_feedback(rnd, i, rnd.choice(resumes) if resumes else None) for i in range(n_feedback)]
+
+    return {"resumes": resumes, "job_descriptions": job_descriptions, "feedback": feedback}
+
+
+def resume_to_text(resume: Dict) -> str:
+    """Renders a resume record back into plain resume text for the ingestion path."""
+    lines = [resume["name"], f"{resume['contact']['email']} | {resume['contact']['phone']}", "", "Experience:"]
+    for exp in resume["experience"]:
+        lines.append(f"{exp['start_date']} - {exp['end_date']}")
+        lines.append(f"{exp['title']}, {exp['company']}")
+        lines.extend(f"- {r}" for r in exp["responsibilities"])
+    lines.extend(["", "Education:"])
+    for edu in resume["education"]:
+        lines.append(f"{edu['degree']} {edu['major']}, {edu['institution']}, {edu['year']}")
+    lines.extend(["", "Skills: " + ", ".join(resume["skills"])])
+    return "\n".join(lines)
+
+
+def career_path_to_text(levels: List[Dict]) -> str:
+    """Renders the JD levels of one career path back into a career path document."""
+    sections = []
+    for level in levels:
+        sections.append(
+            f"{level['title']}\nExperience: {level['experience']}\nFocus: {level['focus']}\n"
+            + "\n".join(f"- {r}" for r in level["core_requirements"])
+            + "\nTechnologies: " + ", ".join(level["technologies_mentioned"])
+        )
+    return "\n\n".join(sections)
+
+
+def render_docx(text: str) -> bytes:
+    """Renders text as a .docx file (python-docx), the format the S3 loader reads with Docx2txtLoader."""
+    from docx import Document as DocxDocument
+
+    document = DocxDocument()
+    for paragraph in text.split("\n"):
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_s3_objects(corpus: Dict, prefix: str = "Data") -> Dict[str, bytes]:
+    """
+    Lays a corpus out as S3 objects in the folder structure load_and_extract_text_from_all_folders_s3 reads.
+
+    Returns:
+        Mapping of object key to file bytes.
+    """
+    objects = {}
+    for i, resume in enumerate(corpus["resumes"]):
+        objects[f"{prefix}/Resumes/resume_{i:06d}.docx"] = render_docx(resume_to_text(resume))
+
+    by_source = {}
+    for jd in corpus["job_descriptions"]:
+        by_source.setdefault(jd["metadata"]["source"], []).append(jd)
+    for i, levels in enumerate(by_source.values()):
+        objects[f"{prefix}/Career Path/career_path_{i:03d}.docx"] = render_docx(career_path_to_text(levels))
+
+    for item in corpus["feedback"]:
+        body = item["text"].encode("utf-8")
+        objects[f"{prefix}/Interview feedback/{item['feedback_file'].split('/')[-1]}"] = body
+        objects[item["feedback_file"]] = body  # Where the feedback pipeline lists from
+    return objects
@@ -3,12 +3,21 @@ from src.data_automation.pipelines.data_loader import load_and_extract_text_from
 from src.resume_processing.information_extraction import process_resume
 from src.job_description_processing.job_description_processor import extract_job_details_llm
 from src.question_generation.question_generator import generate_interview_questions
+from src.question_generation.question_bank import get_question_bank
 from src.matching.resume_job_matcher import perform_matching
-from src.matching.semantic_matcher import find_top_matches
-from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
-
-# Initialize DynamoDB handler
-dynamodb_handler = DynamoDBHandler(table_name="ResumeJobMatcher")
+from src.matching.semantic_matcher import find_top_matches, score_histogram
+from src.matching.compressed_index import COMPRESSED_MATCHING, CompressedEmbeddingIndex
+from src.matching.materialized_matches import get_materialized_matches, sync_match_tables
+from src.data_automation.pipelines.dynamodb_operations import RESUME_PROJECTION, get_dynamodb_handler
+from src.storage.base import project_item
+from src.observability.tracing import start_trace, traced
+from src.search.candidate_index import CandidateSearchIndex
+from src.search.filter_index import LEVELS, ResumeFilterIndex
+from src.chatbot_interface.recruiter_chat import RecruiterChat
+from src.llm_scheduler import BULK, get_llm_scheduler, llm_priority
+from src.resume_processing.near_duplicates import RESUME_DUPLICATE_TYPE, get_near_duplicate_index
+from src.storage.corpus_snapshot import load_corpus_snapshot, refresh_corpus_snapshot, write_corpus_snapshot
+from src.storage.corpus_version import compute_corpus_version
 
 # Load and process data with caching
 @st.cache_data(show_spinner="Loading and processing resumes and job descriptions...")
@@ -20,6 +29,7 @@ def sanitize_resume(resume: dict, index: int = 0) -> dict:
     Adds fallback values to avoid runtime errors in show_resume().
     """
     return {
+        "id": resume.get("id"),
         "name": resume.get("name", f"Candidate {index + 1}"),
         "contact": {
             "email": resume.get("contact", {}).get("email", "Not provided"),
@@ -29,41 +39,132 @@ def sanitize_resume(resume: dict, index: int = 0) -> dict:
         "skills": resume.get("skills", []),
         "experience": resume.get("experience", []),
         "education": resume.get("education", []),
-        "embedding": resume.get("embedding", [])
+        "embedding": resume.get("embedding", []),
+        "embedding_backend": resume.get("embedding_backend"),
+        "experience_years": resume.get("experience_years"),
+        "experience_level": resume.get("experience_level")
     }
 
 
+@traced("load_data")
 def load_data(force_refresh: bool = False):
     bucket = "zmakarimayi-testing-data-upload"
     prefix = "Data"
     
-    # First try to load from DynamoDB unless force_refresh is True
+    dynamodb_handler = get_dynamodb_handler()
+
+    # First try the local corpus snapshot, then DynamoDB, unless force_refresh is True
+    # Resumes are held as projections (id, name, embedding, ...); full records are hydrated when shown
     if not force_refresh:
-        resumes = dynamodb_handler.get_all_resumes()
+        # Read the stamp before the scan, so writes made during it leave the new snapshot stale
+        stamp = dynamodb_handler.get_corpus_stamp() or dynamodb_handler.touch_corpus()
+        snapshot = load_corpus_snapshot(stamp)
+        if snapshot and snapshot[0] and snapshot[1]:
+            return snapshot
+
+        resumes = dynamodb_handler.get_resume_projections()
         jds = dynamodb_handler.get_all_job_descriptions()
         
+        # Match rows are updated by process_resume and the S3 refresh; deletions and embedding backend
+        # switches are applied with `python -m src.matching.materialized_matches`
         if resumes and jds:
+            write_corpus_snapshot(resumes, jds, stamp)
             return resumes, jds
     
     # If force_refresh or no data in DynamoDB, load from S3
     raw_data = load_and_extract_text_from_all_folders_s3(bucket, prefix)
     
-    # Process resumes
-    resumes = []
-    for doc in raw_data.get("Resumes", []):
-        processed_resume = process_resume(doc)
-        if processed_resume:
-            resumes.append(processed_resume)
-    
-    # Process job descriptions
-    jds = []
-    for doc in raw_data.get("job_descriptions", []):
-        if doc:
-            extracted_levels = extract_job_details_llm(doc)
-            if extracted_levels:
-                jds.extend(extracted_levels)
-    
-    return resumes, jds
+    # Documents already in storage, from a few projected scans instead of one scan per document
+    sources = dynamodb_handler.get_source_index(['resume', RESUME_DUPLICATE_TYPE, 'job_description'])
+
+    # Extraction runs as bulk work, so other sessions' interactive LLM calls go first
+    with llm_priority(BULK, job="s3_refresh"):
+        # Process resumes
+        resumes, seen = [], set()
+        for doc in raw_data.get("Resumes", []):
+            processed_resume = process_resume(doc, source_index=sources, update_match_tables=False)
+            # Near-duplicate documents come back as their canonical resume; keep it once
+            if processed_resume and processed_resume['id'] not in seen:
+                seen.add(processed_resume['id'])
+                resumes.append(processed_resume)
+
+        # Process job descriptions
+        jds = []
+        for doc in raw_data.get("job_descriptions", []):
+            if doc:
+                extracted_levels = extract_job_details_llm(doc, source_index=sources)
+                if extracted_levels:
+                    jds.extend(extracted_levels)
+
+    dedup = get_near_duplicate_index().report()
+    if dedup["duplicates"]:
+        print(f"🔁 {dedup['duplicates']} of {dedup['checked']} resumes were near-duplicates: "
+              f"{dedup['llm_calls_saved']} LLM calls (~{dedup['estimated_tokens_saved']} tokens) saved")
+
+    # Keep the per-level top-k rows and the corpus snapshot in step with what was just ingested
+    sync_match_tables(dynamodb_handler, resumes, jds)
+    refresh_corpus_snapshot(dynamodb_handler)
+    return [project_item(r, RESUME_PROJECTION) for r in resumes], jds
+
+
+@st.cache_resource(show_spinner=False)
+def get_filter_index(corpus_version: str, _resumes: list) -> ResumeFilterIndex:
+    """Builds the experience/level/skill filter columns once per corpus version."""
+    return ResumeFilterIndex.build(_resumes)
+
+
+@st.cache_resource(show_spinner=False)
+def get_candidate_index(corpus_version: str, _resumes: list) -> CandidateSearchIndex:
+    """Builds the candidate search index once per corpus version."""
+    return CandidateSearchIndex.build(_resumes)
+
+
+@st.cache_resource(show_spinner="Compressing resume embeddings...")
+def get_compressed_index(corpus_version: str, _resumes: list) -> CompressedEmbeddingIndex:
+    """Fits the compressed matcher index once per corpus version."""
+    return CompressedEmbeddingIndex.build(_resumes)
+
+
+@st.cache_resource(show_spinner="Preparing the recruiter chat...")
+def get_recruiter_chat(corpus_version: str, jd_version: str, _resumes: list, _jds: list) -> RecruiterChat:
+    """Builds the chat's retrieval matrices once per resume and JD corpus version."""
+    return RecruiterChat(_resumes, _jds)
+
+
+def select_candidate(resumes, corpus_version: str):
+    """
+    Sidebar search box + paged picker over the candidate index.
+
+    Returns:
+        The selected resume id, or None when nothing matches.
+    """
+    index = get_candidate_index(corpus_version, resumes)
+
+    query = st.sidebar.text_input("🔍 Search candidates", placeholder="Name, email or skill")
+    # Go back to the first page whenever the query changes
+    if st.session_state.get("candidate_query") != query:
+        st.session_state["candidate_query"] = query
+        st.session_state["candidate_page"] = 1
+
+    first = index.search(query, page=0)
+    if first["total"] == 0:
+        st.sidebar.info("No candidates match your search.")
+        return None
+
+    page = 1
+    if first["pages"] > 1:
+        page = st.sidebar.number_input(
+            f"Page (of {first['pages']})", min_value=1, max_value=first["pages"], step=1, key="candidate_page"
+        )
+    found = first if page == 1 else index.search(query, page=page - 1)
+    summaries = {s["id"]: s for s in found["results"]}
+    st.sidebar.caption(f"{found['total']} of {len(index)} candidates")
+
+    return st.sidebar.selectbox(
+        "📄 Choose a Resume",
+        list(summaries),
+        format_func=lambda rid: f"{summaries[rid]['name']} ({summaries[rid]['email'] or 'no email'})"
+    )
 
 
 def show_resume(resume):
@@ -140,7 +241,8 @@ def show_job_description(jd):
     #     with st.expander("See original text"):
     #         st.text(jd["full_text"])
 
-def show_semantic_matches(jd, resumes, threshold=0.3):
+def show_semantic_matches(jd, resumes, threshold=0.3, index=None, corpus_version=None, filters=None, filter_index=None,
+                          key_prefix="matches"):
     st.subheader(f"🔍 Top Matches (Threshold: {threshold:.0%})")
     
     with st.spinner(f"Scanning {len(resumes)} resumes..."):
@@ -149,7 +251,15 @@ def show_semantic_matches(jd, resumes, threshold=0.3):
         print(f"JD keys: {jd}")
         print(f"First resume keys: {resumes[0].keys() if resumes else 'No resumes'}")
         print(f"First resume content sample: {dict(list(resumes[0].items())[:3]) if resumes else 'No resumes'}")
-        matches = find_top_matches(jd, resumes, similarity_threshold=threshold)
+        # Precomputed per-level top-k first (unfiltered, exact matching only); rescore if the row is missing or stale
+        matches = None if filters or index is not None else get_materialized_matches(
+            get_dynamodb_handler(), jd, resumes, similarity_threshold=threshold
+        )
+        if matches is None:
+            matches = find_top_matches(
+                jd, resumes, similarity_threshold=threshold, index=index, corpus_version=corpus_version,
+                filters=filters, filter_index=filter_index
+            )
         #st.write("Debug - First match data:", matches[0] if matches else "No matches")
         #st.write("Debug - First match data:", matches[1] if matches else "No matches")
         
@@ -157,23 +267,36 @@ def show_semantic_matches(jd, resumes, threshold=0.3):
         st.warning("No matches meeting the current threshold. Try lowering the similarity requirement.")
         return
     
-    # # Visual score distribution
-    # scores = [m['score'] for m in matches if isinstance(m.get('score'), (int, float))]
-    # if scores:
-    #     st.vega_lite_chart({
-    #         "mark": {"type": "bar", "cornerRadiusEnd": 4},
-    #         "encoding": {
-    #             "x": {"field": "score", "bin": {"maxbins": 20}, "title": "Similarity Score"},
-    #             "y": {"aggregate": "count", "title": "Number of Candidates"}
-    #         }
-    #     }, use_container_width=True)
-
-    # Top matches display
-    for i, match in enumerate(matches[:10], 1):
+    # Visual score distribution over every resume, from the JD's cached sorted scores
+    if corpus_version and st.checkbox("📊 Show score distribution", key=f"{key_prefix}_show_score_distribution"):
+        histogram = score_histogram(jd, resumes, corpus_version)
+        if histogram:
+            edges = histogram['edges']
+            st.vega_lite_chart({
+                "data": {"values": [
+                    {"start": edges[i], "end": edges[i + 1], "count": count}
+                    for i, count in enumerate(histogram['counts'])
+                ]},
+                "mark": {"type": "bar", "cornerRadiusEnd": 4},
+                "encoding": {
+                    "x": {"field": "start", "type": "quantitative", "bin": {"binned": True}, "title": "Similarity Score"},
+                    "x2": {"field": "end"},
+                    "y": {"field": "count", "type": "quantitative", "title": "Number of Candidates"}
+                }
+            }, use_container_width=True)
+
+    # Top matches display; matches carry projections, so fetch the shown records in one batch
+    shown = matches[:10]
+    hydrated = {r['id']: r for r in get_dynamodb_handler().hydrate(
+        m['resume']['id'] for m in shown if isinstance(m.get('resume'), dict) and m['resume'].get('id')
+    )}
+    for i, match in enumerate(shown, 1):
         resume = match.get('resume')
         if not isinstance(resume, dict):
             st.warning(f"Skipping match #{i}: Resume data is invalid or missing.")
             continue
+        if resume.get('id') in hydrated:
+            resume = sanitize_resume(hydrated[resume['id']], i - 1)
 
         resume_name = resume.get('name', f"Candidate {i}")
         with st.expander(f"🏅 #{i}: {resume_name} (Score: {match.get('score', 0):.0%})", expanded=i==1):
@@ -218,12 +341,82 @@ def show_matching_results(results):
         for exp, matched in results["experience_matching"].items():
             st.markdown(f"- {exp}: {'✅' if matched else '❌'}")
 
+def show_recruiter_chat(chat: RecruiterChat):
+    """Chat over the corpus; each answer is grounded in the records retrieved for its question."""
+    history = st.session_state.setdefault("chat_history", [])
+    for turn in history:
+        with st.chat_message(turn["role"]):
+            st.markdown(turn["content"])
+
+    question = st.chat_input("Ask about candidates, e.g. 'Strongest Senior candidates with Kubernetes?'")
+    if not question:
+        return
+    with st.chat_message("user"):
+        st.markdown(question)
+    with st.chat_message("assistant"):
+        try:
+            reply = chat.answer_stream(question, history, st.session_state.get("chat_retrieval"))
+            answer = st.write_stream(reply["stream"])
+        except Exception as e:
+            print(f"💥 Recruiter chat failed: {e}")
+            st.error(f"Could not answer: {e}")
+            return
+        context = reply["context"]
+        st.caption(
+            f"Answered from {context['included']} retrieved records (~{context['tokens']} context tokens)"
+            + (f", {context['dropped']} left out to fit the budget" if context["dropped"] else "")
+        )
+    history.extend([{"role": "user", "content": question}, {"role": "assistant", "content": answer}])
+    st.session_state.chat_retrieval = reply["retrieval"]
+
+def show_trace_panel(trace):
+    """Sidebar breakdown of where the time went while rendering this page."""
+    with st.sidebar.expander(f"⏱️ Latency breakdown ({trace.duration_ms:.0f} ms)", expanded=True):
+        summary = trace.summary()
+        if summary:
+            st.dataframe(
+                [{"span": s["name"], "calls": s["count"], "total ms": s["total_ms"], "max ms": s["max_ms"]} for s in summary],
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.caption("No instrumented calls on this run.")
+
+        if trace.counters:
+            st.markdown("**Counters**")
+            for name, value in sorted(trace.counters.items()):
+                st.markdown(f"- {name}: {value:g}")
+
+        dedup = get_near_duplicate_index().report()
+        if dedup["checked"]:
+            st.markdown(
+                f"**Near-duplicate resumes (this process):** {dedup['duplicates']} of {dedup['checked']} linked, "
+                f"{dedup['llm_calls_saved']} LLM calls saved (threshold {dedup['threshold']:.2f})"
+            )
+
+        scheduler = get_llm_scheduler().report()
+        if scheduler["classes"]:
+            st.markdown("**LLM scheduler (this process)**")
+            for priority, s in sorted(scheduler["classes"].items()):
+                st.markdown(
+                    f"- {priority}: {s['calls']} calls, {s['mean_wait_ms']} ms mean / {s['max_wait_ms']} ms max wait, "
+                    f"max queue depth {s['max_queue_depth']}"
+                )
+
+        st.download_button(
+            "Download trace (JSON)",
+            data=trace.to_json(),
+            file_name=f"trace_{trace.id}.json",
+            mime="application/json"
+        )
+
 def main():
     st.title("🧠 Resume & Job Matcher")
     
     # Add refresh button in sidebar
     st.sidebar.title("Options")
     force_refresh = st.sidebar.checkbox("Force refresh from S3", value=False)
+    st.sidebar.checkbox("⏱️ Show latency breakdown", value=False, key="show_trace_panel")
     
     # Load data
     with st.spinner("Loading data..."):
@@ -247,12 +440,8 @@ def main():
         jd_levels[level].append(jd)
     
     # Resume selection
-    resume_names = [r.get('name', f"Candidate {i+1}") for i, r in enumerate(resumes)]
-    selected_resume_idx = st.sidebar.selectbox(
-        "📄 Choose a Resume", 
-        range(len(resumes)), 
-        format_func=lambda i: resume_names[i]
-    )
+    corpus_version = compute_corpus_version(resumes)
+    selected_resume_id = select_candidate(resumes, corpus_version)
     
     # Job description selection with level grouping
     selected_level = st.sidebar.selectbox(
@@ -294,11 +483,29 @@ def main():
 
     selected_jd = level_jds[selected_jd_idx]
     resumes = [sanitize_resume(r, idx) for idx, r in enumerate(resumes)]
+    compressed_index = get_compressed_index(corpus_version, resumes) if COMPRESSED_MATCHING else None
+
+    # Structured pre-filters: only the resumes passing them are scored
+    filter_index = get_filter_index(corpus_version, resumes)
+    with st.sidebar.expander("🎚️ Candidate filters"):
+        filter_levels = st.multiselect("Experience level", LEVELS)
+        min_years = st.number_input("Minimum years of experience", min_value=0.0, max_value=50.0, value=0.0, step=0.5)
+        required_skills = st.multiselect("Required skills", filter_index.skills()[:300])
+    filters = {k: v for k, v in {"levels": filter_levels, "min_years": min_years, "skills": required_skills}.items() if v}
+    if filters:
+        st.sidebar.caption(f"{len(filter_index.select(**filters)):,} of {len(filter_index):,} candidates pass the filters")
+
     # Then pass to show_semantic_matches:
-    show_semantic_matches(selected_jd, resumes, threshold=similarity_threshold)
+    show_semantic_matches(
+        selected_jd, resumes, threshold=similarity_threshold, index=compressed_index, corpus_version=corpus_version,
+        filters=filters, filter_index=filter_index
+    )
 
-    # Display selected resume and JD
-    resume = resumes[selected_resume_idx]
+    # Display selected resume and JD; only the picked candidate's full record is loaded
+    resume = None
+    if selected_resume_id:
+        records = get_dynamodb_handler().hydrate([selected_resume_id])
+        resume = sanitize_resume(records[0]) if records else None
     jd = level_jds[selected_jd_idx]
 
     # col1, col2 = st.columns(2)
@@ -308,26 +515,42 @@ def main():
     #     show_job_description(jd)
 
     # Matching and question generation
-    tab1, tab2 = st.tabs(["Matching Analysis", "Interview Questions"])
+    tab1, tab2, tab3 = st.tabs(["Matching Analysis", "Interview Questions", "Recruiter Chat"])
     
     with tab1:
-        if st.button("⚖️ Run Matching Analysis", use_container_width=True):
+        if resume is None:
+            st.info("Select a candidate in the sidebar to run a matching analysis.")
+        elif st.button("⚖️ Run Matching Analysis", use_container_width=True):
             with st.spinner("Analyzing match..."):
                 match_results = perform_matching(resume, jd)
                 show_matching_results(match_results)
     
     with tab2:
-        if st.button("❓ Generate Interview Questions", use_container_width=True):
+        if resume is None:
+            st.info("Select a candidate in the sidebar to generate interview questions.")
+        elif st.button("❓ Generate Interview Questions", use_container_width=True):
             with st.spinner("Generating questions..."):
                 questions = generate_interview_questions(resume, jd, num_questions=10)
                 st.subheader("🧠 Suggested Interview Questions")
                 for i, q in enumerate(questions, 1):
                     st.markdown(f"{i}. {q}")
+                bank = get_question_bank().report()
+                if bank["lookups"]:
+                    st.caption(
+                        f"Question bank: {bank['hit_rate']:.0%} hit rate over {bank['lookups']} lookups "
+                        f"({bank['adapted']} adapted, {bank['stale_skipped']} stale entries skipped)"
+                    )
+
+    with tab3:
+        show_recruiter_chat(get_recruiter_chat(corpus_version, compute_corpus_version(jds), resumes, jds))
 
     if st.sidebar.checkbox("🎯 Show semantic matching"):
         selected_jd = level_jds[selected_jd_idx]
         resumes = [sanitize_resume(r, idx) for idx, r in enumerate(resumes)]
-        show_semantic_matches(selected_jd, resumes)
+        show_semantic_matches(selected_jd, resumes, corpus_version=corpus_version, key_prefix="sidebar_matches")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with start_trace("page_render") as trace:
+        main()
+    if st.session_state.get("show_trace_panel"):
+        show_trace_panel(trace)
\ No newline at end of file
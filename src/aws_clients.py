@@ -0,0 +1,68 @@
+# src/aws_clients.py
+"""
+Shared, lazily constructed AWS clients.
+
+boto3 is only imported, and each client only built, the first time a module
+actually needs it, so importing the app stays cheap. Clients are cached per
+(service, region) for the life of the process.
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_lock = threading.Lock()
+
+# Optional override used by offline runs: factory(kind, service_name, region_name) -> client
+_client_factory: Optional[Callable[[str, str, Optional[str]], Any]] = None
+
+
+def set_client_factory(factory: Optional[Callable[[str, str, Optional[str]], Any]]) -> None:
+    """
+    Replaces how clients are built (pass None to go back to boto3) and drops cached clients.
+
+    Args:
+        factory: Callable taking (kind, service_name, region_name), where kind is
+            "client" or "resource", and returning the object to use.
+    """
+    global _client_factory
+    with _lock:
+        _client_factory = factory
+        _clients.clear()
+
+
+def clear_clients() -> None:
+    """Drops cached clients so they are rebuilt, e.g. in a forked worker (boto3 clients aren't fork-safe)."""
+    with _lock:
+        _clients.clear()
+
+
+def _get(kind: str, service_name: str, region_name: Optional[str]) -> Any:
+    key = (kind, service_name, region_name)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        if key not in _clients:
+            if _client_factory is not None:
+                client = _client_factory(kind, service_name, region_name)
+            else:
+                import boto3
+                builder = boto3.client if kind == "client" else boto3.resource
+                client = builder(service_name, region_name=region_name)
+            if kind == "client" and service_name == "bedrock-runtime":
+                # Every Claude/Titan call is rate-limited and prioritized by the shared scheduler
+                from src.llm_scheduler import ScheduledBedrockClient
+                client = ScheduledBedrockClient(client)
+            _clients[key] = client
+        return _clients[key]
+
+
+def get_client(service_name: str, region_name: Optional[str] = None) -> Any:
+    """Returns the shared boto3 client for a service/region, creating it on first use."""
+    return _get("client", service_name, region_name)
+
+
+def get_resource(service_name: str, region_name: Optional[str] = None) -> Any:
+    """Returns the shared boto3 resource for a service/region, creating it on first use."""
+    return _get("resource", service_name, region_name)
@@ -0,0 +1,273 @@
+# src/chatbot_interface/recruiter_chat.py
+"""
+Recruiter chatbot over the resume/JD corpus.
+
+Each question is answered from a handful of retrieved records rather than the
+whole corpus: the question is embedded once, scored against the in-memory
+resume and JD embedding matrices (plus a boost for skills it names), the top
+records are hydrated and rendered into a context capped at a token budget,
+and Claude's answer is streamed back. Retrieval is cached per question, so
+Streamlit reruns of the same turn don't embed or score again.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from src.aws_clients import get_client
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.feedback_processing.analysis.llm_analyzer import estimate_tokens
+from src.matching.semantic_matcher import embedding_matrix, has_embedding
+from src.observability.tracing import incr, record_llm_usage, span, traced
+from src.resume_processing.information_extraction import embed_text
+
+BEDROCK_REGION = "eu-central-1"
+MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+
+# Records retrieved per question, and the prompt tokens they may fill
+CHAT_TOP_K = int(os.getenv("CHAT_TOP_K", "8"))
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "3000"))
+# Earlier turns carried into the prompt (most recent first, until this budget is spent)
+CHAT_HISTORY_TOKENS = 1000
+CHAT_MAX_ANSWER_TOKENS = 800
+RETRIEVAL_CACHE_SIZE = 128
+# Added to a resume's score for each fraction of the question's skills it lists
+SKILL_BOOST = 0.15
+
+# A question that only points back at the previous answer reuses its retrieval
+FOLLOW_UP_PATTERN = re.compile(r"\b(they|them|their|theirs|these|those|he|she|his|her|above|previous)\b", re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def _tokens(text: str) -> List[str]:
+    return [t.rstrip(".") for t in TOKEN_PATTERN.findall((text or "").lower()) if t.rstrip(".")]
+
+
+def _join(values, limit: int = 12) -> str:
+    values = [str(v) for v in values or [] if v]
+    return ", ".join(values[:limit]) + (f" (+{len(values) - limit} more)" if len(values) > limit else "")
+
+
+def render_resume(label: str, resume: Dict, score: float) -> str:
+    """Compact text block for one candidate in the prompt context."""
+    contact = resume.get('contact') if isinstance(resume.get('contact'), dict) else {}
+    lines = [f"[{label}] {resume.get('name') or 'Unnamed Candidate'} (id {resume.get('id')}, relevance {score:.2f})"]
+    if contact.get('email'):
+        lines.append(f"Email: {contact['email']}")
+    if resume.get('skills'):
+        lines.append(f"Skills: {_join(resume['skills'], 20)}")
+    for job in (resume.get('experience') or [])[:4]:
+        if isinstance(job, dict):
+            period = job.get('duration') or " - ".join(p for p in (job.get('start_date'), job.get('end_date')) if p)
+            lines.append(f"Experience: {job.get('title', '')} at {job.get('company', '')}" + (f" ({period})" if period else ""))
+    for school in (resume.get('education') or [])[:2]:
+        if isinstance(school, dict):
+            lines.append(f"Education: {school.get('degree', '')} {school.get('major') or ''}, {school.get('institution', '')}".strip())
+    return "\n".join(lines)
+
+
+def render_job_description(label: str, jd: Dict, score: float) -> str:
+    """Compact text block for one JD level in the prompt context."""
+    lines = [f"[{label}] {jd.get('title', 'Job')} — level {jd.get('level', 'N/A')} (relevance {score:.2f})"]
+    if jd.get('experience'):
+        lines.append(f"Experience required: {jd['experience']}")
+    if jd.get('core_requirements'):
+        lines.append(f"Requirements: {_join(jd['core_requirements'])}")
+    technologies = jd.get('technologies_mentioned') or jd.get('skills')
+    if technologies:
+        lines.append(f"Technologies: {_join(technologies)}")
+    return "\n".join(lines)
+
+
+def build_context(blocks: List[str], token_budget: int) -> Dict:
+    """Adds blocks in rank order while they fit the budget; returns the context and what was left out."""
+    included, used = [], 0
+    for block in blocks:
+        cost = estimate_tokens(block)
+        if used + cost > token_budget:
+            continue
+        included.append(block)
+        used += cost
+    return {"text": "\n\n".join(included), "tokens": used, "included": len(included), "dropped": len(blocks) - len(included)}
+
+
+def _stream_claude(body: str) -> Iterator[str]:
+    """Yields the answer's text deltas, recording usage once the stream ends."""
+    response = get_client("bedrock-runtime", region_name=BEDROCK_REGION).invoke_model_with_response_stream(
+        body=body, modelId=MODEL_ID, accept='application/json', contentType='application/json'
+    )
+    usage = {}
+    with span("bedrock.claude", task="recruiter_chat", stream=True):
+        for event in response.get("body"):
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+            message = json.loads(chunk["bytes"])
+            if message.get("type") == "message_start":
+                usage.update(message.get("message", {}).get("usage", {}))
+            elif message.get("type") == "message_delta":
+                usage.update(message.get("usage", {}))
+            elif message.get("type") == "content_block_delta":
+                yield message.get("delta", {}).get("text", "")
+    record_llm_usage({"usage": usage})
+
+
+class RecruiterChat:
+    """
+    Answers recruiter questions from retrieved resumes and JD levels.
+
+    Holds the resume and JD embedding matrices for one corpus version; build a
+    new instance when the corpus changes. Resumes may be projections: the
+    retrieved ones are hydrated before they are rendered.
+    """
+
+    def __init__(self, resumes: List[Dict], jds: List[Dict], handler=None, top_k: int = None,
+                 context_tokens: int = None):
+        self.resumes = [r for r in resumes if has_embedding(r) and r.get('id')]
+        self.jds = [jd for jd in jds if has_embedding(jd)]
+        self.handler = handler
+        self.top_k = CHAT_TOP_K if top_k is None else top_k
+        self.context_tokens = CHAT_CONTEXT_TOKENS if context_tokens is None else context_tokens
+        self._resume_matrix = embedding_matrix([r['embedding'] for r in self.resumes]) if self.resumes else None
+        self._jd_matrix = embedding_matrix([jd['embedding'] for jd in self.jds]) if self.jds else None
+        # skill -> rows of the resumes listing it
+        self._skill_rows: Dict[str, List[int]] = {}
+        for row, resume in enumerate(self.resumes):
+            for skill in {str(s).lower() for s in resume.get('skills') or []}:
+                self._skill_rows.setdefault(skill, []).append(row)
+        self._multi_word_skills = [s for s in self._skill_rows if " " in s]
+        self._levels = {str(jd.get('level')).lower(): jd.get('level') for jd in self.jds if jd.get('level')}
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _storage(self):
+        return self.handler or get_dynamodb_handler()
+
+    def _query_terms(self, question: str) -> Dict:
+        tokens = _tokens(question)
+        text = " ".join(tokens)
+        skills = [t for t in dict.fromkeys(tokens) if t in self._skill_rows]
+        # Multi-word skills ("machine learning") and levels ("mid-level") are matched as phrases
+        skills += [s for s in self._multi_word_skills if f" {s} " in f" {text} " and s not in skills]
+        question_lower = question.lower()
+        levels = [level for key, level in self._levels.items() if re.search(rf"\b{re.escape(key)}\b", question_lower)]
+        return {"skills": skills, "levels": levels}
+
+    @traced("chat.retrieve")
+    def retrieve(self, question: str, previous: Optional[Dict] = None) -> Dict:
+        """
+        Top resumes and JD levels for a question.
+
+        Cached by normalized question text. A short follow-up that refers back to the
+        previous answer ("what about their Python experience?") reuses `previous`.
+        """
+        terms = self._query_terms(question)
+        if previous and FOLLOW_UP_PATTERN.search(question) and not terms["skills"] and not terms["levels"]:
+            return previous
+
+        key = " ".join(_tokens(question))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                incr("cache.chat_retrieval.hits")
+                return self._cache[key]
+        incr("cache.chat_retrieval.misses")
+
+        retrieval = self._score(question, terms)
+
+        with self._lock:
+            self._cache[key] = retrieval
+            while len(self._cache) > RETRIEVAL_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return retrieval
+
+    def _score(self, question: str, terms: Dict) -> Dict:
+        query = embedding_matrix([embed_text(question)])[0]
+
+        jd_rows, jd_scores = [], np.zeros(0, dtype=np.float32)
+        if self._jd_matrix is not None:
+            jd_scores = self._jd_matrix @ query
+            allowed = [i for i, jd in enumerate(self.jds) if not terms["levels"] or jd.get('level') in terms["levels"]]
+            jd_rows = sorted(allowed, key=lambda i: -jd_scores[i])[:3]
+
+        resume_rows, resume_scores = [], np.zeros(0, dtype=np.float32)
+        if self._resume_matrix is not None:
+            resume_scores = self._resume_matrix @ query
+            if terms["levels"] and jd_rows:
+                # "Senior candidates": fit to the named level's JDs counts as much as fit to the question
+                level_fit = (self._resume_matrix @ self._jd_matrix[jd_rows].T).max(axis=1)
+                resume_scores = (resume_scores + level_fit) / 2
+            if terms["skills"]:
+                coverage = np.zeros(len(self.resumes), dtype=np.float32)
+                for skill in terms["skills"]:
+                    coverage[self._skill_rows[skill]] += 1.0 / len(terms["skills"])
+                resume_scores = resume_scores + SKILL_BOOST * coverage
+            count = min(self.top_k, len(resume_scores))
+            if count:
+                candidates = np.argpartition(-resume_scores, count - 1)[:count]
+                resume_rows = [int(i) for i in candidates[np.argsort(-resume_scores[candidates], kind="stable")]]
+
+        return {
+            "terms": terms,
+            "resumes": [(self.resumes[i]['id'], float(resume_scores[i])) for i in resume_rows],
+            "jds": [(i, float(jd_scores[i])) for i in jd_rows],
+        }
+
+    def context_for(self, retrieval: Dict) -> Dict:
+        """Hydrates the retrieved resumes and renders everything into a budgeted context."""
+        full = {r['id']: r for r in self._storage().hydrate(rid for rid, _ in retrieval["resumes"])}
+        blocks = [render_job_description(f"J{n}", self.jds[row], score)
+                  for n, (row, score) in enumerate(retrieval["jds"], 1)]
+        blocks += [render_resume(f"C{n}", full[rid], score)
+                   for n, (rid, score) in enumerate(retrieval["resumes"], 1) if rid in full]
+        return build_context(blocks, self.context_tokens)
+
+    def build_prompt(self, question: str, context: Dict, history: List[Dict]) -> List[Dict]:
+        earlier, used = [], 0
+        for turn in reversed(history):
+            cost = estimate_tokens(turn["content"])
+            if used + cost > CHAT_HISTORY_TOKENS:
+                break
+            earlier.insert(0, {"role": turn["role"], "content": turn["content"]})
+            used += cost
+        # Claude's Messages API needs the conversation to start on a user turn
+        while earlier and earlier[0]["role"] != "user":
+            earlier.pop(0)
+
+        prompt = f"""You are a recruiting assistant. Answer the recruiter's question using ONLY the candidate and job records below.
+Refer to candidates by name. If the records don't answer the question, say so instead of guessing.
+The records are the most relevant ones retrieved for this question, not the whole candidate pool.
+
+<records>
+{context['text'] or 'No matching records were found.'}
+</records>
+
+Question: {question}"""
+        return earlier + [{"role": "user", "content": prompt}]
+
+    @traced("chat.answer")
+    def answer_stream(self, question: str, history: Optional[List[Dict]] = None,
+                      previous: Optional[Dict] = None) -> Dict:
+        """
+        Retrieves, assembles the context and starts streaming the answer.
+
+        Args:
+            question: The recruiter's message
+            history: Earlier turns as {"role": "user" | "assistant", "content": str}
+            previous: The retrieval of the previous turn, for follow-up questions
+
+        Returns:
+            {"stream": iterator of text chunks, "retrieval": ..., "context": ...}
+        """
+        retrieval = self.retrieve(question, previous)
+        with span("chat.context"):
+            context = self.context_for(retrieval)
+        body = json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "messages": self.build_prompt(question, context, history or []),
+            "max_tokens": CHAT_MAX_ANSWER_TOKENS,
+            "temperature": 0.2,
+        })
+        return {"stream": _stream_claude(body), "retrieval": retrieval, "context": context}
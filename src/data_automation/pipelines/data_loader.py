@@ -1,17 +1,21 @@
-import boto3
 import os
 import tempfile
 from io import BytesIO
-from typing import Dict, List
-from langchain_core.documents import Document
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, UnstructuredExcelLoader
+from typing import TYPE_CHECKING, Dict, List
+from src.aws_clients import get_client
+from src.observability.tracing import span, traced
 
-s3 = boto3.client("s3")
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
+# Placed between pages when they are merged back into one document
+PAGE_SEPARATOR = "\n\n"
+
+@traced("s3.list_objects")
 def list_s3_files(bucket: str, prefix: str) -> List[str]:
     """List all files under a given S3 prefix (folder)"""
     files = []
-    paginator = s3.get_paginator('list_objects_v2')
+    paginator = get_client("s3").get_paginator('list_objects_v2')
     for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
         for obj in page.get('Contents', []):
             key = obj['Key']
@@ -19,14 +23,18 @@ def list_s3_files(bucket: str, prefix: str) -> List[str]:
                 files.append(key)
     return files
 
+@traced("s3.download")
 def download_s3_file(bucket: str, key: str) -> str:
     """Download S3 file to a temp file and return its path"""
     _, ext = os.path.splitext(key)
     with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp_file:
-        s3.download_fileobj(bucket, key, tmp_file)
+        get_client("s3").download_fileobj(bucket, key, tmp_file)
         return tmp_file.name
 
 def load_document(bucket: str, key: str):
+    # langchain loaders are heavy to import, so only pay for them when a document is loaded
+    from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, UnstructuredExcelLoader
+
     ext = key.lower().split('.')[-1]
     local_path = download_s3_file(bucket, key)
 
@@ -39,9 +47,41 @@ def load_document(bucket: str, key: str):
     else:
         return []
 
-    return loader.load()
+    with span("document.parse", format=ext):
+        return loader.load()
+
+def assemble_pages(pages: List["Document"], source: str) -> "Document":
+    """
+    Merges the per-page Documents of one file back into a single Document.
+
+    PDF loaders return one Document per page, which would otherwise be
+    extracted and embedded as separate candidates/JDs.
+
+    Args:
+        pages: Documents loaded from one file, in page order
+        source: S3 URI of the file, used as the record's 'source' for caching
+
+    Returns:
+        One Document whose metadata keeps 'page_count' and 'page_offsets'
+        (character start/end of each page in the merged text)
+    """
+    from langchain_core.documents import Document
+
+    parts, offsets, position = [], [], 0
+    for number, page in enumerate(pages):
+        text = page.page_content or ""
+        if parts:
+            position += len(PAGE_SEPARATOR)
+        offsets.append({"page": page.metadata.get("page", number), "start": position, "end": position + len(text)})
+        parts.append(text)
+        position += len(text)
+
+    metadata = {k: v for k, v in (pages[0].metadata if pages else {}).items() if k != "page"}
+    metadata.update({"source": source, "page_count": len(pages), "page_offsets": offsets})
+    return Document(page_content=PAGE_SEPARATOR.join(parts), metadata=metadata)
 
-def load_and_extract_text_from_all_folders_s3(bucket_name: str, base_prefix: str) -> Dict[str, List[Document]]:
+@traced("s3.load_all_documents")
+def load_and_extract_text_from_all_folders_s3(bucket_name: str, base_prefix: str) -> Dict[str, List["Document"]]:
     """
     Loads documents from an S3 bucket, preserving structure:
     - Resumes/
@@ -67,7 +107,9 @@ def load_and_extract_text_from_all_folders_s3(bucket_name: str, base_prefix: str
             try:
                 #print(f"  Loading {label} file from S3: {file_key}") ------------------------------
                 loaded_docs = load_document(bucket_name, file_key)
-                docs.extend(loaded_docs)
+                if loaded_docs:
+                    # One document per file, so each is extracted and embedded once
+                    docs.append(assemble_pages(loaded_docs, f"s3://{bucket_name}/{file_key}"))
             except Exception as e:
                 print(f"  Error processing {file_key}: {e}")
 
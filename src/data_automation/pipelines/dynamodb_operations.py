@@ -1,89 +1,231 @@
-from decimal import Decimal
-import boto3
+import threading
+import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
-from boto3.dynamodb.conditions import Key
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from src.observability.tracing import incr, traced
+from src.storage.base import StorageBackend
+from src.storage.factory import create_storage_backend
+
+# What the matcher, search and corpus-version code need from a resume; the rest is hydrated on demand
+RESUME_PROJECTION = [
+    "id", "type", "name", "contact.email", "skills", "embedding", "embedding_backend",
+    "experience_years", "experience_level", "last_updated",
+]
+# Full records kept after hydration (e.g. the top matches on screen)
+HYDRATION_CACHE_SIZE = 256
+# Record whose 'stamp' changes on every resume/JD write, so local snapshots can tell they are stale
+CORPUS_STAMP_ID = "corpus_stamp"
+# Item types whose writes and deletes change the corpus (and so the stamp)
+CORPUS_ITEM_TYPES = ("resume", "job_description")
 
 class DynamoDBHandler:
-    def __init__(self, table_name: str, region_name: str = "eu-central-1"):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region_name)
-        self.table = self.dynamodb.Table(table_name)
-        
-    def _convert_floats_to_decimals(self, data: Dict) -> Dict:
-        """Recursively convert all float values in a dictionary to Decimals"""
-        if isinstance(data, dict):
-            return {k: self._convert_floats_to_decimals(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            # Special handling for embedding lists
-            if data and all(isinstance(x, (float, int)) for x in data):
-                return [Decimal(str(x)) for x in data]
-            return [self._convert_floats_to_decimals(v) for v in data]
-        elif isinstance(data, float):
-            return Decimal(str(data))
-        return data
+    def __init__(self, table_name: str, region_name: str = "eu-central-1", backend: Optional[StorageBackend] = None):
+        """
+        Args:
+            table_name: The table (or SQLite file) holding resumes, JDs and related records.
+            region_name: AWS region of the DynamoDB table.
+            backend: Storage engine to use; defaults to the one selected by STORAGE_BACKEND.
+        """
+        self.table_name = table_name
+        self.region_name = region_name
+        self.backend = backend or create_storage_backend(table_name, region_name=region_name)
+        self._hydrated: "OrderedDict[str, Dict]" = OrderedDict()
+        self._hydrated_lock = threading.Lock()
         
-    def save_resume(self, resume_data: Dict) -> bool:
+    def _save(self, item: Dict, label: str) -> bool:
         try:
-            # Convert any floats to Decimals
-            resume_data = self._convert_floats_to_decimals(resume_data)
-            resume_data['last_updated'] = datetime.utcnow().isoformat()
-            self.table.put_item(Item=resume_data)
+            item = dict(item)
+            item['last_updated'] = datetime.utcnow().isoformat()
+            self.backend.put_item(item)
+            self._forget(item.get('id'))
             return True
         except Exception as e:
-            print(f"Error saving resume to DynamoDB: {e}")
+            print(f"Error saving {label} to {self.backend.__class__.__name__}: {e}")
             return False
+
+    @traced("storage.put_item")
+    def save_resume(self, resume_data: Dict) -> bool:
+        saved = self._save(resume_data, "resume")
+        if saved:
+            self.touch_corpus()
+        return saved
             
+    @traced("storage.put_item")
     def save_job_description(self, jd_data: Dict) -> bool:
+        saved = self._save(jd_data, "job description")
+        if saved:
+            self.touch_corpus()
+        return saved
+            
+    @traced("storage.put_item")
+    def save_item(self, item: Dict) -> bool:
+        """Saves any other record type (e.g. feedback analyses) keyed by its 'id'."""
+        return self._save(item, "item")
+            
+    @traced("storage.put_item")
+    def save_item_if_version(self, item: Dict, expected_version: Optional[int]) -> Optional[bool]:
+        """
+        Saves an item only if the stored copy is still at expected_version (see
+        StorageBackend.put_item_if_version); None expects the item not to exist yet.
+
+        Returns:
+            True if saved, False if another writer changed the item first, None on a storage error
+        """
         try:
-            # Convert any floats to Decimals
-            jd_data = self._convert_floats_to_decimals(jd_data)
-            jd_data['last_updated'] = datetime.utcnow().isoformat()
-            self.table.put_item(Item=jd_data)
-            return True
+            item = dict(item)
+            item['last_updated'] = datetime.utcnow().isoformat()
+            saved = self.backend.put_item_if_version(item, expected_version)
+            self._forget(item.get('id'))
+            return saved
         except Exception as e:
-            print(f"Error saving job description to DynamoDB: {e}")
-            return False
-            
+            print(f"Error saving item to {self.backend.__class__.__name__}: {e}")
+            return None
+
+    @traced("storage.get_item")
     def get_resume(self, resume_id: str) -> Optional[Dict]:
         try:
-            response = self.table.get_item(Key={'id': resume_id})
-            return response.get('Item')
+            return self.backend.get_item(resume_id)
         except Exception as e:
-            print(f"Error getting resume from DynamoDB: {e}")
+            print(f"Error getting resume from storage: {e}")
             return None
-            
-    def get_all_resumes(self) -> List[Dict]:
+
+    @traced("storage.get_item")
+    def get_item(self, item_id: str) -> Optional[Dict]:
         try:
-            response = self.table.scan(
-                FilterExpression=Key('type').eq('resume')  # Only get resumes
-            )
-            items = response.get('Items', [])
-        
-            # Debugging - remove after confirmation
-            print(f"Found {len(items)} resumes in DynamoDB")
-            if items:
-                print(f"First resume has embedding: {'embedding' in items[0]}")
-                if 'embedding' in items[0]:
-                    print(f"Embedding type: {type(items[0]['embedding'])}")
-                
-            return items
+            return self.backend.get_item(item_id)
+        except Exception as e:
+            print(f"Error getting item from storage: {e}")
+            return None
+
+    @traced("storage.batch_get")
+    def get_items(self, item_ids: Iterable[str]) -> List[Dict]:
+        """Returns the items with these ids in the given order, skipping missing ones."""
+        try:
+            return self.backend.get_items(item_ids)
         except Exception as e:
-            print(f"Error getting all resumes from DynamoDB: {e}")
+            print(f"Error batch-getting items from storage: {e}")
             return []
-        
-            
-    def get_all_job_descriptions(self) -> List[Dict]:
+
+    def hydrate(self, item_ids: Iterable[str]) -> List[Dict]:
+        """
+        Full records for ids the caller only holds projections of.
+
+        Recently hydrated records are served from a small LRU; the rest are
+        fetched with one batched get. Saves and deletes invalidate entries.
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        with self._hydrated_lock:
+            records = {i: self._hydrated[i] for i in item_ids if i in self._hydrated}
+            for item_id in records:
+                self._hydrated.move_to_end(item_id)
+        incr("cache.hydration.hits", len(records))
+        missing = [i for i in item_ids if i not in records]
+        if missing:
+            incr("cache.hydration.misses", len(missing))
+            fetched = self.get_items(missing)
+            with self._hydrated_lock:
+                for item in fetched:
+                    records[item['id']] = item
+                    self._hydrated[item['id']] = item
+                while len(self._hydrated) > HYDRATION_CACHE_SIZE:
+                    self._hydrated.popitem(last=False)
+        return [records[i] for i in item_ids if i in records]
+
+    def _forget(self, item_id: Optional[str]):
+        with self._hydrated_lock:
+            self._hydrated.pop(item_id, None)
+
+    @traced("storage.query_by_source")
+    def get_items_by_source(self, source: str, item_type: Optional[str] = None) -> List[Dict]:
+        """Returns the records extracted from one source document (e.g. an S3 key)."""
+        try:
+            return self.backend.query_by_source(source, item_type)
+        except Exception as e:
+            print(f"Error getting items for source {source} from storage: {e}")
+            return []
+
+    def get_source_index(self, item_types: Iterable[str]) -> Dict[str, List[Dict]]:
+        """
+        {source: [item ids and types]} for every item of these types, from one projected scan per type.
+
+        Bulk loads look each document up here instead of calling get_items_by_source,
+        which is a full table scan per document on DynamoDB.
+        """
+        index: Dict[str, List[Dict]] = {}
+        for item_type in item_types:
+            for item in self.get_items_by_type(item_type, attributes=["id", "type", "metadata.source"]):
+                source = (item.get('metadata') or {}).get('source')
+                if source:
+                    index.setdefault(source, []).append(item)
+        return index
+
+    @traced("storage.query_by_type")
+    def get_items_by_type(self, item_type: str, attributes: Optional[List[str]] = None) -> List[Dict]:
         try:
-            response = self.table.scan()
-            return [item for item in response.get('Items', []) if item.get('type') == 'job_description']
+            return self.backend.query_by_type(item_type, attributes=attributes)
         except Exception as e:
-            print(f"Error getting all job descriptions from DynamoDB: {e}")
+            print(f"Error getting {item_type} items from storage: {e}")
             return []
             
-    def delete_item(self, item_id: str) -> bool:
+    def get_all_resumes(self) -> List[Dict]:
+        items = self.get_items_by_type('resume')
+        print(f"Found {len(items)} resumes in storage")
+        return items
+
+    def get_resume_projections(self) -> List[Dict]:
+        """Every resume reduced to RESUME_PROJECTION; use hydrate() for the full records."""
+        items = self.get_items_by_type('resume', attributes=RESUME_PROJECTION)
+        print(f"Found {len(items)} resumes in storage")
+        return items
+            
+    def get_all_job_descriptions(self) -> List[Dict]:
+        return self.get_items_by_type('job_description')
+            
+    @traced("storage.delete_item")
+    def delete_item(self, item_id: str, item_type: Optional[str] = None) -> bool:
+        """
+        Deletes an item; the corpus stamp is touched only when it was a resume or JD.
+
+        Args:
+            item_id: The item's id
+            item_type: The item's 'type', if the caller knows it; otherwise it is read first
+        """
         try:
-            self.table.delete_item(Key={'id': item_id})
-            return True
+            if item_type is None:
+                item_type = (self.backend.get_item(item_id) or {}).get('type')
+            self.backend.delete_item(item_id)
+            self._forget(item_id)
+        except Exception as e:
+            print(f"Error deleting item from storage: {e}")
+            return False
+        if item_type in CORPUS_ITEM_TYPES:
+            self.touch_corpus()
+        return True
+
+    def touch_corpus(self) -> Optional[str]:
+        """Marks the corpus as changed by giving the stamp record a new value, which it returns."""
+        stamp = uuid.uuid4().hex
+        try:
+            self.backend.put_item({
+                "id": CORPUS_STAMP_ID,
+                "type": CORPUS_STAMP_ID,
+                "stamp": stamp,
+                "last_updated": datetime.utcnow().isoformat(),
+            })
+            return stamp
         except Exception as e:
-            print(f"Error deleting item from DynamoDB: {e}")
-            return False
\ No newline at end of file
+            print(f"Error updating the corpus stamp in storage: {e}")
+            return None
+
+    def get_corpus_stamp(self) -> Optional[str]:
+        """The current corpus stamp, or None if nothing has written one yet."""
+        item = self.get_item(CORPUS_STAMP_ID)
+        return item.get('stamp') if item else None
+
+
+@lru_cache(maxsize=None)
+def get_dynamodb_handler(table_name: str = "ResumeJobMatcher", region_name: str = "eu-central-1") -> DynamoDBHandler:
+    """Returns the process-wide handler for a table, so every module shares one instance."""
+    return DynamoDBHandler(table_name=table_name, region_name=region_name)
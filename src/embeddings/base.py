@@ -0,0 +1,38 @@
+# src/embeddings/base.py
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class Embedder(ABC):
+    """
+    Turns text into fixed-length vectors.
+
+    `name` identifies the vector space (backend and model, e.g.
+    'bedrock:amazon.titan-embed-text-v1'). It is stored on every embedded item
+    as 'embedding_backend', and the matcher only compares vectors of the same name.
+    """
+
+    name: str
+
+    @property
+    @abstractmethod
+    def dim(self) -> int:
+        """Length of every vector this embedder returns."""
+
+    @abstractmethod
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embeds texts, returning one vector per text in the same order."""
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embeds a single string."""
+        return self.embed_batch([text])[0]
+
+
+def check_texts(texts: List[str]) -> List[str]:
+    """Validates embedder input: a list of non-empty strings."""
+    if not isinstance(texts, list):
+        raise ValueError("Input must be a list of strings.")
+    for text in texts:
+        if not text or not isinstance(text, str):
+            raise ValueError("Text must be a non-empty string.")
+    return texts
@@ -1,42 +1,64 @@
 # src/embeddings/bedrock_embedder.py
 
-import boto3
 import os
 import json
+from typing import List
+from src.aws_clients import get_client
+from src.embeddings.base import Embedder, check_texts
+from src.observability.tracing import incr, traced
 
 # Optional: Load from env vars or config
 BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
 MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "amazon.titan-embed-text-v1")  # Change this if using another model
+# Output length of the Titan text embedding models
+MODEL_DIMENSIONS = {"amazon.titan-embed-text-v1": 1536, "amazon.titan-embed-text-v2:0": 1024}
+
+
+class BedrockEmbedder(Embedder):
+    """Titan embeddings through Bedrock, one invoke_model call per text (Titan has no batch API)."""
+
+    def __init__(self, model_id: str = MODEL_ID, region_name: str = BEDROCK_REGION):
+        self.model_id = model_id
+        self.region_name = region_name
+        self.name = f"bedrock:{model_id}"
+        self._dim = MODEL_DIMENSIONS.get(model_id)
+
+    @property
+    def dim(self) -> int:
+        if self._dim is None:
+            self._dim = len(self.embed_text("dimension probe"))
+        return self._dim
+
+    @traced("bedrock.titan_embed")
+    def embed_text(self, text: str) -> List[float]:
+        check_texts([text])
+        client = get_client("bedrock-runtime", region_name=self.region_name)
+        incr("embedding.calls")
+
+        response = client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps({"inputText": text}),
+            contentType="application/json"
+        )
+
+        response_body = json.loads(response["body"].read())
+        return response_body.get("embedding", [])
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_text(text) for text in check_texts(texts)]
+
 
 def get_bedrock_client():
-    return boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+    return get_client("bedrock-runtime", region_name=BEDROCK_REGION)
 
 def embed_text(text):
     """
     Embeds a single string using Bedrock Titan model.
     """
-    if not text or not isinstance(text, str):
-        raise ValueError("Text must be a non-empty string.")
-
-    client = get_bedrock_client()
-    body = {
-        "inputText": text
-    }
-
-    response = client.invoke_model(
-        modelId=MODEL_ID,
-        body=json.dumps(body),
-        contentType="application/json"
-    )
-
-    response_body = json.loads(response["body"].read())
-    return response_body.get("embedding", [])
+    return BedrockEmbedder().embed_text(text)
 
 def embed_batch(text_list):
     """
     Embeds a list of strings using Bedrock Titan model.
     """
-    if not isinstance(text_list, list):
-        raise ValueError("Input must be a list of strings.")
-
-    return [embed_text(text) for text in text_list]
+    return BedrockEmbedder().embed_batch(text_list)
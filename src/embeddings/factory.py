@@ -0,0 +1,59 @@
+# src/embeddings/factory.py
+import os
+from functools import lru_cache
+from typing import Dict
+from src.embeddings.base import Embedder
+
+# "bedrock" (default, Titan over the network) or "spacy" (local CPU, see spacy_embedder)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "bedrock")
+EMBEDDING_REGION = "eu-central-1"
+TITAN_MODEL_ID = "amazon.titan-embed-text-v1"
+# Vector space of items stored before 'embedding_backend' was recorded
+LEGACY_EMBEDDING_BACKEND = f"bedrock:{TITAN_MODEL_ID}"
+
+
+def create_embedder(backend: str = None, region_name: str = EMBEDDING_REGION) -> Embedder:
+    """
+    Builds an embedder.
+
+    Args:
+        backend: "bedrock" or "spacy"; defaults to the EMBEDDING_BACKEND env var.
+        region_name: AWS region for the Bedrock backend.
+
+    Returns:
+        An Embedder instance.
+    """
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend == "spacy":
+        from src.embeddings.spacy_embedder import SpacyEmbedder
+        return SpacyEmbedder()
+    if backend == "bedrock":
+        from src.embeddings.bedrock_embedder import BedrockEmbedder
+        return BedrockEmbedder(TITAN_MODEL_ID, region_name=region_name)
+    raise ValueError(f"Unknown embedding backend: {backend!r} (expected 'bedrock' or 'spacy')")
+
+
+@lru_cache(maxsize=None)
+def get_embedder() -> Embedder:
+    """Returns the process-wide embedder for EMBEDDING_BACKEND."""
+    return create_embedder()
+
+
+@lru_cache(maxsize=None)
+def active_embedding_backend() -> str:
+    """Name of the configured embedder's vector space, without loading it (a spaCy model takes seconds)."""
+    if EMBEDDING_BACKEND.lower() == "spacy":
+        from src.embeddings.spacy_embedder import SPACY_MODEL
+        return f"spacy:{SPACY_MODEL}"
+    return LEGACY_EMBEDDING_BACKEND if EMBEDDING_BACKEND.lower() == "bedrock" else get_embedder().name
+
+
+def embedding_backend(record: Dict) -> str:
+    """Vector space a stored item's embedding belongs to."""
+    return record.get('embedding_backend') or LEGACY_EMBEDDING_BACKEND
+
+
+def embedding_fields(text: str) -> Dict:
+    """The 'embedding' and 'embedding_backend' fields of an item embedded from text by the active embedder."""
+    embedder = get_embedder()
+    return {"embedding": embedder.embed_text(text), "embedding_backend": embedder.name}
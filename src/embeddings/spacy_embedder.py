@@ -0,0 +1,45 @@
+# src/embeddings/spacy_embedder.py
+import os
+from typing import List
+from src.embeddings.base import Embedder, check_texts
+from src.observability.tracing import incr, span
+
+# Needs a pipeline with static word vectors (en_core_web_md or en_core_web_lg, 300 dimensions)
+SPACY_MODEL = os.getenv("SPACY_EMBEDDING_MODEL", "en_core_web_md")
+SPACY_BATCH_SIZE = 64
+# Worker processes for nlp.pipe; tokenizing is cheap, so more than 1 only pays off for large ingests
+SPACY_PROCESSES = int(os.getenv("SPACY_EMBEDDING_PROCESSES", "1"))
+
+
+class SpacyEmbedder(Embedder):
+    """
+    Local CPU embeddings: the average of a spaCy pipeline's static word vectors.
+
+    Texts are batched through nlp.pipe with every pipeline component disabled,
+    so only the tokenizer runs. No network call is made.
+    """
+
+    def __init__(self, model: str = SPACY_MODEL, batch_size: int = SPACY_BATCH_SIZE, n_process: int = SPACY_PROCESSES):
+        import spacy
+
+        self.nlp = spacy.load(model)
+        self.nlp.select_pipes(disable=self.nlp.pipe_names)
+        if not self.nlp.vocab.vectors_length:
+            raise ValueError(f"spaCy model {model!r} has no word vectors; use en_core_web_md or en_core_web_lg")
+        self.name = f"spacy:{model}"
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    @property
+    def dim(self) -> int:
+        return self.nlp.vocab.vectors_length
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        check_texts(texts)
+        incr("embedding.local_texts", len(texts))
+        with span("spacy.embed_batch", texts=len(texts)):
+            # Doc.vector averages the token vectors; a text with no known words gets the zero vector
+            return [
+                doc.vector.astype(float).tolist()
+                for doc in self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+            ]
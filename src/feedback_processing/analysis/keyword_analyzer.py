@@ -1,16 +1,35 @@
 # src/feedback_processing/analysis/keyword_analyzer.py
 from collections import Counter
+from functools import lru_cache
 import re
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from typing import Dict
+import numpy as np
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Sequence
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+# Compiled once: whole alphabetic tokens only (same filter as the old per-token re.match)
+TOKEN_PATTERN = re.compile(r"\b[a-z]+\b")
+
+
+@lru_cache(maxsize=1)
+def get_stop_words() -> frozenset:
+    """Returns the English stopword set, loaded from NLTK (and downloaded if missing) on first use."""
+    from nltk.corpus import stopwords
+
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        import nltk
+        nltk.download('stopwords')
+        return frozenset(stopwords.words('english'))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases the text and returns its alphabetic, non-stopword tokens."""
+    stop_words = get_stop_words()
+    return [w for w in TOKEN_PATTERN.findall(text.lower()) if w not in stop_words]
 
-try:
-    stopwords.words('english')
-except LookupError:
-    import nltk
-    nltk.download('stopwords')
-    nltk.download('punkt')
 
 def analyze_keywords(text: str, top_n: int = 10) -> Dict:
     """
@@ -24,17 +43,134 @@ def analyze_keywords(text: str, top_n: int = 10) -> Dict:
         A dictionary containing the top N keywords and their counts.
     """
     try:
-        stop_words = set(stopwords.words('english'))
-        word_tokens = word_tokenize(text.lower())
-        filtered_words = [w for w in word_tokens if not w in stop_words and re.match(r'^[a-zA-Z]+$', w)]
-        keyword_counts = Counter(filtered_words)
+        keyword_counts = Counter(tokenize(text))
         top_keywords = keyword_counts.most_common(top_n)
         return {"top_keywords": top_keywords}
     except Exception as e:
         print(f"Error during keyword analysis: {e}")
         return {"top_keywords_error": str(e)}
 
+
+def build_term_matrices(texts: Iterable[str]) -> Dict:
+    """
+    Tokenizes a whole corpus in one pass and builds sparse term matrices.
+
+    Args:
+        texts: The feedback documents to analyze.
+
+    Returns:
+        A dictionary containing:
+            - 'counts': CSR matrix (n_docs x n_terms) of raw term counts.
+            - 'tfidf': CSR matrix (n_docs x n_terms) of L2-normalised TF-IDF weights.
+            - 'vocabulary': numpy array mapping column index to term.
+        The matrices have no columns when no text has a keyword (empty or stop words only).
+    """
+    from scipy import sparse
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+
+    texts = [text or "" for text in texts]
+    vectorizer = CountVectorizer(analyzer=tokenize)
+    try:
+        counts = vectorizer.fit_transform(texts).tocsr()
+    except ValueError:  # "empty vocabulary"
+        empty = sparse.csr_matrix((len(texts), 0), dtype=np.float64)
+        return {"counts": empty.astype(np.int64), "tfidf": empty, "vocabulary": np.array([], dtype=object)}
+    tfidf = TfidfTransformer(sublinear_tf=True).fit_transform(counts).tocsr()
+    return {
+        "counts": counts,
+        "tfidf": tfidf,
+        "vocabulary": vectorizer.get_feature_names_out(),
+    }
+
+
+def _top_terms_per_row(matrix: "sparse.csr_matrix", vocabulary: np.ndarray, top_n: int) -> List[List]:
+    """Returns the top_n (term, value) pairs of every row of a CSR matrix."""
+    results = []
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        values = matrix.data[start:end]
+        columns = matrix.indices[start:end]
+        # Sort by value descending, then alphabetically for stable output
+        order = np.lexsort((vocabulary[columns], -values))[:top_n]
+        results.append([
+            (str(vocabulary[c]), v.item()) for c, v in zip(columns[order], values[order])
+        ])
+    return results
+
+
+def analyze_keywords_batch(texts: Sequence[str], top_n: int = 10, matrices: Dict = None) -> List[Dict]:
+    """
+    Identifies the top N keywords of every text in a corpus at once.
+
+    Args:
+        texts: The texts to analyze.
+        top_n: The number of top keywords to return per text.
+        matrices: Optional output of build_term_matrices() for these texts, to avoid re-tokenizing.
+
+    Returns:
+        A list with one dictionary per text, in the same format as analyze_keywords().
+    """
+    try:
+        matrices = matrices or build_term_matrices(texts)
+        top_keywords = _top_terms_per_row(matrices["counts"], matrices["vocabulary"], top_n)
+        return [{"top_keywords": keywords} for keywords in top_keywords]
+    except Exception as e:
+        print(f"Error during batch keyword analysis: {e}")
+        return [{"top_keywords_error": str(e)} for _ in texts]
+
+
+def distinctive_terms(
+    texts: Sequence[str], groups: Sequence[Hashable], top_n: int = 10, matrices: Dict = None
+) -> Dict[Hashable, List]:
+    """
+    Finds the terms that set each group (e.g. a candidate or a role) apart from the others.
+
+    Every group's documents are summed into one pseudo-document with a single sparse
+    product, and TF-IDF is computed across groups, so terms common to every group score low.
+
+    Args:
+        texts: The feedback documents.
+        groups: The group key of each document (same length as texts).
+        top_n: The number of distinctive terms to return per group.
+        matrices: Optional output of build_term_matrices() for these texts.
+
+    Returns:
+        A dictionary mapping each group key to a list of (term, score) pairs.
+    """
+    if len(texts) != len(groups):
+        raise ValueError("texts and groups must have the same length.")
+    if not texts:
+        return {}
+
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    matrices = matrices or build_term_matrices(texts)
+    group_keys = list(dict.fromkeys(groups))
+    if not len(matrices["vocabulary"]):
+        return {key: [] for key in group_keys}
+    group_index = {key: i for i, key in enumerate(group_keys)}
+    rows = np.array([group_index[g] for g in groups])
+    membership = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, np.arange(len(rows)))),
+        shape=(len(group_keys), len(rows)),
+    )
+
+    group_counts = membership @ matrices["counts"]
+    group_tfidf = TfidfTransformer(sublinear_tf=True).fit_transform(group_counts).tocsr()
+    top_terms = _top_terms_per_row(group_tfidf, matrices["vocabulary"], top_n)
+    return {key: [(term, round(score, 4)) for term, score in terms] for key, terms in zip(group_keys, top_terms)}
+
+
 if __name__ == "__main__":
     sample_text = "The candidate demonstrated strong technical skills, especially in Python and data structures. Python was mentioned multiple times. The candidate also showed enthusiasm."
     keywords = analyze_keywords(sample_text)
-    print(f"Top Keywords: {keywords}")
\ No newline at end of file
+    print(f"Top Keywords: {keywords}")
+
+    sample_corpus = [
+        sample_text,
+        "Communication was clear but the system design answer lacked depth on caching.",
+        "Strong Kubernetes and AWS experience, weak on system design trade-offs.",
+    ]
+    print(f"Batch Keywords: {analyze_keywords_batch(sample_corpus, top_n=3)}")
+    print(f"Distinctive Terms: {distinctive_terms(sample_corpus, ['alice', 'bob', 'bob'], top_n=3)}")
@@ -1,31 +1,68 @@
 # src/feedback_processing/analysis/llm_analyzer.py
-import boto3
 import json
-from typing import List, Dict
-from feedback_processing.analysis.sentiment_analyzer import analyze_sentiment
-from feedback_processing.analysis.keyword_analyzer import analyze_keywords
+from typing import List, Dict, Optional
+from src.aws_clients import get_client
+from src.observability.tracing import record_llm_usage, span, traced
+from src.feedback_processing.analysis.sentiment_analyzer import analyze_sentiment, analyze_sentiment_batch
+from src.feedback_processing.analysis.keyword_analyzer import analyze_keywords, analyze_keywords_batch
 
-bedrock = boto3.client(service_name='bedrock-runtime', region_name='eu-central-1') 
+BEDROCK_REGION = 'eu-central-1'
 
-def analyze_feedback_with_llm(feedback_text: str) -> Dict:
+MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+
+# Packed mode: prompt tokens allowed per request, and response tokens reserved per feedback item
+PACKED_TOKEN_BUDGET = 6000
+PACKED_MAX_ITEMS = 10
+PACKED_RESPONSE_TOKENS_PER_ITEM = 350
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for request packing."""
+    return len(text or "") // 4 + 1
+
+
+def _invoke_claude(prompt: str, max_tokens: int, temperature: float = 0.7) -> str:
+    body = json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature,  # Adjust for creativity vs. consistency
+        "top_p": 0.9
+    })
+    with span("bedrock.claude", task="feedback_analysis"):
+        response = get_client('bedrock-runtime', region_name=BEDROCK_REGION).invoke_model(body=body, modelId=MODEL_ID, accept='application/json', contentType='application/json')
+        response_body = json.loads(response.get('body').read())
+    record_llm_usage(response_body)
+    return response_body['content'][0]['text']
+
+
+@traced("feedback.analyze_single")
+def analyze_feedback_with_llm(
+    feedback_text: str, sentiment_result: Optional[Dict] = None, keyword_result: Optional[Dict] = None
+) -> Dict:
     """
     Analyzes the interview feedback text using a Bedrock LLM,
     incorporating sentiment and keyword analysis.
 
     Args:
         feedback_text: The text content extracted from the feedback file.
+        sentiment_result: Precomputed analyze_sentiment() output, computed here if omitted.
+        keyword_result: Precomputed analyze_keywords() output, computed here if omitted.
 
     Returns:
         A dictionary containing the LLM analysis, sentiment, and keywords.
     """
-    model_id = 'anthropic.claude-3-haiku-20240307-v1:0'  
-
-    sentiment_result = analyze_sentiment(feedback_text)
-    keyword_result = analyze_keywords(feedback_text)
+    sentiment_result = sentiment_result or analyze_sentiment(feedback_text)
+    keyword_result = keyword_result or analyze_keywords(feedback_text)
 
     prompt = f"""Human: You are an expert in analyzing interview feedback for technical roles.
     Here is the sentiment analysis of the feedback: {sentiment_result}.
-    Here are the top keywords identified: {keyword_result['top_keywords']}.
+    Here are the top keywords identified: {keyword_result.get('top_keywords')}.
 
     Please read the following feedback and provide a structured analysis, including:
 
@@ -39,33 +76,179 @@ def analyze_feedback_with_llm(feedback_text: str) -> Dict:
 
     Assistant:"""
 
-    body = json.dumps({
-        "anthropic_version": "bedrock-2023-05-31",
-        "messages": [
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "max_tokens": 1000,  # Adjust as needed
-        "temperature": 0.7,  # Adjust for creativity vs. consistency
-        "top_p": 0.9
-    })
-
-    accept = 'application/json'
-    content_type = 'application/json'
-
     try:
-        response = bedrock.invoke_model(body=body, modelId=model_id, accept=accept, contentType=content_type)
-        response_body = json.loads(response.get('body').read())
-        llm_analysis = response_body['content'][0]['text']
+        llm_analysis = _invoke_claude(prompt, max_tokens=1000)
         return {"llm_analysis": llm_analysis, "sentiment": sentiment_result, "keywords": keyword_result['top_keywords']}
     except Exception as e:
         print(f"Error during Bedrock invocation for feedback analysis: {e}")
         return {"llm_analysis_error": str(e), "sentiment_error": sentiment_result.get("sentiment_polarity_error"), "keywords_error": keyword_result.get("top_keywords_error")}
 
+
+def pack_feedback_items(items: List[Dict], token_budget: int = PACKED_TOKEN_BUDGET, max_items: int = PACKED_MAX_ITEMS) -> List[List[Dict]]:
+    """
+    Greedily groups feedback items into requests that stay under the token budget.
+
+    Args:
+        items: Dicts with at least a 'text' key, in processing order.
+        token_budget: Maximum estimated prompt tokens per packed request.
+        max_items: Maximum number of feedback items per packed request.
+
+    Returns:
+        A list of groups. Items too large to share a request end up alone in their group.
+    """
+    groups, current, current_tokens = [], [], 0
+    for item in items:
+        # Feedback text plus its sentiment/keyword annotations
+        item_tokens = estimate_tokens(item["text"]) + 60
+        if current and (current_tokens + item_tokens > token_budget or len(current) >= max_items):
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += item_tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _build_packed_prompt(group: List[Dict]) -> str:
+    sections = []
+    for item in group:
+        sections.append(
+            f"""<feedback id="{item['id']}">
+Sentiment: {item['sentiment']}
+Top keywords: {item['keywords'].get('top_keywords')}
+{item['text']}
+</feedback>"""
+        )
+    feedback_block = "\n\n".join(sections)
+
+    return f"""You are an expert in analyzing interview feedback for technical roles.
+Below are {len(group)} independent interview feedback notes, each wrapped in a <feedback> tag with an id,
+together with its sentiment analysis and top keywords. Analyze each note on its own.
+
+Return ONLY a JSON array with exactly one object per feedback note, in this structure:
+[
+  {{
+    "id": string (the feedback id),
+    "summary": string (brief summary of the overall feedback),
+    "strengths": [string] (key strengths of the candidate),
+    "improvements": [string] (areas where the candidate could improve),
+    "examples": [string] (specific examples or comments that highlight the candidate's performance)
+  }}
+]
+
+{feedback_block}
+"""
+
+
+def format_structured_analysis(analysis: Dict) -> str:
+    """Renders one packed-mode JSON result as the plain-text analysis stored for single calls."""
+    lines = [f"Summary: {analysis.get('summary', '')}"]
+    for label, key in (("Strengths", "strengths"), ("Areas for improvement", "improvements"), ("Examples", "examples")):
+        values = analysis.get(key) or []
+        if values:
+            lines.append(f"\n{label}:")
+            lines.extend(f"- {value}" for value in values)
+    return "\n".join(lines)
+
+
+def _parse_packed_response(content: str) -> Dict[str, Dict]:
+    """Returns the parsed analyses keyed by feedback id; unparseable entries are left out."""
+    json_start = content.find("[")
+    json_end = content.rfind("]")
+    if json_start == -1 or json_end == -1:
+        print("⚠️ JSON array not found in packed feedback analysis.")
+        return {}
+
+    try:
+        entries = json.loads(content[json_start:json_end + 1])
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON decoding failed for packed feedback analysis: {e}")
+        return {}
+
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if isinstance(entry, dict) and entry.get("id") and isinstance(entry.get("summary"), str):
+            parsed[str(entry["id"])] = entry
+    return parsed
+
+
+@traced("feedback.analyze_batch")
+def analyze_feedback_batch_with_llm(
+    feedback: Dict[str, str],
+    token_budget: int = PACKED_TOKEN_BUDGET,
+    max_items: int = PACKED_MAX_ITEMS,
+) -> Dict[str, Dict]:
+    """
+    Analyzes many feedback texts, packing several short ones into each Bedrock request.
+
+    Sentiment and keywords are computed for the whole batch up front. Any entry missing
+    from (or malformed in) a packed response is retried with analyze_feedback_with_llm().
+
+    Args:
+        feedback: Mapping of source file key to extracted feedback text.
+        token_budget: Maximum estimated prompt tokens per packed request.
+        max_items: Maximum number of feedback items per packed request.
+
+    Returns:
+        A mapping of source file key to a dictionary in the same format as
+        analyze_feedback_with_llm(), plus 'structured_analysis' for packed results.
+    """
+    file_keys = list(feedback.keys())
+    texts = [feedback[key] for key in file_keys]
+    with span("feedback.sentiment_batch"):
+        sentiments = analyze_sentiment_batch(texts)
+    with span("feedback.keywords_batch"):
+        keywords = analyze_keywords_batch(texts)
+
+    items = [
+        {"id": f"F{i + 1}", "file_key": key, "text": text, "sentiment": sentiment, "keywords": keyword}
+        for i, (key, text, sentiment, keyword) in enumerate(zip(file_keys, texts, sentiments, keywords))
+    ]
+
+    results = {}
+    for group in pack_feedback_items(items, token_budget=token_budget, max_items=max_items):
+        parsed = {}
+        if len(group) > 1:
+            try:
+                content = _invoke_claude(
+                    _build_packed_prompt(group),
+                    max_tokens=min(4000, PACKED_RESPONSE_TOKENS_PER_ITEM * len(group)),
+                    temperature=0.3,
+                )
+                parsed = _parse_packed_response(content)
+            except Exception as e:
+                print(f"Error during packed Bedrock invocation for feedback analysis: {e}")
+
+        for item in group:
+            analysis = parsed.get(item["id"])
+            if analysis is None:
+                if len(group) > 1:
+                    print(f"↩️ Falling back to single analysis for {item['file_key']}")
+                results[item["file_key"]] = analyze_feedback_with_llm(
+                    item["text"], sentiment_result=item["sentiment"], keyword_result=item["keywords"]
+                )
+                continue
+
+            analysis.pop("id", None)
+            results[item["file_key"]] = {
+                "llm_analysis": format_structured_analysis(analysis),
+                "structured_analysis": analysis,
+                "sentiment": item["sentiment"],
+                "keywords": item["keywords"].get("top_keywords"),
+            }
+
+    return results
+
+
 if __name__ == "__main__":
     # Example usage with dummy feedback
     sample_feedback = """The candidate demonstrated strong technical skills in Python and data structures. They were able to solve the coding problem effectively. However, their communication skills could be improved, as they struggled to clearly articulate their thought process. The interviewer noted that the candidate was enthusiastic and eager to learn."""
     analysis_result = analyze_feedback_with_llm(sample_feedback)
-    print(json.dumps(analysis_result, indent=4)) 
\ No newline at end of file
+    print(json.dumps(analysis_result, indent=4))
+
+    batch_results = analyze_feedback_batch_with_llm({
+        "feedback/a.txt": sample_feedback,
+        "feedback/b.txt": "Solid SQL knowledge, but needed hints on indexing. Friendly and clear communicator.",
+    })
+    print(json.dumps(batch_results, indent=4))
@@ -1,6 +1,20 @@
 # src/feedback_processing/analysis/sentiment_analyzer.py
-from textblob import TextBlob
-from typing import Dict
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from src.observability.tracing import incr
+
+# Results are keyed by a hash of the text, so re-scoring unchanged feedback is free
+SENTIMENT_CACHE_SIZE = 50_000
+_sentiment_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Below this many uncached texts a process pool costs more than it saves
+MIN_PARALLEL_BATCH = 64
+
 
 def analyze_sentiment(text: str) -> Dict:
     """
@@ -14,6 +28,8 @@ def analyze_sentiment(text: str) -> Dict:
         Polarity ranges from -1 (negative) to 1 (positive).
         Subjectivity ranges from 0 (objective) to 1 (subjective).
     """
+    from textblob import TextBlob  # Deferred: textblob pulls in nltk
+
     try:
         blob = TextBlob(text)
         sentiment = blob.sentiment
@@ -22,6 +38,124 @@ def analyze_sentiment(text: str) -> Dict:
         print(f"Error during sentiment analysis: {e}")
         return {"sentiment_polarity_error": str(e)}
 
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def clear_sentiment_cache() -> None:
+    """Drops every cached sentiment result."""
+    _sentiment_cache.clear()
+
+
+def analyze_sentiment_batch(
+    texts: Iterable[str], max_workers: Optional[int] = None, use_cache: bool = True
+) -> List[Dict]:
+    """
+    Analyzes the sentiment of many texts, reusing cached results and scoring the rest in parallel.
+
+    Args:
+        texts: The texts to analyze.
+        max_workers: Size of the process pool (None = number of CPUs, 1 = run in this process).
+        use_cache: Whether to read and update the content-hash cache.
+
+    Returns:
+        A list with one dictionary per text, in the same format as analyze_sentiment().
+    """
+    texts = list(texts)
+    hashes = [_content_hash(text) for text in texts]
+
+    # Score each distinct uncached text only once; hits are copied now, before new results can evict them
+    pending, hits = {}, {}
+    for text, digest in zip(texts, hashes):
+        if digest in pending or digest in hits:
+            continue
+        if use_cache and digest in _sentiment_cache:
+            _sentiment_cache.move_to_end(digest)
+            hits[digest] = _sentiment_cache[digest]
+            continue
+        pending[digest] = text
+
+    incr("cache.sentiment.hits", len(texts) - len(pending))
+    incr("cache.sentiment.misses", len(pending))
+
+    results = {}
+    if pending:
+        pending_texts = list(pending.values())
+        if max_workers == 1 or len(pending_texts) < MIN_PARALLEL_BATCH:
+            scored = [analyze_sentiment(text) for text in pending_texts]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                chunksize = max(1, len(pending_texts) // ((max_workers or os.cpu_count() or 1) * 4))
+                scored = list(pool.map(analyze_sentiment, pending_texts, chunksize=chunksize))
+        results = dict(zip(pending.keys(), scored))
+
+        if use_cache:
+            for digest, result in results.items():
+                if "sentiment_polarity_error" not in result:  # Never cache failures
+                    _sentiment_cache[digest] = result
+            while len(_sentiment_cache) > SENTIMENT_CACHE_SIZE:
+                _sentiment_cache.popitem(last=False)
+
+    return [dict(results[digest] if digest in results else hits[digest]) for digest in hashes]
+
+
+class LexiconSentimentScorer:
+    """
+    Vectorized approximation of TextBlob's pattern analyzer.
+
+    TextBlob's word lexicon is compiled once into a vocabulary with polarity and
+    subjectivity weight vectors; a corpus is then scored with one sparse matrix
+    product. Negations and intensifiers are ignored, so scores differ slightly
+    from analyze_sentiment() - use this for bulk trends, not single verdicts.
+    """
+
+    def __init__(self):
+        from sklearn.feature_extraction.text import CountVectorizer
+        from textblob.en import sentiment as pattern_sentiment
+
+        # Each lexicon entry maps POS tag -> (polarity, subjectivity, intensity); None holds the average
+        words = sorted(w for w in pattern_sentiment.keys() if w and None in pattern_sentiment[w])
+        self.polarity = np.array([pattern_sentiment[w][None][0] for w in words], dtype=np.float64)
+        self.subjectivity = np.array([pattern_sentiment[w][None][1] for w in words], dtype=np.float64)
+        self.vectorizer = CountVectorizer(
+            vocabulary=words,
+            lowercase=True,
+            token_pattern=r"(?u)\b\w[\w'-]*\b",
+            ngram_range=(1, max(len(w.split()) for w in words)),
+        )
+
+    def score(self, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Scores a corpus in one pass.
+
+        Args:
+            texts: The texts to score.
+
+        Returns:
+            A dictionary with 'sentiment_polarity' and 'sentiment_subjectivity' arrays,
+            one value per text (0.0 when no lexicon word occurs).
+        """
+        counts = self.vectorizer.transform([text or "" for text in texts])
+        matched = np.asarray(counts.sum(axis=1)).ravel()
+        denominator = np.where(matched > 0, matched, 1)
+        return {
+            "sentiment_polarity": (counts @ self.polarity) / denominator,
+            "sentiment_subjectivity": (counts @ self.subjectivity) / denominator,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_lexicon_scorer() -> LexiconSentimentScorer:
+    """Returns the shared, lazily compiled lexicon scorer."""
+    return LexiconSentimentScorer()
+
+
+def score_sentiment_lexicon(texts: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Scores polarity/subjectivity arrays for a corpus with the precompiled lexicon."""
+    return get_lexicon_scorer().score(texts)
+
+
 if __name__ == "__main__":
     sample_text_positive = "The candidate was very enthusiastic and performed well."
     sentiment_positive = analyze_sentiment(sample_text_positive)
@@ -34,3 +168,7 @@ if __name__ == "__main__":
     sample_text_neutral = "The interviewer asked several questions."
     sentiment_neutral = analyze_sentiment(sample_text_neutral)
     print(f"Sentiment (Neutral): {sentiment_neutral}")
+
+    samples = [sample_text_positive, sample_text_negative, sample_text_neutral, sample_text_positive]
+    print(f"Batch Sentiment: {analyze_sentiment_batch(samples)}")
+    print(f"Lexicon Sentiment: {score_sentiment_lexicon(samples)}")
@@ -0,0 +1,28 @@
+# src/feedback_processing/extraction/text_extractors.py
+import os
+
+
+def extract_text_from_feedback(file_path: str) -> str:
+    """
+    Extracts the plain text of a downloaded feedback file.
+
+    Args:
+        file_path: Local path of a .txt, .pdf or .docx feedback file.
+
+    Returns:
+        The extracted text, or an empty string if the format is unsupported or extraction fails.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        if ext == ".txt":
+            with open(file_path, encoding="utf-8", errors="replace") as f:
+                return f.read()
+        if ext == ".pdf":
+            from pypdf import PdfReader
+            return "\n".join(page.extract_text() or "" for page in PdfReader(file_path).pages)
+        if ext in (".docx", ".doc"):
+            import docx2txt
+            return docx2txt.process(file_path) or ""
+    except Exception as e:
+        print(f"Error extracting text from {file_path}: {e}")
+    return ""
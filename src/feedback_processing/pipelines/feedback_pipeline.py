@@ -1,66 +1,116 @@
 # src/feedback_processing/pipelines/feedback_pipeline.py
 import os
-import boto3
+from src.aws_clients import get_client
+from src.llm_scheduler import BULK, llm_priority
+from src.observability.tracing import start_trace, traced
 from ..extraction.text_extractors import extract_text_from_feedback
-from ..analysis.llm_analyzer import analyze_feedback_with_llm
+from ..analysis.llm_analyzer import analyze_feedback_with_llm, analyze_feedback_batch_with_llm
 from ..storage.dynamo_writer import write_feedback_analysis_to_dynamodb  # You'll need to create this
 
 # Configure S3 and DynamoDB (replace with your actual settings)
 S3_BUCKET_NAME = "your-s3-bucket-name"
 FEEDBACK_FOLDER = "interview_feedback"  # Optional subfolder in your bucket
 DYNAMODB_TABLE_NAME = "your-dynamodb-table-name"
-s3 = boto3.client('s3', region_name='eu-central-1')  # Specify your region
-dynamodb = boto3.resource('dynamodb', region_name='eu-central-1') # Specify your region
+AWS_REGION = 'eu-central-1'  # Specify your region
 
-def process_feedback_files():
+def feedback_context(s3_metadata: dict) -> dict:
     """
-    Orchestrates the processing of interview feedback files.
+    Candidate, role, skills and interview date of a feedback file, from its S3 user metadata
+    (x-amz-meta-candidate-id, -role, -skills as a comma-separated list, -interview-date).
+    These are the dimensions the feedback aggregates are rolled up by.
     """
-    try:
-        response = s3.list_objects_v2(Bucket=S3_BUCKET_NAME, Prefix=FEEDBACK_FOLDER)
-        if 'Contents' in response:
-            feedback_files = [obj['Key'] for obj in response['Contents']]
-            for file_key in feedback_files:
-                if file_key.endswith(('.txt', '.pdf', '.docx')):
-                    print(f"Processing feedback file: {file_key}")
-                    try:
-                        s3_object = s3.get_object(Bucket=S3_BUCKET_NAME, Key=file_key)
-                        file_content = s3_object['Body'].read()
+    context = {
+        'candidate_id': s3_metadata.get('candidate-id'),
+        'role': s3_metadata.get('role'),
+        'skills': [s.strip() for s in (s3_metadata.get('skills') or '').split(',') if s.strip()],
+        'interview_date': s3_metadata.get('interview-date'),
+    }
+    return {k: v for k, v in context.items() if v}
 
-                        # Determine file type and decode content if necessary
-                        feedback_text = ""
-                        if file_key.endswith('.txt'):
-                            feedback_text = file_content.decode('utf-8')
-                        else:
-                            # For PDF and DOCX, we'll save locally and then extract
-                            local_file_path = f"/tmp/{os.path.basename(file_key)}" # Use /tmp in Lambda
-                            with open(local_file_path, 'wb') as f:
-                                f.write(file_content)
-                            feedback_text = extract_text_from_feedback(local_file_path)
-                            os.remove(local_file_path) # Clean up local file
+@traced("feedback.read_file")
+def _read_feedback_text(file_key: str, context: dict = None) -> str:
+    """Downloads a feedback file from S3 and returns its text; fills `context` from the object's metadata."""
+    s3_object = get_client('s3', region_name=AWS_REGION).get_object(Bucket=S3_BUCKET_NAME, Key=file_key)
+    file_content = s3_object['Body'].read()
+    if context is not None:
+        context.update(feedback_context(s3_object.get('Metadata') or {}))
 
-                        if feedback_text:
-                            analysis_results = analyze_feedback_with_llm(feedback_text)
-                            # Prepare data for DynamoDB
-                            item = {
-                                'feedback_file': file_key,
-                                'llm_analysis': analysis_results.get('llm_analysis'),
-                                'sentiment_polarity': analysis_results.get('sentiment', {}).get('sentiment_polarity'),
-                                'sentiment_subjectivity': analysis_results.get('sentiment', {}).get('sentiment_subjectivity'),
-                                'keywords': analysis_results.get('keywords')
-                                # Add other relevant data here
-                            }
-                            write_feedback_analysis_to_dynamodb(DYNAMODB_TABLE_NAME, item)
-                            print(f"Analysis results stored for: {file_key}")
-                        else:
-                            print(f"Could not extract text from: {file_key}")
-                    except Exception as e:
-                        print(f"Error processing {file_key}: {e}")
-        else:
-            print(f"No feedback files found in {S3_BUCKET_NAME}/{FEEDBACK_FOLDER}")
+    # Determine file type and decode content if necessary
+    if file_key.endswith('.txt'):
+        return file_content.decode('utf-8')
+
+    # For PDF and DOCX, we'll save locally and then extract
+    local_file_path = f"/tmp/{os.path.basename(file_key)}" # Use /tmp in Lambda
+    with open(local_file_path, 'wb') as f:
+        f.write(file_content)
+    feedback_text = extract_text_from_feedback(local_file_path)
+    os.remove(local_file_path) # Clean up local file
+    return feedback_text
+
+@traced("feedback.store")
+def _store_analysis(file_key: str, analysis_results: dict, context: dict = None):
+    # Prepare data for DynamoDB
+    item = {
+        **(context or {}),
+        'feedback_file': file_key,
+        'llm_analysis': analysis_results.get('llm_analysis'),
+        'sentiment_polarity': analysis_results.get('sentiment', {}).get('sentiment_polarity'),
+        'sentiment_subjectivity': analysis_results.get('sentiment', {}).get('sentiment_subjectivity'),
+        'keywords': analysis_results.get('keywords')
+        # Add other relevant data here
+    }
+    if analysis_results.get('structured_analysis'):
+        item['structured_analysis'] = analysis_results['structured_analysis']
+    write_feedback_analysis_to_dynamodb(DYNAMODB_TABLE_NAME, item)
+    print(f"Analysis results stored for: {file_key}")
+
+def _process_feedback_keys(feedback_files, packed: bool):
+    """Reads, analyzes and stores the given feedback files."""
+    feedback_texts, contexts = {}, {}
+    for file_key in feedback_files:
+        if file_key.endswith(('.txt', '.pdf', '.docx')):
+            print(f"Processing feedback file: {file_key}")
+            try:
+                contexts[file_key] = {}
+                feedback_text = _read_feedback_text(file_key, contexts[file_key])
+                if not feedback_text:
+                    print(f"Could not extract text from: {file_key}")
+                    continue
+                if packed:
+                    feedback_texts[file_key] = feedback_text
+                else:
+                    _store_analysis(file_key, analyze_feedback_with_llm(feedback_text), contexts[file_key])
+            except Exception as e:
+                print(f"Error processing {file_key}: {e}")
+
+    if feedback_texts:
+        for file_key, analysis_results in analyze_feedback_batch_with_llm(feedback_texts).items():
+            try:
+                _store_analysis(file_key, analysis_results, contexts.get(file_key))
+            except Exception as e:
+                print(f"Error processing {file_key}: {e}")
 
+def process_feedback_files(packed: bool = True):
+    """
+    Orchestrates the processing of interview feedback files.
+
+    Args:
+        packed: Analyze short feedback notes several per Bedrock request
+            (see analyze_feedback_batch_with_llm) instead of one request per file.
+    """
+    try:
+        response = get_client('s3', region_name=AWS_REGION).list_objects_v2(Bucket=S3_BUCKET_NAME, Prefix=FEEDBACK_FOLDER)
+        if 'Contents' not in response:
+            print(f"No feedback files found in {S3_BUCKET_NAME}/{FEEDBACK_FOLDER}")
+            return
     except Exception as e:
         print(f"Error listing S3 objects: {e}")
+        return
+
+    with llm_priority(BULK, job="feedback_pipeline"):
+        _process_feedback_keys([obj['Key'] for obj in response['Contents']], packed)
 
 if __name__ == "__main__":
-    process_feedback_files()
\ No newline at end of file
+    with start_trace("feedback_pipeline") as trace:
+        process_feedback_files()
+    print(trace.to_json())
\ No newline at end of file
@@ -0,0 +1,29 @@
+# src/feedback_processing/storage/dynamo_writer.py
+from typing import Dict
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.feedback_processing.storage.feedback_aggregates import update_feedback_aggregates
+
+
+def write_feedback_analysis_to_dynamodb(table_name: str, item: Dict) -> bool:
+    """
+    Stores one feedback analysis item and folds it into the feedback aggregates.
+
+    Args:
+        table_name: The DynamoDB table to write to.
+        item: The analysis item; its 'feedback_file' doubles as the item id if none is set.
+
+    Returns:
+        True if the item was saved.
+    """
+    item = dict(item)
+    item.setdefault("id", item.get("feedback_file"))
+    item.setdefault("type", "feedback_analysis")
+    handler = get_dynamodb_handler(table_name)
+    # Only the writer that creates the item counts it; re-stored feedback (e.g. a pipeline re-run) is already counted
+    created = handler.save_item_if_version(item, None)
+    if created is None:
+        return False
+    if not created:
+        return handler.save_item(item)
+    update_feedback_aggregates(item, handler)
+    return True
@@ -0,0 +1,259 @@
+# src/feedback_processing/storage/feedback_aggregates.py
+"""
+Feedback rollups maintained as each analysis is stored.
+
+Every stored analysis updates one 'feedback_aggregate' record per scope it
+belongs to: 'all', 'candidate:<id>', 'role:<role>', 'skill:<skill>' and
+'month:<YYYY-MM>'. Each record holds
+
+- running sentiment statistics (Welford mean/variance, min, max),
+- a count-min sketch of keyword counts plus the heaviest keywords seen,
+- bounded strength and weakness tallies (Space-Saving),
+
+so every update touches a fixed amount of data, and rollups are read
+without rescanning or re-analyzing the raw feedback items. Records are
+versioned and written with a conditional put, so concurrent writers (other
+pipeline processes or Streamlit workers) re-read and retry instead of
+overwriting each other's counts.
+"""
+import hashlib
+import math
+import random
+import re
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.observability.tracing import incr
+
+FEEDBACK_AGGREGATE_TYPE = "feedback_aggregate"
+# Count-min sketch size: estimates overshoot by at most ~e/WIDTH of the total keyword count, with prob. 1 - e^-DEPTH
+SKETCH_WIDTH = 272
+SKETCH_DEPTH = 4
+# Keywords, strengths and weaknesses kept per scope
+HEAVY_HITTERS = 20
+TALLY_SIZE = 50
+# Conditional-put attempts per scope before an update is given up
+MAX_UPDATE_ATTEMPTS = 10
+
+
+def aggregate_id(scope: str) -> str:
+    return f"{FEEDBACK_AGGREGATE_TYPE}#{scope}"
+
+
+def feedback_scopes(item: Dict, now: Optional[datetime] = None) -> List[str]:
+    """Scopes an analysis item counts towards, from its optional candidate_id, role, skills and interview_date."""
+    scopes = ["all"]
+    if item.get('candidate_id'):
+        scopes.append(f"candidate:{item['candidate_id']}")
+    if item.get('role'):
+        scopes.append(f"role:{str(item['role']).strip().lower()}")
+    for skill in dict.fromkeys(str(s).strip().lower() for s in item.get('skills') or [] if str(s).strip()):
+        scopes.append(f"skill:{skill}")
+    when = str(item.get('interview_date') or (now or datetime.utcnow()).isoformat())
+    scopes.append(f"month:{when[:7]}")
+    return scopes
+
+
+def _new_aggregate(scope: str) -> Dict:
+    return {
+        "id": aggregate_id(scope),
+        "type": FEEDBACK_AGGREGATE_TYPE,
+        "scope": scope,
+        "feedback_count": 0,
+        "sentiment": {
+            "polarity": {"count": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None},
+            "subjectivity": {"count": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None},
+        },
+        "keyword_sketch": [[0] * SKETCH_WIDTH for _ in range(SKETCH_DEPTH)],
+        "keyword_total": 0,
+        "top_keywords": {},
+        "strengths": {},
+        "weaknesses": {},
+    }
+
+
+# --- Running statistics ---------------------------------------------------------
+
+def _welford_add(stats: Dict, value: float):
+    count = int(stats["count"]) + 1
+    mean = float(stats["mean"])
+    delta = value - mean
+    mean += delta / count
+    stats["m2"] = float(stats["m2"]) + delta * (value - mean)
+    stats["count"], stats["mean"] = count, mean
+    stats["min"] = value if stats.get("min") is None else min(float(stats["min"]), value)
+    stats["max"] = value if stats.get("max") is None else max(float(stats["max"]), value)
+
+
+def summarize_stats(stats: Dict) -> Dict:
+    count = int(stats["count"])
+    return {
+        "count": count,
+        "mean": round(float(stats["mean"]), 4) if count else None,
+        "stddev": round(math.sqrt(float(stats["m2"]) / (count - 1)), 4) if count > 1 else None,
+        "min": float(stats["min"]) if stats.get("min") is not None else None,
+        "max": float(stats["max"]) if stats.get("max") is not None else None,
+    }
+
+
+# --- Keyword sketch -------------------------------------------------------------
+
+def _sketch_columns(term: str) -> List[int]:
+    """One column per sketch row, from a hash that is stable across processes (unlike hash())."""
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=4 * SKETCH_DEPTH).digest()
+    return [int.from_bytes(digest[4 * row:4 * row + 4], "little") % SKETCH_WIDTH for row in range(SKETCH_DEPTH)]
+
+
+def sketch_estimate(sketch: List[List], term: str) -> int:
+    """Count-min estimate of a keyword's count: never under, rarely much over."""
+    return min(int(sketch[row][column]) for row, column in enumerate(_sketch_columns(term)))
+
+
+def _sketch_add(aggregate: Dict, term: str, count: int):
+    term = term.lower()  # keyword_count looks terms up lowercased
+    sketch = aggregate["keyword_sketch"]
+    for row, column in enumerate(_sketch_columns(term)):
+        sketch[row][column] = int(sketch[row][column]) + count
+    aggregate["keyword_total"] = int(aggregate["keyword_total"]) + count
+
+    # Heavy hitters: keep the HEAVY_HITTERS terms with the largest estimates
+    top = {k: int(v) for k, v in aggregate["top_keywords"].items()}
+    top[term] = sketch_estimate(sketch, term)
+    if len(top) > HEAVY_HITTERS:
+        del top[min(top, key=top.get)]
+    aggregate["top_keywords"] = top
+
+
+# --- Strength / weakness tallies --------------------------------------------------
+
+def _normalize_point(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s+#./-]", "", str(text).lower())).strip(" .-")[:120]
+
+
+def _tally_add(tally: Dict, point: str):
+    """Space-Saving: at most TALLY_SIZE entries; a new point replaces the rarest and inherits its count."""
+    if point in tally:
+        tally[point] = int(tally[point]) + 1
+    elif len(tally) < TALLY_SIZE:
+        tally[point] = 1
+    else:
+        rarest = min(tally, key=lambda k: int(tally[k]))
+        tally[point] = int(tally.pop(rarest)) + 1
+
+
+def analysis_points(item: Dict) -> Tuple[List[str], List[str]]:
+    """
+    Strengths and weaknesses of one analysis item.
+
+    Taken from 'structured_analysis' (packed mode); otherwise the bullet
+    points under the strengths / improvement headings of the LLM text.
+    """
+    structured = item.get('structured_analysis')
+    if isinstance(structured, dict):
+        return list(structured.get('strengths') or []), list(structured.get('improvements') or [])
+
+    strengths, weaknesses, current = [], [], None
+    for line in str(item.get('llm_analysis') or "").splitlines():
+        stripped = line.strip()
+        bullet = re.match(r"^(?:[-*•]|\d+[.)])\s+(.*)", stripped)
+        if bullet and current is not None:
+            current.append(bullet.group(1))
+        elif stripped:
+            heading = stripped.lower()
+            current = strengths if "strength" in heading else weaknesses if "improv" in heading or "weakness" in heading else None
+    return strengths, weaknesses
+
+
+def _keyword_counts(keywords) -> Iterable[Tuple[str, int]]:
+    for entry in keywords or []:
+        if isinstance(entry, (list, tuple)) and len(entry) == 2:
+            yield str(entry[0]), int(entry[1])
+        elif isinstance(entry, str):
+            yield entry, 1
+
+
+def _apply(aggregate: Dict, item: Dict, strengths: List[str], weaknesses: List[str]):
+    aggregate["feedback_count"] = int(aggregate["feedback_count"]) + 1
+    for field, key in (("sentiment_polarity", "polarity"), ("sentiment_subjectivity", "subjectivity")):
+        if isinstance(item.get(field), (int, float, Decimal)) and not isinstance(item.get(field), bool):
+            _welford_add(aggregate["sentiment"][key], float(item[field]))
+    for term, count in _keyword_counts(item.get('keywords')):
+        _sketch_add(aggregate, term, count)
+    for point in strengths:
+        _tally_add(aggregate["strengths"], point)
+    for point in weaknesses:
+        _tally_add(aggregate["weaknesses"], point)
+
+
+def update_feedback_aggregates(item: Dict, handler=None) -> List[str]:
+    """
+    Adds one stored analysis item to the aggregates of every scope it belongs to.
+
+    Call once per feedback item; re-adding the same item counts it twice.
+
+    Returns:
+        The scopes that were updated
+    """
+    handler = handler or get_dynamodb_handler()
+    scopes = feedback_scopes(item)
+    strengths, weaknesses = ([p for p in map(_normalize_point, points) if p] for points in analysis_points(item))
+    stored = {a['scope']: a for a in handler.get_items([aggregate_id(s) for s in scopes])}
+    updated = []
+    for scope in scopes:
+        aggregate = stored.get(scope)
+        for attempt in range(MAX_UPDATE_ATTEMPTS):
+            expected = None if aggregate is None else int(aggregate.get('version') or 0)
+            aggregate = aggregate or _new_aggregate(scope)
+            _apply(aggregate, item, strengths, weaknesses)
+            saved = handler.save_item_if_version(aggregate, expected)
+            if saved is not False:
+                if saved:
+                    updated.append(scope)
+                break
+            # Another writer updated the scope since it was read: apply the item to its version instead
+            incr("feedback_aggregates.conflicts")
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))  # Jittered, so the writers that clashed spread out
+            aggregate = handler.get_item(aggregate_id(scope))
+        else:
+            print(f"⚠️ Gave up updating feedback aggregate {scope} after {MAX_UPDATE_ATTEMPTS} conflicting writes")
+    return updated
+
+
+def summarize_aggregate(aggregate: Dict, top_n: int = 10) -> Dict:
+    """Readable rollup of one aggregate record."""
+    def ranked(counts: Dict) -> List[Tuple[str, int]]:
+        return sorted(((k, int(v)) for k, v in counts.items()), key=lambda kv: (-kv[1], kv[0]))[:top_n]
+
+    return {
+        "scope": aggregate["scope"],
+        "feedback_count": int(aggregate["feedback_count"]),
+        "polarity": summarize_stats(aggregate["sentiment"]["polarity"]),
+        "subjectivity": summarize_stats(aggregate["sentiment"]["subjectivity"]),
+        "top_keywords": ranked(aggregate["top_keywords"]),
+        "top_strengths": ranked(aggregate["strengths"]),
+        "top_weaknesses": ranked(aggregate["weaknesses"]),
+        "last_updated": aggregate.get("last_updated"),
+    }
+
+
+def get_feedback_aggregate(scope: str, handler=None, top_n: int = 10) -> Optional[Dict]:
+    """Rollup for one scope (e.g. 'candidate:123', 'role:senior', 'skill:python'), or None if it has no feedback."""
+    aggregate = (handler or get_dynamodb_handler()).get_item(aggregate_id(scope))
+    return summarize_aggregate(aggregate, top_n) if aggregate else None
+
+
+def keyword_count(scope: str, term: str, handler=None) -> int:
+    """Estimated number of times a keyword appeared in the scope's feedback."""
+    aggregate = (handler or get_dynamodb_handler()).get_item(aggregate_id(scope))
+    return sketch_estimate(aggregate["keyword_sketch"], term.lower()) if aggregate else 0
+
+
+def list_feedback_aggregates(prefix: str = "", handler=None, top_n: int = 10) -> List[Dict]:
+    """Rollups of every scope starting with prefix (e.g. 'month:' for the keyword trend over time)."""
+    aggregates = (handler or get_dynamodb_handler()).get_items_by_type(FEEDBACK_AGGREGATE_TYPE)
+    return sorted(
+        (summarize_aggregate(a, top_n) for a in aggregates if str(a.get('scope', '')).startswith(prefix)),
+        key=lambda summary: summary["scope"],
+    )
@@ -1,26 +1,160 @@
+import os
 import uuid
 import json
-import boto3
-from langchain_core.documents import Document
-from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
-from src.resume_processing.information_extraction import embed_text
-from typing import Dict, Any, List, Optional
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from src.aws_clients import get_client
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.embeddings.factory import embedding_fields
+from src.job_description_processing.json_stream import JSONArrayStreamParser
+from src.observability.tracing import incr, record_llm_usage, span, traced
+from src.matching.semantic_matcher import has_embedding
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
 BEDROCK_REGION = "eu-central-1"
 MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+# Stream the Claude response and embed/save each level as soon as it is complete (set to 0 to disable)
+STREAM_EXTRACTION = os.getenv("STREAM_JD_EXTRACTION", "1") == "1"
+# Levels embedded concurrently while the rest of the response is generated
+LEVEL_WORKERS = 4
+
+
+def _embedding_text(level_data: Dict[str, Any]) -> str:
+    """Text a level is embedded from, built from its key fields."""
+    return (
+        f"Title: {level_data.get('title', '')}\n"
+        f"Level: {level_data.get('level', '')}\n"
+        f"Experience: {level_data.get('experience', '')}\n"
+        f"Focus: {level_data.get('focus', '')}\n"
+        f"Requirements: {', '.join(level_data.get('core_requirements', []))}\n"
+        f"Skills: {', '.join(level_data.get('soft_skills', []))}\n"
+        f"Technologies: {', '.join(level_data.get('technologies_mentioned', []))}"
+    )
+
+
+def _embed_level(level_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Embedding fields for one extracted level."""
+    return embedding_fields(_embedding_text(level_data))
+
+
+def _save_level(level_data: Dict[str, Any], doc: "Document", dynamodb_handler,
+                embedding: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Embeds one extracted level (unless given its embedding) and saves it; returns the stored record or None if the save failed."""
+    # Generate embedding for this specific level
+    embedding = embedding if embedding is not None else _embed_level(level_data)
+
+    # Add metadata and other fields
+    level_data.update({
+        "metadata": doc.metadata,
+        "full_text": doc.page_content[:500] + "...",
+        "id": str(uuid.uuid4()),
+        "type": "job_description",
+        **embedding
+    })
 
-bedrock = boto3.client(service_name='bedrock-runtime', region_name=BEDROCK_REGION)
-dynamodb_handler = DynamoDBHandler(table_name="ResumeJobMatcher")
-
-def extract_job_details_llm(doc: Document) -> Optional[List[Dict[str, Any]]]:
-    """Uses Claude 3 via Bedrock to extract structured job details from text for each level"""
+    # Save to DynamoDB
+    if dynamodb_handler.save_job_description(level_data):
+        return level_data
+    print(f"⚠️ Failed to save level {level_data.get('level')} to DynamoDB")
+    return None
+
+
+def _stream_claude_text(body: str) -> Iterator[str]:
+    """Yields Claude's text deltas from invoke_model_with_response_stream, recording usage once the stream ends."""
+    response = get_client("bedrock-runtime", region_name=BEDROCK_REGION).invoke_model_with_response_stream(
+        body=body,
+        modelId=MODEL_ID,
+        accept='application/json',
+        contentType='application/json'
+    )
+    usage = {}
+    for event in response.get("body"):
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        message = json.loads(chunk["bytes"])
+        if message.get("type") == "message_start":
+            usage.update(message.get("message", {}).get("usage", {}))
+        elif message.get("type") == "message_delta":
+            usage.update(message.get("usage", {}))
+        elif message.get("type") == "content_block_delta":
+            yield message.get("delta", {}).get("text", "")
+    record_llm_usage({"usage": usage})
+
+
+def _extract_levels_streaming(doc: "Document", body: str, dynamodb_handler) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parses each level object as soon as it is complete in the response stream and
+    hands it to a worker pool for embedding, so Claude keeps generating later levels
+    while earlier ones are embedded. Saves run on this thread, which owns the storage
+    handler's boto3 resource, each as soon as its embedding is ready.
+    """
+    parser = JSONArrayStreamParser()
+    levels, futures = [], []
+    saved_levels = []
+
+    def save_ready(wait: bool = False):
+        # Saves keep stream order: each waits for its own level's embedding
+        while futures and (wait or futures[0].done()):
+            saved = _save_level(levels.pop(0), doc, dynamodb_handler, embedding=futures.pop(0).result())
+            if saved:
+                saved_levels.append(saved)
+
+    streamed = 0
+    with ThreadPoolExecutor(max_workers=LEVEL_WORKERS) as pool:
+        with span("bedrock.claude", task="extract_job_details", stream=True):
+            for text in _stream_claude_text(body):
+                for level_data in parser.feed(text):
+                    if isinstance(level_data, dict):
+                        incr("job_description.levels_streamed")
+                        streamed += 1
+                        levels.append(level_data)
+                        # Copy the context so spans and counters land on the caller's trace
+                        futures.append(pool.submit(contextvars.copy_context().run, _embed_level, level_data))
+                save_ready()
+        save_ready(wait=True)
+
+    if parser.errors:
+        print(f"⚠️ {parser.errors} level(s) could not be parsed from the streamed response.")
+    if not streamed:
+        print("⚠️ No valid levels extracted.")
+    return saved_levels if saved_levels else None
+
+
+@traced("extract_job_details_llm")
+def extract_job_details_llm(doc: "Document", stream: Optional[bool] = None,
+                            source_index: Optional[Dict[str, List[Dict]]] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Uses Claude 3 via Bedrock to extract structured job details from text for each level
+
+    Args:
+        doc: The career path document
+        stream: Parse and store levels while the response streams in; defaults to STREAM_EXTRACTION
+        source_index: DynamoDBHandler.get_source_index() output for bulk loads; without it
+            the stored levels are looked up by source (a table scan on DynamoDB)
+    """
+    dynamodb_handler = get_dynamodb_handler()
     
     # Check if we already have this JD processed
     if doc.metadata.get('source'):
-        existing_jds = [jd for jd in dynamodb_handler.get_all_job_descriptions() 
-                      if jd.get('metadata', {}).get('source') == doc.metadata['source']]
+        if source_index is None:
+            existing_jds = dynamodb_handler.get_items_by_source(doc.metadata['source'], 'job_description')
+        else:
+            existing_jds = dynamodb_handler.hydrate(
+                item['id'] for item in source_index.get(doc.metadata['source'], []) if item.get('type') == 'job_description'
+            )
         if existing_jds:
+            incr("cache.job_description.hits")
+            for jd in existing_jds:
+                if not has_embedding(jd):
+                    # Embedded by another backend: move it into the active vector space without re-extracting
+                    jd.update(embedding_fields(_embedding_text(jd)))
+                    dynamodb_handler.save_job_description(jd)
             return existing_jds
+        incr("cache.job_description.misses")
 
     prompt = f"""
 You are an expert at extracting structured information from career path documents. Given the raw text below, 
@@ -57,14 +191,19 @@ Important Notes:
     })
 
     try:
-        response = bedrock.invoke_model(
-            body=body,
-            modelId=MODEL_ID,
-            accept='application/json',
-            contentType='application/json'
-        )
-
-        response_body = json.loads(response.get("body").read())
+        if STREAM_EXTRACTION if stream is None else stream:
+            return _extract_levels_streaming(doc, body, dynamodb_handler)
+
+        with span("bedrock.claude", task="extract_job_details"):
+            response = get_client("bedrock-runtime", region_name=BEDROCK_REGION).invoke_model(
+                body=body,
+                modelId=MODEL_ID,
+                accept='application/json',
+                contentType='application/json'
+            )
+
+            response_body = json.loads(response.get("body").read())
+        record_llm_usage(response_body)
         content_list = response_body.get("content", [])
         content = "".join([item.get("text", "") for item in content_list]).strip()
 
@@ -98,35 +237,9 @@ Important Notes:
         for level_data in extracted_levels:
             if not isinstance(level_data, dict):
                 continue
-                
-            # Create embedding text from key fields
-            embedding_text = (
-                f"Title: {level_data.get('title', '')}\n"
-                f"Level: {level_data.get('level', '')}\n"
-                f"Experience: {level_data.get('experience', '')}\n"
-                f"Focus: {level_data.get('focus', '')}\n"
-                f"Requirements: {', '.join(level_data.get('core_requirements', []))}\n"
-                f"Skills: {', '.join(level_data.get('soft_skills', []))}\n"
-                f"Technologies: {', '.join(level_data.get('technologies_mentioned', []))}"
-            )
-            
-            # Generate embedding for this specific level
-            embedding = embed_text(embedding_text)
-            
-            # Add metadata and other fields
-            level_data.update({
-                "metadata": doc.metadata,
-                "full_text": doc.page_content[:500] + "...",
-                "id": str(uuid.uuid4()),
-                "type": "job_description",
-                "embedding": embedding 
-            })
-            
-            # Save to DynamoDB
-            if dynamodb_handler.save_job_description(level_data):
-                saved_levels.append(level_data)
-            else:
-                print(f"⚠️ Failed to save level {level_data.get('level')} to DynamoDB")
+            saved = _save_level(level_data, doc, dynamodb_handler)
+            if saved:
+                saved_levels.append(saved)
 
         return saved_levels if saved_levels else None
 
@@ -0,0 +1,66 @@
+# src/job_description_processing/json_stream.py
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    """
+    Pulls complete objects out of a JSON array while it is still being streamed.
+
+    Text before the opening '[' (e.g. a sentence from the model) is skipped.
+    Each call to feed() returns the top-level array elements that were
+    completed by the new chunk, so they can be used before the array closes.
+    """
+
+    def __init__(self):
+        self._depth = 0  # 0 = before the array, 1 = inside it, >1 = inside an element
+        self._in_string = False
+        self._escaped = False
+        self._element: List[str] = []
+        self.done = False
+        self.errors = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        completed = []
+        for char in chunk:
+            if self.done:
+                break
+            if self._depth == 0:
+                if char == "[":
+                    self._depth = 1
+                continue
+
+            if self._depth > 1:
+                self._element.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 1:
+                    self._element = [char]
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1:
+                    completed.extend(self._finish_element())
+                elif self._depth == 0:
+                    self.done = True
+        return completed
+
+    def _finish_element(self) -> List[Any]:
+        text = "".join(self._element)
+        self._element = []
+        try:
+            return [json.loads(text)]
+        except json.JSONDecodeError:
+            self.errors += 1
+            return []
@@ -0,0 +1,294 @@
+# src/llm_scheduler.py
+"""
+Shared scheduler in front of every Bedrock model call.
+
+Each model gets token buckets for requests/minute and tokens/minute. Calls
+wait in priority classes: interactive work (questions and chat in the UI) is
+served before bulk work (S3 refreshes, feedback analysis). Bulk jobs are
+served round-robin, so one large job can't starve another. A bulk call still
+goes through at least once every BULK_MIN_SHARE grants while interactive
+work is queued.
+
+Callers don't use the scheduler directly: aws_clients wraps every
+'bedrock-runtime' client, and bulk entry points mark their work with
+`with llm_priority(BULK, job="...")`.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional, Tuple
+from src.observability.tracing import incr, span
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Per-model limits; set LLM_RATE_LIMITS to override, e.g.
+#   "anthropic.claude-3-haiku-20240307-v1:0=500rpm/400000tpm,amazon.titan-embed-text-v1=1500rpm/300000tpm"
+# Match these to the account's Bedrock quotas. Models not listed are not limited.
+DEFAULT_RATE_LIMITS = {
+    "anthropic.claude-3-haiku-20240307-v1:0": {"requests_per_minute": 1000, "tokens_per_minute": 2_000_000},
+    "amazon.titan-embed-text-v1": {"requests_per_minute": 2000, "tokens_per_minute": 300_000},
+}
+# While interactive calls are queued, one bulk call is still let through per this many grants
+BULK_MIN_SHARE = int(os.getenv("LLM_BULK_MIN_SHARE", "10"))
+# Retries of a call Bedrock throttled anyway (the bucket is emptied first, so the retry waits)
+THROTTLE_RETRIES = 4
+
+_priority: contextvars.ContextVar[Tuple[str, str]] = contextvars.ContextVar("llm_priority", default=(INTERACTIVE, "default"))
+
+
+@contextlib.contextmanager
+def llm_priority(priority: str, job: str = "default"):
+    """Runs the enclosed Bedrock calls (including threads started with a copied context) in a priority class."""
+    if priority not in (INTERACTIVE, BULK):
+        raise ValueError(f"Unknown LLM priority: {priority!r}")
+    token = _priority.set((priority, job))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Dict[str, float]]:
+    """Parses LLM_RATE_LIMITS ("model=500rpm/400000tpm,...")."""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, values = entry.partition("=")
+        limit = {}
+        for value in values.split("/"):
+            value = value.strip().lower()
+            if value.endswith("rpm"):
+                limit["requests_per_minute"] = float(value[:-3])
+            elif value.endswith("tpm"):
+                limit["tokens_per_minute"] = float(value[:-3])
+        limits[model.strip()] = limit
+    return limits
+
+
+class TokenBucket:
+    """Refills at `per_minute / 60` per second up to one minute's worth; amounts may be taken once available."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if now). Amounts above capacity only need a full bucket."""
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate) if self.rate else float("inf")
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def drain(self, now: float):
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+
+class _ModelQueue:
+    """Waiting calls and rate buckets of one model."""
+
+    def __init__(self, limits: Dict[str, float]):
+        self.requests = TokenBucket(limits["requests_per_minute"]) if limits.get("requests_per_minute") else None
+        self.tokens = TokenBucket(limits["tokens_per_minute"]) if limits.get("tokens_per_minute") else None
+        self.interactive: Deque[Dict] = deque()
+        self.bulk_jobs: "OrderedDict[str, Deque[Dict]]" = OrderedDict()  # Round-robin order
+        self.grants_since_bulk = 0
+
+    def depth(self) -> int:
+        return len(self.interactive) + sum(len(q) for q in self.bulk_jobs.values())
+
+    def next_ticket(self) -> Optional[Dict]:
+        bulk_waiting = any(self.bulk_jobs.values())
+        if self.interactive and not (bulk_waiting and self.grants_since_bulk >= BULK_MIN_SHARE):
+            return self.interactive[0]
+        for queue in self.bulk_jobs.values():
+            if queue:
+                return queue[0]
+        return None
+
+    def grant(self, ticket: Dict):
+        """Removes the (head-of-line) ticket that was just let through."""
+        if ticket["priority"] == INTERACTIVE:
+            self.interactive.popleft()
+            self.grants_since_bulk += 1
+            return
+        queue = self.bulk_jobs.pop(ticket["job"])
+        queue.popleft()
+        self.grants_since_bulk = 0
+        # The job goes to the back of the rotation (and is dropped once it has nothing queued)
+        if queue:
+            self.bulk_jobs[ticket["job"]] = queue
+
+    def abandon(self, ticket: Dict):
+        """Removes a ticket whose caller stopped waiting."""
+        queue = self.interactive if ticket["priority"] == INTERACTIVE else self.bulk_jobs.get(ticket["job"], deque())
+        for i, queued in enumerate(queue):
+            if queued is ticket:
+                del queue[i]
+                break
+        if ticket["priority"] == BULK and not queue:
+            self.bulk_jobs.pop(ticket["job"], None)
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        return max(
+            self.requests.wait_time(1, now) if self.requests else 0.0,
+            self.tokens.wait_time(tokens, now) if self.tokens else 0.0,
+        )
+
+
+class LLMScheduler:
+    """Admits Bedrock calls per model by priority and rate limit."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        self.limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self._models: Dict[str, _ModelQueue] = {}
+        self._condition = threading.Condition()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _model(self, model_id: str) -> _ModelQueue:
+        if model_id not in self._models:
+            self._models[model_id] = _ModelQueue(self.limits.get(model_id, {}))
+        return self._models[model_id]
+
+    def _record(self, priority: str, waited_s: float, depth: int):
+        stats = self.stats.setdefault(priority, {"calls": 0, "wait_s": 0.0, "max_wait_s": 0.0, "max_queue_depth": 0})
+        stats["calls"] += 1
+        stats["wait_s"] += waited_s
+        stats["max_wait_s"] = max(stats["max_wait_s"], waited_s)
+        stats["max_queue_depth"] = max(stats["max_queue_depth"], depth)
+
+    def acquire(self, model_id: str, tokens: float):
+        """Blocks until this call is next in line for the model and its buckets allow it, then charges them."""
+        priority, job = _priority.get()
+        ticket = {"priority": priority, "job": job}
+        started = time.monotonic()
+        with self._condition:
+            queue = self._model(model_id)
+            if priority == INTERACTIVE:
+                queue.interactive.append(ticket)
+            else:
+                queue.bulk_jobs.setdefault(job, deque()).append(ticket)
+            depth = queue.depth()
+            incr(f"llm.queue.{priority}.enqueued")
+
+            try:
+                with span("llm.queue_wait", model=model_id, priority=priority):
+                    while True:
+                        now = time.monotonic()
+                        if queue.next_ticket() is ticket:
+                            wait = queue.wait_time(tokens, now)
+                            if wait <= 0:
+                                break
+                            self._condition.wait(timeout=wait)
+                        else:
+                            self._condition.wait(timeout=1.0)
+            except BaseException:
+                queue.abandon(ticket)
+                self._condition.notify_all()
+                raise
+
+            if queue.requests:
+                queue.requests.take(1)
+            if queue.tokens:
+                queue.tokens.take(tokens)
+            queue.grant(ticket)
+            waited = time.monotonic() - started
+            self._record(priority, waited, depth)
+            self._condition.notify_all()
+        incr(f"llm.queue.{priority}.wait_ms", waited * 1000)
+
+    def throttled(self, model_id: str):
+        """Bedrock throttled a call anyway: empty the buckets so queued calls back off."""
+        with self._condition:
+            queue = self._model(model_id)
+            now = time.monotonic()
+            for bucket in (queue.requests, queue.tokens):
+                if bucket:
+                    bucket.drain(now)
+        incr("llm.throttled")
+
+    def report(self) -> Dict[str, Any]:
+        """Calls, mean/max wait and max queue depth per priority class, plus what is queued right now."""
+        with self._condition:
+            return {
+                "classes": {
+                    priority: {
+                        "calls": int(s["calls"]),
+                        "mean_wait_ms": round(1000 * s["wait_s"] / s["calls"], 2) if s["calls"] else None,
+                        "max_wait_ms": round(1000 * s["max_wait_s"], 2),
+                        "max_queue_depth": int(s["max_queue_depth"]),
+                    }
+                    for priority, s in self.stats.items()
+                },
+                "queued": {
+                    model_id: {"interactive": len(q.interactive), "bulk": {j: len(d) for j, d in q.bulk_jobs.items()}}
+                    for model_id, q in self._models.items() if q.depth()
+                },
+            }
+
+
+@lru_cache(maxsize=None)
+def get_llm_scheduler() -> LLMScheduler:
+    """Returns the process-wide scheduler, with LLM_RATE_LIMITS applied over the defaults."""
+    return LLMScheduler({**DEFAULT_RATE_LIMITS, **parse_rate_limits(os.getenv("LLM_RATE_LIMITS", ""))})
+
+
+def estimate_request_tokens(body: Any) -> float:
+    """Tokens a request counts against the quota: prompt (~4 characters per token) plus max_tokens for Claude."""
+    try:
+        payload = json.loads(body) if isinstance(body, (str, bytes)) else (body or {})
+    except (TypeError, ValueError):
+        return 1.0
+    if "inputText" in payload:
+        return len(str(payload["inputText"])) / 4 + 1
+    prompt = json.dumps(payload.get("messages", "")) + str(payload.get("system", ""))
+    return len(prompt) / 4 + float(payload.get("max_tokens", 0)) + 1
+
+
+def _is_throttle(error: Exception) -> bool:
+    response = getattr(error, "response", None)
+    return isinstance(response, dict) and response.get("Error", {}).get("Code") == "ThrottlingException"
+
+
+class ScheduledBedrockClient:
+    """bedrock-runtime client whose model invocations go through the scheduler; everything else is passed through."""
+
+    def __init__(self, client: Any, scheduler: Optional[LLMScheduler] = None):
+        self._client = client
+        self._scheduler = scheduler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _call(self, method: str, kwargs: Dict) -> Any:
+        scheduler = self._scheduler or get_llm_scheduler()
+        model_id = kwargs.get("modelId", "")
+        tokens = estimate_request_tokens(kwargs.get("body"))
+        for attempt in range(THROTTLE_RETRIES + 1):
+            scheduler.acquire(model_id, tokens)
+            try:
+                return getattr(self._client, method)(**kwargs)
+            except Exception as e:
+                if not _is_throttle(e) or attempt == THROTTLE_RETRIES:
+                    raise
+                print(f"⏳ Bedrock throttled {model_id}; retrying ({attempt + 1}/{THROTTLE_RETRIES})")
+                scheduler.throttled(model_id)
+
+    def invoke_model(self, **kwargs) -> Any:
+        return self._call("invoke_model", kwargs)
+
+    def invoke_model_with_response_stream(self, **kwargs) -> Any:
+        return self._call("invoke_model_with_response_stream", kwargs)
@@ -0,0 +1,216 @@
+# src/matching/batch_runner.py
+"""
+Offline batch matching.
+
+Loads the corpus once, scores every JD level against every resume in blocks
+of resumes, and streams the results to disk:
+
+- pairs.<fmt>:     every (JD, resume) score at or above --min-score, written block by block
+- shortlist.<fmt>: the top-k resumes per JD with their perform_matching breakdown
+
+Only one block of scores and the running top-k per JD are held in memory.
+
+Usage:
+    python -m src.matching.batch_runner --output-dir reports/2024-06-01 --format parquet --top-k 20
+"""
+import argparse
+import csv
+import os
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler, get_dynamodb_handler
+from src.matching.resume_job_matcher import perform_matching
+from src.matching.semantic_matcher import embedding_matrix, has_embedding
+from src.storage.corpus_version import compute_corpus_version
+
+PAIR_COLUMNS = ["jd_id", "jd_title", "jd_level", "resume_id", "resume_name", "score"]
+SHORTLIST_COLUMNS = PAIR_COLUMNS + [
+    "rank", "skills_overlap_pct", "matched_skills", "missing_skills", "experience_keywords", "semantic_similarity_pct",
+]
+
+
+class RowWriter:
+    """Appends column batches to a CSV or Parquet file without keeping earlier batches around."""
+
+    def __init__(self, path: str, columns: List[str], fmt: str):
+        self.path = path
+        self.columns = columns
+        self.fmt = fmt
+        self.rows = 0
+        self._writer = None
+        if fmt == "csv":
+            self._file = open(path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(columns)
+        elif fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise SystemExit("Parquet output needs pyarrow (pip install pyarrow), or use --format csv") from e
+        else:
+            raise ValueError(f"Unknown output format: {fmt!r} (expected 'parquet' or 'csv')")
+
+    def write(self, batch: Dict[str, list]):
+        count = len(batch[self.columns[0]])
+        if not count:
+            return
+        if self.fmt == "csv":
+            self._writer.writerows(zip(*(batch[c] for c in self.columns)))
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.table({c: batch[c] for c in self.columns})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        self.rows += count
+
+    def close(self):
+        if self.fmt == "csv":
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+
+
+def _merge_top_k(best_scores: np.ndarray, best_rows: np.ndarray, scores: np.ndarray, offset: int, k: int):
+    """Merges one block's scores (block x jds) into the running per-JD top-k (jds x k)."""
+    block_k = min(k, scores.shape[0])
+    candidates = np.argpartition(-scores, block_k - 1, axis=0)[:block_k].T  # jds x block_k
+    candidate_scores = np.take_along_axis(scores.T, candidates, axis=1)
+    merged_scores = np.concatenate([best_scores, candidate_scores], axis=1)
+    merged_rows = np.concatenate([best_rows, candidates + offset], axis=1)
+    order = np.argsort(-merged_scores, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(merged_scores, order, axis=1), np.take_along_axis(merged_rows, order, axis=1)
+
+
+def run_batch_matching(
+    output_dir: str,
+    handler: Optional[DynamoDBHandler] = None,
+    fmt: str = "parquet",
+    top_k: int = 20,
+    block_size: int = 4096,
+    min_score: Optional[float] = None,
+    write_pairs: bool = True,
+) -> Dict:
+    """
+    Scores every JD level against every resume and writes pairs and shortlist files.
+
+    Args:
+        output_dir: Directory for the output files
+        handler: Storage to read from; defaults to the shared handler
+        fmt: "parquet" or "csv"
+        top_k: Shortlist length per JD
+        block_size: Resumes scored per block
+        min_score: Only write pairs scoring at least this much (all pairs if None)
+        write_pairs: Skip the all-pairs file when False
+
+    Returns:
+        Run statistics, including rows written and rows/sec
+    """
+    handler = handler or get_dynamodb_handler()
+    started = time.perf_counter()
+    resumes = [r for r in handler.get_resume_projections() if r.get('id') and has_embedding(r)]
+    jds = [jd for jd in handler.get_all_job_descriptions() if jd.get('id') and has_embedding(jd)]
+    if not resumes or not jds:
+        raise ValueError("Need at least one resume and one job description with embeddings")
+    loaded = time.perf_counter()
+
+    os.makedirs(output_dir, exist_ok=True)
+    jd_matrix = embedding_matrix([jd['embedding'] for jd in jds])
+    jd_ids = [jd['id'] for jd in jds]
+    jd_titles = [jd.get('title') or "" for jd in jds]
+    jd_levels = [jd.get('level') or "" for jd in jds]
+
+    k = min(top_k, len(resumes))
+    best_scores = np.full((len(jds), 0), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((len(jds), 0), dtype=np.int64)
+    pairs = RowWriter(os.path.join(output_dir, f"pairs.{fmt}"), PAIR_COLUMNS, fmt) if write_pairs else None
+    scored = 0
+    try:
+        for offset in range(0, len(resumes), block_size):
+            block = resumes[offset:offset + block_size]
+            scores = embedding_matrix([r['embedding'] for r in block]) @ jd_matrix.T  # block x jds
+            best_scores, best_rows = _merge_top_k(best_scores, best_rows, scores, offset, k)
+            scored += scores.size
+
+            if pairs is not None:
+                resume_idx, jd_idx = np.nonzero(scores >= min_score) if min_score is not None else \
+                    np.divmod(np.arange(scores.size), len(jds))
+                pairs.write({
+                    "jd_id": [jd_ids[j] for j in jd_idx],
+                    "jd_title": [jd_titles[j] for j in jd_idx],
+                    "jd_level": [jd_levels[j] for j in jd_idx],
+                    "resume_id": [block[i]['id'] for i in resume_idx],
+                    "resume_name": [block[i].get('name') or "" for i in resume_idx],
+                    "score": scores[resume_idx, jd_idx].astype(float).tolist(),
+                })
+            elapsed = time.perf_counter() - loaded
+            print(f"  scored {offset + len(block)}/{len(resumes)} resumes ({scored / elapsed:,.0f} pairs/s)")
+    finally:
+        if pairs is not None:
+            pairs.close()
+
+    # Shortlist: hydrate only the top-k resumes for the detailed breakdown
+    shortlisted_ids = {resumes[i]['id'] for i in np.unique(best_rows)}
+    full = {r['id']: r for r in handler.hydrate(shortlisted_ids)}
+    shortlist = RowWriter(os.path.join(output_dir, f"shortlist.{fmt}"), SHORTLIST_COLUMNS, fmt)
+    try:
+        for j, jd in enumerate(jds):
+            batch = {c: [] for c in SHORTLIST_COLUMNS}
+            for rank, (row, score) in enumerate(zip(best_rows[j], best_scores[j]), 1):
+                resume = full.get(resumes[row]['id'], resumes[row])
+                breakdown = perform_matching(resume, jd)
+                values = {
+                    "jd_id": jd['id'], "jd_title": jd_titles[j], "jd_level": jd_levels[j],
+                    "resume_id": resume['id'], "resume_name": resume.get('name') or "", "score": float(score),
+                    "rank": rank,
+                    "skills_overlap_pct": float(breakdown["skills_match"]["overlap_percentage"]),
+                    "matched_skills": ", ".join(breakdown["skills_match"]["matched_skills"]),
+                    "missing_skills": ", ".join(breakdown["skills_match"]["missing_skills"]),
+                    "experience_keywords": ", ".join(breakdown["experience_keywords_match"]),
+                    "semantic_similarity_pct": float(breakdown["semantic_similarity_score"]),
+                }
+                for column in SHORTLIST_COLUMNS:
+                    batch[column].append(values[column])
+            shortlist.write(batch)
+    finally:
+        shortlist.close()
+
+    finished = time.perf_counter()
+    rows = (pairs.rows if pairs is not None else 0) + shortlist.rows
+    stats = {
+        "corpus_version": compute_corpus_version(resumes + jds),
+        "resumes": len(resumes),
+        "job_descriptions": len(jds),
+        "pairs_scored": scored,
+        "pair_rows_written": pairs.rows if pairs is not None else 0,
+        "shortlist_rows_written": shortlist.rows,
+        "load_s": round(loaded - started, 3),
+        "total_s": round(finished - started, 3),
+        "rows_per_s": round(rows / (finished - loaded), 1) if finished > loaded else None,
+        "pairs_scored_per_s": round(scored / (finished - loaded), 1) if finished > loaded else None,
+    }
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every JD level against every resume and write the results.")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--top-k", type=int, default=20, help="Shortlist length per JD level")
+    parser.add_argument("--block-size", type=int, default=4096, help="Resumes scored per block")
+    parser.add_argument("--min-score", type=float, help="Only write pairs scoring at least this much")
+    parser.add_argument("--no-pairs", action="store_true", help="Only write the shortlist")
+    args = parser.parse_args()
+
+    stats = run_batch_matching(
+        args.output_dir, fmt=args.format, top_k=args.top_k, block_size=args.block_size,
+        min_score=args.min_score, write_pairs=not args.no_pairs,
+    )
+    print(f"✅ {stats['pair_rows_written']:,} pair rows and {stats['shortlist_rows_written']:,} shortlist rows "
+          f"in {stats['total_s']}s ({stats['rows_per_s']:,} rows/s, {stats['pairs_scored_per_s']:,} pairs scored/s)")
+
+
+if __name__ == "__main__":
+    main()
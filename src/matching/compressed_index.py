@@ -0,0 +1,164 @@
+# src/matching/compressed_index.py
+import os
+import numpy as np
+from typing import Dict, List, Optional
+from src.matching.semantic_matcher import embedding_matrix, find_top_matches, has_embedding
+from src.observability.tracing import traced
+
+# Set COMPRESSED_MATCHING=1 to answer the app's semantic matches from the compressed index
+COMPRESSED_MATCHING = os.getenv("COMPRESSED_MATCHING", "0") == "1"
+# Rows used to fit the projection; the covariance of a sample is plenty for PCA
+MAX_FIT_SAMPLES = 5000
+# Code rows upcast to float32 at a time while scoring, so a query never materializes a full float copy
+SCAN_CHUNK_ROWS = 512
+
+
+class CompressedEmbeddingIndex:
+    """
+    Compact copy of the resume embeddings for the semantic matcher.
+
+    Embeddings are scalar-quantized to int8 (one scale per dimension), optionally
+    after projecting them onto the top principal components of the corpus. A
+    query scores the codes in chunks of SCAN_CHUNK_ROWS rows, keeps an
+    oversampled shortlist and re-ranks only that shortlist with exact cosine
+    similarity on the original embeddings, which stay on the resume dicts.
+    The codes are held in addition to those embeddings, not instead of them.
+    """
+
+    def __init__(self, n_components: Optional[int] = None, oversample: int = 10, min_shortlist: int = 100):
+        """
+        Args:
+            n_components: Dimensions kept after projection; None (the default) skips the projection and
+                only quantizes. Projection shrinks the codes further but costs recall, badly so when the
+                corpus variance is spread over many dimensions; check recall_at_k before enabling it.
+            oversample: Shortlist size as a multiple of top_n.
+            min_shortlist: Smallest shortlist re-ranked at full precision.
+        """
+        self.n_components = n_components
+        self.oversample = oversample
+        self.min_shortlist = min_shortlist
+        self.resumes: List[Dict] = []
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None  # (dim, n_components)
+        self.scales: Optional[np.ndarray] = None
+        self.codes: Optional[np.ndarray] = None  # (n_resumes, n_components) int8
+        self.dim = 0
+
+    @classmethod
+    def build(cls, resumes: List[Dict], seed: int = 0, **kwargs) -> "CompressedEmbeddingIndex":
+        index = cls(**kwargs)
+        index.fit(resumes, seed=seed)
+        return index
+
+    def fit(self, resumes: List[Dict], seed: int = 0):
+        """Fits the projection and quantizer on the corpus and encodes every resume that has an embedding."""
+        self.resumes = [r for r in resumes if has_embedding(r)]
+        if not self.resumes:
+            self.codes = np.zeros((0, 0), dtype=np.int8)
+            return self
+
+        matrix = embedding_matrix([r['embedding'] for r in self.resumes])
+        self.dim = matrix.shape[1]
+        self.mean = matrix.mean(axis=0)
+
+        if self.n_components and self.n_components < self.dim:
+            rng = np.random.default_rng(seed)
+            sample = matrix if len(matrix) <= MAX_FIT_SAMPLES else matrix[rng.choice(len(matrix), MAX_FIT_SAMPLES, replace=False)]
+            centered = sample - self.mean
+            # Top eigenvectors of the covariance = principal components
+            eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered)
+            order = np.argsort(eigenvalues)[::-1][:self.n_components]
+            self.components = eigenvectors[:, order].astype(np.float32)
+        else:
+            self.components = None
+
+        projected = self._project(matrix)
+        self.scales = np.abs(projected).max(axis=0) / 127.0
+        self.scales[self.scales == 0] = 1.0
+        self.codes = np.clip(np.rint(projected / self.scales), -127, 127).astype(np.int8)
+        return self
+
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        centered = matrix - self.mean
+        return centered @ self.components if self.components is not None else centered
+
+    def memory_stats(self) -> Dict:
+        """
+        Bytes of the compressed codes versus a float32 matrix of the full embeddings.
+
+        The full embeddings stay on the resume dicts for re-ranking, so the index adds
+        'compressed_bytes' to the process rather than saving 'float32_bytes'.
+        """
+        n = len(self.resumes)
+        compressed = self.codes.nbytes + sum(a.nbytes for a in (self.mean, self.components, self.scales) if a is not None)
+        full = n * self.dim * 4
+        return {
+            "resumes": n,
+            "dimensions": self.dim,
+            "compressed_dimensions": self.codes.shape[1] if n else 0,
+            "compressed_bytes": int(compressed),
+            "float32_bytes": int(full),
+            "ratio": round(full / compressed, 2) if compressed else None,
+        }
+
+    @traced("compressed_index.search")
+    def search(self, job_description: Dict, top_n: int = 5, similarity_threshold: float = 0.3) -> List[Dict]:
+        """
+        Same contract as find_top_matches, answered from the compressed index.
+
+        Args:
+            job_description: The JD dict with 'embedding' field
+            top_n: Number of top matches to return
+            similarity_threshold: Minimum (exact) similarity score
+
+        Returns:
+            List of dicts with 'resume' and 'score' sorted by score
+        """
+        if 'embedding' not in job_description:
+            raise ValueError("Job description missing embedding")
+        if not self.resumes or not has_embedding(job_description):
+            return []
+
+        query = self._project(embedding_matrix([job_description['embedding']]))[0]
+        # The mean term is the same for every resume, so it doesn't change the ranking
+        weights = (query * self.scales).astype(np.float32)
+        approximate = np.empty(len(self.codes), dtype=np.float32)
+        for start in range(0, len(self.codes), SCAN_CHUNK_ROWS):
+            chunk = self.codes[start:start + SCAN_CHUNK_ROWS]
+            approximate[start:start + len(chunk)] = chunk.astype(np.float32) @ weights
+
+        shortlist_size = min(len(self.resumes), max(top_n * self.oversample, self.min_shortlist))
+        shortlist = np.argpartition(-approximate, shortlist_size - 1)[:shortlist_size]
+
+        # Exact re-rank of the shortlist as one matrix-vector product
+        jd_vector = embedding_matrix([job_description['embedding']])[0]
+        exact = embedding_matrix([self.resumes[i]['embedding'] for i in shortlist]) @ jd_vector
+        order = np.argsort(-exact, kind="stable")
+        return [
+            {'resume': self.resumes[shortlist[j]], 'score': float(exact[j])}
+            for j in order[:top_n] if exact[j] >= similarity_threshold
+        ]
+
+
+def recall_at_k(index: CompressedEmbeddingIndex, job_descriptions: List[Dict], resumes: List[Dict], k: int = 10) -> float:
+    """
+    Fraction of the exact top-k (from find_top_matches) that the compressed index also returns.
+
+    Args:
+        index: Index built over the same resumes
+        job_descriptions: Queries to evaluate
+        resumes: The resume list the index was built from
+        k: Cut-off
+
+    Returns:
+        Mean recall@k over the job descriptions
+    """
+    recalls = []
+    for jd in job_descriptions:
+        exact = find_top_matches(jd, resumes, top_n=k, similarity_threshold=-1.0)
+        if not exact:
+            continue
+        expected = {id(m['resume']) for m in exact}
+        found = {id(m['resume']) for m in index.search(jd, top_n=k, similarity_threshold=-1.0)}
+        recalls.append(len(expected & found) / len(expected))
+    return float(np.mean(recalls)) if recalls else 0.0
@@ -0,0 +1,266 @@
+# src/matching/materialized_matches.py
+import argparse
+import hashlib
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler, get_dynamodb_handler
+from src.embeddings.factory import embedding_backend
+from src.matching.semantic_matcher import embedding_matrix, has_embedding
+from src.observability.tracing import incr, traced
+
+MATCH_TABLE_TYPE = "jd_match_topk"
+# Matches served per JD level; rows keep twice as many so removals rarely force a rebuild
+MATCH_TABLE_K = 50
+MATCH_TABLE_DEPTH = 2 * MATCH_TABLE_K
+
+
+def match_table_id(jd_id: str) -> str:
+    return f"{MATCH_TABLE_TYPE}#{jd_id}"
+
+
+def _has_embedding(record) -> bool:
+    return has_embedding(record) and bool(record.get('id'))
+
+
+def jd_fingerprint(jd: Dict) -> str:
+    """
+    Digest of a JD's embedding and its backend; a row built for another fingerprint is stale.
+
+    The embedding itself is hashed rather than 'last_updated', which freshly extracted
+    records don't carry until they are re-read from storage. Lists of floats or Decimals
+    and snapshot float32 rows of the same vector give the same digest.
+    """
+    vector = np.asarray([float(v) for v in jd.get('embedding') or []], dtype=np.float32)
+    digest = hashlib.sha1(vector.tobytes())
+    digest.update(embedding_backend(jd).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _score(jds: List[Dict], resumes: List[Dict]) -> np.ndarray:
+    """Cosine similarities as a (resumes x jds) matrix; embeddings are converted once for all JDs."""
+    if not resumes or not jds:
+        return np.zeros((len(resumes), len(jds)), dtype=np.float32)
+    return embedding_matrix([r['embedding'] for r in resumes]) @ embedding_matrix([jd['embedding'] for jd in jds]).T
+
+
+def _build_row(jd: Dict, resumes: List[Dict], scores: np.ndarray, depth: int = MATCH_TABLE_DEPTH) -> Dict:
+    """Row for one JD from its scores against the (embedding-bearing) resumes."""
+    order = np.argsort(-scores, kind="stable")[:depth]
+    return {
+        "id": match_table_id(jd['id']),
+        "type": MATCH_TABLE_TYPE,
+        "jd_id": jd['id'],
+        "level": jd.get('level'),
+        "title": jd.get('title'),
+        "jd_fingerprint": jd_fingerprint(jd),
+        "embedding_backend": embedding_backend(jd),
+        "depth": depth,
+        "matches": [{"resume_id": resumes[i]['id'], "score": float(scores[i])} for i in order],
+    }
+
+
+def _apply_resumes(row: Dict, resumes: List[Dict], scores: np.ndarray) -> bool:
+    """
+    Merges added or re-saved resumes (with their scores for this row's JD) into the row.
+
+    Returns:
+        True if the row changed and needs saving.
+    """
+    if not resumes:
+        return False
+    depth = int(row.get('depth', MATCH_TABLE_DEPTH))
+    matches = {m['resume_id']: float(m['score']) for m in row.get('matches', [])}
+    cutoff = min(matches.values()) if len(matches) >= depth else float("-inf")
+
+    changed = False
+    for resume, score in zip(resumes, scores):
+        score = float(score)
+        if resume['id'] in matches:
+            changed = changed or matches[resume['id']] != score
+            matches[resume['id']] = score
+        elif score > cutoff:
+            matches[resume['id']] = score
+            changed = True
+    if not changed:
+        return False
+
+    ranked = sorted(matches.items(), key=lambda kv: kv[1], reverse=True)[:depth]
+    row['matches'] = [{"resume_id": rid, "score": score} for rid, score in ranked]
+    return True
+
+
+@traced("match_tables.sync")
+def sync_match_tables(handler: DynamoDBHandler, resumes: List[Dict], jds: List[Dict]) -> Dict:
+    """
+    Brings the per-JD top-k rows up to date with the given corpus.
+
+    New JD levels, and JDs re-extracted or re-embedded since their row was built
+    (see jd_fingerprint), get a full row. Other rows only absorb resumes saved
+    after the row was last written, and rows for JDs that are gone are deleted.
+    Rows that did not change are not rewritten.
+
+    Args:
+        handler: Storage handler holding the records
+        resumes: The full current resume list
+        jds: The full current job description list
+
+    Returns:
+        Counts of built, updated and deleted rows
+    """
+    stats = {"built": 0, "updated": 0, "deleted": 0}
+    rows = {row.get('jd_id'): row for row in handler.get_items_by_type(MATCH_TABLE_TYPE)}
+    current = {jd['id']: jd for jd in jds if _has_embedding(jd)}
+    resumes = [r for r in resumes if _has_embedding(r)]
+
+    missing = [jd for jd_id, jd in current.items()
+               if jd_id not in rows or rows[jd_id].get('jd_fingerprint') != jd_fingerprint(jd)]
+    if missing:
+        scores = _score(missing, resumes)
+        for j, jd in enumerate(missing):
+            handler.save_item(_build_row(jd, resumes, scores[:, j]))
+        stats["built"] = len(missing)
+
+    built = {jd['id'] for jd in missing}
+    existing = [row for jd_id, row in rows.items() if jd_id in current and jd_id not in built]
+    if existing:
+        # Records without a timestamp were just extracted and not re-read from storage yet
+        oldest = min(row.get('last_updated', '') for row in existing)
+        fresh = [r for r in resumes if not r.get('last_updated') or r['last_updated'] > oldest]
+        scores = _score([current[row['jd_id']] for row in existing], fresh)
+        for j, row in enumerate(existing):
+            since = row.get('last_updated', '')
+            keep = [i for i, r in enumerate(fresh) if not r.get('last_updated') or r['last_updated'] > since]
+            if keep and _apply_resumes(row, [fresh[i] for i in keep], scores[keep, j]):
+                handler.save_item(row)
+                stats["updated"] += 1
+
+    for jd_id, row in rows.items():
+        if jd_id not in current:
+            handler.delete_item(row['id'], item_type=MATCH_TABLE_TYPE)
+            stats["deleted"] += 1
+
+    incr("match_tables.rows_written", stats["built"] + stats["updated"])
+    return stats
+
+
+@traced("match_tables.add_resumes")
+def add_resumes_to_match_tables(handler: DynamoDBHandler, resumes: Iterable[Dict]) -> int:
+    """
+    Updates every row for newly added (or re-saved) resumes.
+
+    Returns:
+        Number of rows rewritten
+    """
+    resumes = [r for r in resumes if _has_embedding(r)]
+    if not resumes:
+        return 0
+    jds = {jd['id']: jd for jd in handler.get_all_job_descriptions() if _has_embedding(jd)}
+    # Rows built for an older version of their JD are left for sync_match_tables to rebuild
+    rows = [row for row in handler.get_items_by_type(MATCH_TABLE_TYPE)
+            if row.get('jd_id') in jds and row.get('jd_fingerprint') == jd_fingerprint(jds[row['jd_id']])]
+    scores = _score([jds[row['jd_id']] for row in rows], resumes)
+    written = 0
+    for j, row in enumerate(rows):
+        if _apply_resumes(row, resumes, scores[:, j]):
+            handler.save_item(row)
+            written += 1
+    return written
+
+
+@traced("match_tables.remove_resume")
+def remove_resume(handler: DynamoDBHandler, resume_id: str) -> bool:
+    """
+    Deletes a resume and drops it from the rows that contain it (the CLI's
+    --remove-resume). handler.delete_item alone leaves the resume in the rows.
+
+    A row is rebuilt from the full corpus only when it falls below
+    MATCH_TABLE_K entries while more resumes exist than it holds.
+    """
+    if not handler.delete_item(resume_id, item_type='resume'):
+        return False
+
+    all_resumes = None
+    jds = None
+    resume_matrix = None
+    for row in handler.get_items_by_type(MATCH_TABLE_TYPE):
+        matches = [m for m in row.get('matches', []) if m['resume_id'] != resume_id]
+        if len(matches) == len(row.get('matches', [])):
+            continue
+        row['matches'] = matches
+        if len(matches) < MATCH_TABLE_K:
+            if all_resumes is None:
+                all_resumes = [r for r in handler.get_all_resumes() if _has_embedding(r)]
+                jds = {jd['id']: jd for jd in handler.get_all_job_descriptions() if _has_embedding(jd)}
+                resume_matrix = embedding_matrix([r['embedding'] for r in all_resumes]) if all_resumes else None
+            jd = jds.get(row.get('jd_id'))
+            if jd and resume_matrix is not None and len(all_resumes) > len(matches):
+                scores = resume_matrix @ embedding_matrix([jd['embedding']])[0]
+                row = _build_row(jd, all_resumes, scores, depth=int(row.get('depth', MATCH_TABLE_DEPTH)))
+        handler.save_item(row)
+    return True
+
+
+@traced("match_tables.lookup")
+def get_materialized_matches(
+    handler: DynamoDBHandler, jd: Dict, resumes: List[Dict], top_n: int = 5, similarity_threshold: float = 0.3
+) -> Optional[List[Dict]]:
+    """
+    Answers a JD's top matches from its stored row instead of rescoring every resume.
+
+    Args:
+        handler: Storage handler holding the rows
+        jd: The job description (needs 'id')
+        resumes: Resume dicts to return in the results, matched by 'id'
+        top_n: Number of top matches to return
+        similarity_threshold: Minimum similarity score (0-1)
+
+    Returns:
+        Same shape as find_top_matches, or None when there is no usable row
+        (caller should fall back to find_top_matches). A row built for another
+        version or embedding backend of the JD, or matching a resume that is not
+        embedded by the active backend, is not used.
+    """
+    if not jd.get('id') or top_n > MATCH_TABLE_K or not has_embedding(jd):
+        return None
+    row = handler.get_item(match_table_id(jd['id']))
+    if not row or row.get('jd_fingerprint') != jd_fingerprint(jd):
+        incr("match_tables.misses")
+        return None
+
+    by_id = {r.get('id'): r for r in resumes}
+    results = []
+    for match in row.get('matches', []):
+        score = float(match['score'])
+        if score < similarity_threshold or len(results) == top_n:
+            break
+        resume = by_id.get(match['resume_id'])
+        if resume is None or not has_embedding(resume):
+            # Row references a resume this caller doesn't have, or one since moved to another vector space
+            incr("match_tables.misses")
+            return None
+        results.append({'resume': resume, 'score': score})
+    incr("match_tables.hits")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the per-JD top-k match rows.")
+    parser.add_argument("--remove-resume", nargs="+", default=[], metavar="RESUME_ID",
+                        help="Delete these resumes and drop them from the rows")
+    parser.add_argument("--sync", action="store_true",
+                        help="Rebuild missing or stale rows and merge in new resumes (the default without --remove-resume)")
+    args = parser.parse_args()
+
+    handler = get_dynamodb_handler()
+    for resume_id in args.remove_resume:
+        if remove_resume(handler, resume_id):
+            print(f"🗑️ Removed resume {resume_id}")
+        else:
+            print(f"⚠️ Could not remove resume {resume_id}")
+    if args.sync or not args.remove_resume:
+        stats = sync_match_tables(handler, handler.get_resume_projections(), handler.get_all_job_descriptions())
+        print(f"✅ Match rows: {stats['built']} built, {stats['updated']} updated, {stats['deleted']} deleted")
+
+
+if __name__ == "__main__":
+    main()
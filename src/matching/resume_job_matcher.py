@@ -1,6 +1,6 @@
 # src/matching/resume_job_matcher.py
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from src.observability.tracing import traced
 
 
 def match_skills(resume_skills, job_skills):
@@ -40,6 +40,7 @@ def compute_embedding_similarity(resume_embedding, jd_embedding):
     """
     if resume_embedding is None or jd_embedding is None:
         return 0.0
+    from sklearn.metrics.pairwise import cosine_similarity  # Deferred: sklearn is slow to import
     try:
         similarity = cosine_similarity(
             np.array(resume_embedding).reshape(1, -1),
@@ -73,6 +74,7 @@ def match_experience_keywords(resume_experience, job_description_text):
                     matched_keywords.add(keyword)
     return sorted(list(matched_keywords))
 
+@traced("perform_matching")
 def perform_matching(resume_data, job_description_data):
     """
     Performs matching between extracted resume data and job description data.
@@ -1,7 +1,15 @@
 import numpy as np
+from collections import OrderedDict
 from numpy.linalg import norm
 from decimal import Decimal
-from typing import List, Dict
+from typing import List, Dict, Optional
+from src.embeddings.factory import active_embedding_backend, embedding_backend
+from src.observability.tracing import incr, traced
+from src.search.filter_index import ResumeFilterIndex
+
+# (jd id, corpus version) -> every resume's score for that JD, sorted descending
+SCORE_CACHE_SIZE = 64
+_score_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
 
 def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """Calculate cosine similarity between two embeddings"""
@@ -14,9 +22,102 @@ def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float
     return np.dot(embedding1, embedding2) / (norm(embedding1) * norm(embedding2))
 
 
+def has_embedding(record, backend: Optional[str] = None) -> bool:
+    """
+    True if a record has a non-empty embedding (a list, or an array row from the corpus snapshot)
+    in the given vector space, by default the active embedding backend's. Vectors from different
+    backends are never compared, so records embedded by another backend count as unembedded.
+    """
+    embedding = record.get('embedding') if isinstance(record, dict) else None
+    if embedding is None or len(embedding) == 0:
+        return False
+    return embedding_backend(record) == (backend or active_embedding_backend())
+
+
+def embedding_matrix(embeddings: List) -> np.ndarray:
+    """Stacks embeddings (floats, Decimals or float arrays) into a float32 matrix with unit-length rows."""
+    if embeddings and all(isinstance(e, np.ndarray) for e in embeddings):
+        matrix = np.vstack(embeddings).astype(np.float32)
+    else:
+        matrix = np.array([[float(v) for v in e] for e in embeddings], dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def clear_score_cache() -> None:
+    """Drops every cached score array."""
+    _score_cache.clear()
+
+
+def get_sorted_scores(job_description: Dict, resumes: List[Dict], corpus_version: str) -> Optional[Dict]:
+    """
+    Scores every resume against a JD once per corpus version and keeps the result sorted.
+
+    Args:
+        job_description: The JD dict with 'id' and 'embedding'
+        resumes: Resume dicts with 'id' and 'embedding'
+        corpus_version: Stamp of the resume set (see compute_corpus_version)
+
+    Returns:
+        {'scores': descending float32 array, 'ids': resume ids in the same order},
+        or None if the JD or a resume has no id to cache by, or the JD no embedding in the active space
+    """
+    jd_id = job_description.get('id')
+    if not jd_id or not has_embedding(job_description):
+        return None
+    key = (jd_id, corpus_version)
+    if key in _score_cache:
+        incr("cache.scores.hits")
+        _score_cache.move_to_end(key)
+        return _score_cache[key]
+    incr("cache.scores.misses")
+
+    scorable = [r for r in resumes if has_embedding(r)]
+    if any(not r.get('id') for r in scorable):
+        return None
+    if scorable:
+        scores = embedding_matrix([r['embedding'] for r in scorable]) @ embedding_matrix([job_description['embedding']])[0]
+        order = np.argsort(-scores, kind="stable")
+        ranked = {'scores': scores[order], 'ids': [scorable[i]['id'] for i in order]}
+    else:
+        ranked = {'scores': np.zeros(0, dtype=np.float32), 'ids': []}
 
+    _score_cache[key] = ranked
+    while len(_score_cache) > SCORE_CACHE_SIZE:
+        _score_cache.popitem(last=False)
+    return ranked
+
+
+def score_histogram(job_description: Dict, resumes: List[Dict], corpus_version: str, bins: int = 20) -> Optional[Dict]:
+    """Distribution of every resume's score for a JD, taken from the cached sorted scores."""
+    ranked = get_sorted_scores(job_description, resumes, corpus_version)
+    if ranked is None or not len(ranked['scores']):
+        return None
+    counts, edges = np.histogram(ranked['scores'], bins=bins)
+    return {'counts': counts.tolist(), 'edges': edges.tolist()}
+
+
+
+def _find_filtered_matches(
+    job_description: Dict, filter_index: ResumeFilterIndex, filters: Dict, top_n: int, similarity_threshold: float
+) -> List[Dict]:
+    """Scores only the resumes passing the structured filters."""
+    if 'embedding' not in job_description:
+        raise ValueError("Job description missing embedding")
+    candidates = [r for r in filter_index.filter(**filters) if has_embedding(r)]
+    incr("matching.prefilter.candidates", len(candidates))
+    if not candidates or not has_embedding(job_description):
+        return []
+    scores = embedding_matrix([r['embedding'] for r in candidates]) @ embedding_matrix([job_description['embedding']])[0]
+    order = np.argsort(-scores, kind="stable")[:top_n]
+    return [{'resume': candidates[i], 'score': float(scores[i])} for i in order if scores[i] >= similarity_threshold]
+
+
+@traced("find_top_matches")
 def find_top_matches(
-    job_description: Dict, resumes: List[Dict], top_n: int = 5,  similarity_threshold: float = 0.3
+    job_description: Dict, resumes: List[Dict], top_n: int = 5,  similarity_threshold: float = 0.3, index=None,
+    corpus_version: Optional[str] = None, filters: Optional[Dict] = None, filter_index: Optional[ResumeFilterIndex] = None
 ) -> List[Dict]:
     """
     Find top matching resumes for a job description based on embedding similarity
@@ -26,6 +127,15 @@ def find_top_matches(
         resumes: List of resume dicts with 'embedding' fields and other details
         top_n: Number of top matches to return
         similarity_threshold: Minimum similarity score (0-1)
+        index: Optional CompressedEmbeddingIndex built over the same resumes; when given,
+            candidates are shortlisted on the compressed vectors and re-ranked exactly
+        corpus_version: Stamp of the resume set; when given, the JD's sorted scores are
+            cached, so a new threshold or top_n is a binary search and a slice
+        filters: Structured pre-filters (levels, min_years, max_years, skills; see
+            ResumeFilterIndex.select). Only the resumes passing them are scored, exactly;
+            the compressed index and score cache, which cover every resume, are bypassed
+        filter_index: ResumeFilterIndex built over the same resumes; built on the fly if
+            filters are given without one
     
     Returns:
         List of dicts with 'resume' (full details) and 'score' sorted by score
@@ -33,8 +143,31 @@ def find_top_matches(
     if not resumes:
         return []
 
+    if filters:
+        return _find_filtered_matches(
+            job_description, filter_index or ResumeFilterIndex.build(resumes), filters, top_n, similarity_threshold
+        )
+
+    if index is not None:
+        return index.search(job_description, top_n=top_n, similarity_threshold=similarity_threshold)
+
     if 'embedding' not in job_description:
         raise ValueError("Job description missing embedding")
+    if not has_embedding(job_description):
+        print(f"⚠️ Job description was embedded by {embedding_backend(job_description)}, not "
+              f"{active_embedding_backend()}; refresh from S3 to re-embed it")
+        return []
+
+    ranked = get_sorted_scores(job_description, resumes, corpus_version) if corpus_version else None
+    if ranked is not None:
+        # Scores are descending, so their negation is ascending and searchsorted finds the cut-off
+        count = min(int(np.searchsorted(-ranked['scores'], -similarity_threshold, side='right')), top_n)
+        by_id = {r['id']: r for r in resumes if isinstance(r, dict) and r.get('id')}
+        return [
+            {'resume': by_id[resume_id], 'score': float(score)}
+            for resume_id, score in zip(ranked['ids'][:count], ranked['scores'][:count])
+            if resume_id in by_id
+        ]
     
     scored_resumes = []
     jd_embedding = job_description['embedding']
@@ -46,7 +179,7 @@ def find_top_matches(
         try:
             # Ensure we're working with proper embeddings
             resume_embedding = resume['embedding']
-            if not resume_embedding:  # Skip if empty embedding
+            if not has_embedding(resume):  # Skip if empty or from another embedding backend
                 continue
                 
             # Calculate similarity
@@ -0,0 +1,115 @@
+# src/matching_service/embedding_store.py
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional
+import numpy as np
+from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
+from src.embeddings.factory import active_embedding_backend
+from src.matching.semantic_matcher import has_embedding
+from src.storage.corpus_version import compute_corpus_version
+
+META_FILE = "meta.json"
+RESUME_MATRIX = "resumes.npy"
+JD_MATRIX = "jds.npy"
+
+
+def _write_matrix(path: str, records: List[Dict], dim: int):
+    """Writes unit-length float32 rows straight into a memmap, one record at a time."""
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(len(records), dim))
+    for i, record in enumerate(records):
+        row = np.asarray([float(v) for v in record['embedding']], dtype=np.float32)
+        length = np.linalg.norm(row)
+        matrix[i] = row / length if length else row
+    matrix.flush()
+    del matrix
+
+
+def build_embedding_store(handler: DynamoDBHandler, directory: str) -> Dict:
+    """
+    Writes the corpus embeddings to `directory` as read-only matrices for the matching service.
+
+    Resume and JD embeddings go to .npy files (normalized rows) and ids, names
+    and the corpus version to meta.json. The store is written to a staging
+    directory and swapped in by rename, so a half-written store is never opened.
+
+    Returns:
+        The store's metadata
+    """
+    resumes = [r for r in handler.get_resume_projections() if r.get('id') and has_embedding(r)]
+    jds = [jd for jd in handler.get_all_job_descriptions() if jd.get('id') and has_embedding(jd)]
+    if not resumes or not jds:
+        raise ValueError("Need at least one resume and one job description with embeddings")
+    dim = len(resumes[0]['embedding'])
+
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".embedding_store_")
+    _write_matrix(os.path.join(staging, RESUME_MATRIX), resumes, dim)
+    _write_matrix(os.path.join(staging, JD_MATRIX), jds, dim)
+    meta = {
+        "corpus_version": compute_corpus_version(resumes + jds),
+        "dim": dim,
+        "embedding_backend": active_embedding_backend(),
+        "resumes": {"ids": [r['id'] for r in resumes], "names": [r.get('name') for r in resumes]},
+        "jds": {
+            "ids": [jd['id'] for jd in jds],
+            "titles": [jd.get('title') for jd in jds],
+            "levels": [jd.get('level') for jd in jds],
+        },
+    }
+    with open(os.path.join(staging, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+    if os.path.exists(directory):
+        retired = directory.rstrip("/") + ".old"
+        shutil.rmtree(retired, ignore_errors=True)
+        os.rename(directory, retired)
+        os.rename(staging, directory)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.rename(staging, directory)
+    return meta
+
+
+class EmbeddingStore:
+    """
+    Read-only view of a store written by build_embedding_store.
+
+    The matrices are memory-mapped, so every process that opens the same store
+    shares one copy through the OS page cache instead of loading its own.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.resumes = np.load(os.path.join(directory, RESUME_MATRIX), mmap_mode="r")
+        self.jds = np.load(os.path.join(directory, JD_MATRIX), mmap_mode="r")
+        self.resume_ids: List[str] = self.meta["resumes"]["ids"]
+        self.jd_ids: List[str] = self.meta["jds"]["ids"]
+        self._resume_rows = {rid: i for i, rid in enumerate(self.resume_ids)}
+        self._jd_rows = {jid: i for i, jid in enumerate(self.jd_ids)}
+
+    @property
+    def corpus_version(self) -> str:
+        return self.meta["corpus_version"]
+
+    def resume_vector(self, resume_id: str) -> Optional[np.ndarray]:
+        row = self._resume_rows.get(resume_id)
+        return None if row is None else np.array(self.resumes[row])
+
+    def jd_vector(self, jd_id: str) -> Optional[np.ndarray]:
+        row = self._jd_rows.get(jd_id)
+        return None if row is None else np.array(self.jds[row])
+
+    def describe_resume(self, row: int) -> Dict:
+        return {"resume_id": self.resume_ids[row], "name": self.meta["resumes"]["names"][row]}
+
+    def describe_jd(self, row: int) -> Dict:
+        return {
+            "jd_id": self.jd_ids[row],
+            "title": self.meta["jds"]["titles"][row],
+            "level": self.meta["jds"]["levels"][row],
+        }
@@ -0,0 +1,275 @@
+# src/matching_service/server.py
+"""
+Headless matching service.
+
+Serves semantic matches, reverse lookups and perform_matching breakdowns over
+HTTP/JSON, so tools other than the Streamlit app can use them. The parent
+process binds the port and forks worker processes that all accept on it;
+every worker memory-maps the same embedding store, so the corpus is held once
+in the page cache however many workers run.
+
+Usage:
+    python -m src.matching_service.server --build --workers 4 --port 8502
+
+Endpoints (POST bodies and responses are JSON):
+    GET  /health
+    POST /match            {"jd_id" | "embedding", "top_n": 5, "threshold": 0.3}
+    POST /reverse          {"resume_id" | "embedding", "top_n": 5}
+    POST /perform_matching {"resume_id", "jd_id"}
+"""
+import argparse
+import json
+import os
+import queue
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+import numpy as np
+from src.aws_clients import clear_clients
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.matching.resume_job_matcher import perform_matching
+from src.matching_service.embedding_store import EmbeddingStore, build_embedding_store
+
+DEFAULT_STORE_DIR = os.getenv("MATCHING_STORE_DIR", os.path.join("data", "matching_store"))
+# Concurrent queries arriving within this window are scored in one matrix product
+BATCH_WINDOW_MS = 5.0
+MAX_BATCH_SIZE = 64
+
+
+class ScoreBatcher:
+    """
+    Scores query vectors against a (memory-mapped) matrix in batches.
+
+    Request threads call score() and block; a single scoring thread takes
+    whatever queries arrive within BATCH_WINDOW_MS (up to MAX_BATCH_SIZE) and
+    scores them together, so the matrix is streamed through memory once per
+    batch instead of once per query.
+    """
+
+    def __init__(self, matrix: np.ndarray, window_ms: float = BATCH_WINDOW_MS, max_batch: int = MAX_BATCH_SIZE):
+        self.matrix = matrix
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.queries = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def score(self, vector: np.ndarray) -> np.ndarray:
+        request = {"vector": vector, "done": threading.Event(), "scores": None, "error": None}
+        self._queue.put(request)
+        request["done"].wait()
+        if request["error"] is not None:
+            raise ValueError(f"Could not score query: {request['error']}")
+        return request["scores"]
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._queue.get(timeout=self.window_s))
+            except queue.Empty:
+                pass
+            try:
+                scores = np.stack([r["vector"] for r in batch]) @ self.matrix.T
+            except ValueError:
+                # One bad query (e.g. wrong dimension) fails the batch; score the rest one by one
+                scores = []
+                for request in batch:
+                    try:
+                        scores.append(request["vector"] @ self.matrix.T)
+                    except ValueError as single_error:
+                        request["error"] = single_error
+                        scores.append(None)
+            self.batches += 1
+            self.queries += len(batch)
+            for request, row in zip(batch, scores):
+                request["scores"] = row
+                request["done"].set()
+
+
+def _top(scores: np.ndarray, top_n: int, threshold: float) -> List[int]:
+    """Row indices of the top_n scores at or above threshold, best first."""
+    top_n = min(top_n, len(scores))
+    if top_n <= 0:
+        return []
+    candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+    return [int(i) for i in candidates[np.argsort(-scores[candidates], kind="stable")] if scores[i] >= threshold]
+
+
+def _query_vector(body: Dict, stored: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    if body.get("embedding"):
+        vector = np.asarray(body["embedding"], dtype=np.float32)
+        length = np.linalg.norm(vector)
+        return vector / length if length else vector
+    return stored
+
+
+class MatchingService:
+    """Request handling for one worker process."""
+
+    def __init__(self, store_dir: str):
+        self.store = EmbeddingStore(store_dir)
+        self.resume_batcher = ScoreBatcher(self.store.resumes)
+        self.jd_batcher = ScoreBatcher(self.store.jds)
+
+    def health(self, _body=None) -> Dict:
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "corpus_version": self.store.corpus_version,
+            "resumes": len(self.store.resume_ids),
+            "job_descriptions": len(self.store.jd_ids),
+            "batches": self.resume_batcher.batches,
+            "queries": self.resume_batcher.queries,
+        }
+
+    def match(self, body: Dict) -> Dict:
+        """Top resumes for a JD (by id) or for a raw embedding; the service form of find_top_matches."""
+        vector = _query_vector(body, self.store.jd_vector(body.get("jd_id")) if body.get("jd_id") else None)
+        if vector is None:
+            raise KeyError("Provide a known 'jd_id' or an 'embedding'")
+        scores = self.resume_batcher.score(vector)
+        rows = _top(scores, int(body.get("top_n", 5)), float(body.get("threshold", 0.3)))
+        return {
+            "corpus_version": self.store.corpus_version,
+            "matches": [{**self.store.describe_resume(i), "score": float(scores[i])} for i in rows],
+        }
+
+    def reverse(self, body: Dict) -> Dict:
+        """Best-fitting JD levels for a resume (by id) or a raw embedding."""
+        resume_id = body.get("resume_id")
+        vector = _query_vector(body, self.store.resume_vector(resume_id) if resume_id else None)
+        if vector is None:
+            raise KeyError("Provide a known 'resume_id' or an 'embedding'")
+        scores = self.jd_batcher.score(vector)
+        rows = _top(scores, int(body.get("top_n", 5)), float(body.get("threshold", -1.0)))
+        return {
+            "corpus_version": self.store.corpus_version,
+            "matches": [{**self.store.describe_jd(i), "score": float(scores[i])} for i in rows],
+        }
+
+    def perform_matching(self, body: Dict) -> Dict:
+        """Full skill/experience breakdown for one resume/JD pair, from their stored records."""
+        handler = get_dynamodb_handler()
+        records = {r['id']: r for r in handler.hydrate([body.get("resume_id"), body.get("jd_id")])}
+        resume, jd = records.get(body.get("resume_id")), records.get(body.get("jd_id"))
+        if resume is None or jd is None:
+            raise KeyError("Unknown 'resume_id' or 'jd_id'")
+        return {"resume_id": resume['id'], "jd_id": jd['id'], "result": perform_matching(resume, jd)}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def make_handler(service: MatchingService):
+    routes = {
+        ("GET", "/health"): service.health,
+        ("POST", "/match"): service.match,
+        ("POST", "/reverse"): service.reverse,
+        ("POST", "/perform_matching"): service.perform_matching,
+    }
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, status: int, payload: Dict):
+            data = json.dumps(payload, default=_json_default).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, method: str):
+            route = routes.get((method, self.path.split("?")[0]))
+            if route is None:
+                return self._respond(404, {"error": f"No route for {method} {self.path}"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                return self._respond(200, route(body))
+            except (KeyError, ValueError) as e:
+                return self._respond(400, {"error": str(e)})
+            except Exception as e:
+                print(f"💥 Error handling {method} {self.path}: {e}")
+                return self._respond(500, {"error": str(e)})
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def log_message(self, format, *args):
+            pass  # Access logging per request is too noisy under load
+
+    return RequestHandler
+
+
+def _serve_worker(server: ThreadingHTTPServer, store_dir: str):
+    # Clients and handlers inherited from the parent aren't safe to share across processes
+    clear_clients()
+    get_dynamodb_handler.cache_clear()
+    server.RequestHandlerClass = make_handler(MatchingService(store_dir))
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8502, workers: int = 2, store_dir: str = DEFAULT_STORE_DIR):
+    """Binds the port once and runs `workers` forked processes accepting on it (one process where fork is unavailable)."""
+    server = ThreadingHTTPServer((host, port), BaseHTTPRequestHandler)
+    server.daemon_threads = True
+    print(f"Matching service on http://{host}:{port} with {workers} worker(s), store {store_dir}")
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        server.RequestHandlerClass = make_handler(MatchingService(store_dir))
+        server.serve_forever()
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            _serve_worker(server, store_dir)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in children:
+        os.waitpid(pid, 0)
+    server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless resume/JD matching service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--store-dir", default=DEFAULT_STORE_DIR)
+    parser.add_argument("--build", action="store_true", help="(Re)build the embedding store from storage first")
+    args = parser.parse_args()
+
+    if args.build or not os.path.exists(args.store_dir):
+        meta = build_embedding_store(get_dynamodb_handler(), args.store_dir)
+        print(f"Built embedding store: {len(meta['resumes']['ids'])} resumes, "
+              f"{len(meta['jds']['ids'])} job descriptions (version {meta['corpus_version']})")
+    serve(args.host, args.port, args.workers, args.store_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# src/observability/tracing.py
+"""
+Lightweight per-request tracing.
+
+Usage:
+    with start_trace("page_render") as trace:
+        with span("dynamodb.scan"):
+            ...
+        incr("embedding.calls")
+    print(trace.to_json())
+
+Spans and counters are recorded on the trace that is active in the current
+context; with no active trace they cost next to nothing and record nothing.
+"""
+import functools
+import json
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Most recent finished traces, for export and inspection
+MAX_RECENT_TRACES = 50
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+_recent_traces: deque = deque(maxlen=MAX_RECENT_TRACES)
+
+
+class Trace:
+    """Timings (spans) and counters collected while handling one request."""
+
+    def __init__(self, name: str):
+        self.id = str(uuid.uuid4())
+        self.name = name
+        self.started_at = datetime.utcnow().isoformat()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Counter = Counter()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def add_span(self, record: Dict[str, Any]) -> int:
+        with self._lock:
+            self.spans.append(record)
+            return len(self.spans) - 1
+
+    def incr(self, counter: str, value: float = 1):
+        with self._lock:
+            self.counters[counter] += value
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per span name: call count, total and max duration, sorted by total time."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for record in self.spans:
+            if record.get("duration_ms") is None:
+                continue
+            entry = totals.setdefault(record["name"], {"name": record["name"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += record["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+        for entry in totals.values():
+            entry["total_ms"] = round(entry["total_ms"], 2)
+            entry["max_ms"] = round(entry["max_ms"], 2)
+        return sorted(totals.values(), key=lambda e: e["total_ms"], reverse=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms if self.duration_ms is not None else round(self.elapsed_ms(), 2),
+            "summary": self.summary(),
+            "counters": dict(self.counters),
+            "spans": list(self.spans),
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+
+@contextmanager
+def start_trace(name: str):
+    """Starts a new trace for the current context and yields it; it is kept in the recent list when done."""
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        trace.duration_ms = round(trace.elapsed_ms(), 2)
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        _recent_traces.append(trace)
+
+
+def get_current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def get_recent_traces() -> List[Trace]:
+    return list(_recent_traces)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Times a block as a child of the enclosing span. Exceptions are recorded and re-raised."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    record = {
+        "name": name,
+        "parent": _current_span.get(),
+        "start_ms": round(trace.elapsed_ms(), 2),
+        "duration_ms": None,
+    }
+    if attributes:
+        record["attributes"] = attributes
+    index = trace.add_span(record)
+    token = _current_span.set(index)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        _current_span.reset(token)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator form of span(); the span name defaults to the function's module and name."""
+    def decorator(func):
+        span_name = name or f"{func.__module__.split('.')[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def incr(counter: str, value: float = 1):
+    """Adds to a counter on the active trace, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.incr(counter, value)
+
+
+def record_llm_usage(response_body: Dict):
+    """Counts one Claude call and its token usage from a Bedrock Messages API response body."""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    usage = response_body.get("usage") or {}
+    trace.incr("llm.calls")
+    trace.incr("llm.input_tokens", usage.get("input_tokens", 0))
+    trace.incr("llm.output_tokens", usage.get("output_tokens", 0))
+
+
+def export_traces_json(path: Optional[str] = None, traces: Optional[List[Trace]] = None) -> str:
+    """Serializes traces (default: the recent ones) to JSON, writing them to path if given."""
+    payload = json.dumps([t.to_dict() for t in (traces if traces is not None else get_recent_traces())], indent=2, default=str)
+    if path:
+        with open(path, "w") as f:
+            f.write(payload)
+    return payload
@@ -0,0 +1,189 @@
+# src/question_generation/question_bank.py
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+import numpy as np
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.embeddings.factory import active_embedding_backend, embedding_backend
+from src.matching.semantic_matcher import embedding_matrix, has_embedding
+from src.observability.tracing import incr, traced
+
+QUESTION_BANK_TYPE = "question_bank_entry"
+# A stored pair is served as-is when both the resume and the JD are at least this similar
+QUESTION_BANK_THRESHOLD = float(os.getenv("QUESTION_BANK_THRESHOLD", "0.95"))
+# Between this and QUESTION_BANK_THRESHOLD the stored questions are adapted to the new candidate
+QUESTION_BANK_ADAPT_THRESHOLD = float(os.getenv("QUESTION_BANK_ADAPT_THRESHOLD", "0.90"))
+# Entries older than this, or older than their JD record, are not served
+QUESTION_BANK_MAX_AGE_DAYS = float(os.getenv("QUESTION_BANK_MAX_AGE_DAYS", "30"))
+
+
+def _skills(record: Dict) -> List[str]:
+    skills = record.get('skills') if isinstance(record, dict) else None
+    return [str(s) for s in skills] if isinstance(skills, list) else []
+
+
+def _age_days(timestamp: str, now: datetime) -> float:
+    try:
+        return (now - datetime.fromisoformat(timestamp)).total_seconds() / 86400
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+def adapt_questions(questions: List[str], entry: Dict, resume: Dict) -> List[str]:
+    """
+    Light, LLM-free rewrite of stored questions for a similar candidate.
+
+    Only the stored candidate's name is replaced with the new one. Skills are left
+    alone: without an LLM there is no telling which of the new candidate's skills
+    a question about one of the stored candidate's could fairly be asked about.
+    """
+    replacements = {}
+    old_name, new_name = entry.get('resume_name') or "", resume.get('name') or ""
+    if old_name and new_name and old_name != new_name:
+        replacements[old_name] = new_name
+        replacements[old_name.split()[0]] = new_name.split()[0]
+
+    if not replacements:
+        return list(questions)
+    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in sorted(replacements, key=len, reverse=True)) + r")\b",
+                         re.IGNORECASE)
+    lookup = {k.lower(): v for k, v in replacements.items()}
+    return [pattern.sub(lambda m: lookup[m.group(0).lower()], q) for q in questions]
+
+
+class QuestionBank:
+    """
+    Generated interview questions stored with the embeddings of their (resume, JD) pair.
+
+    A pair's similarity to a stored one is the lower of its resume and JD cosine
+    similarities, so both sides have to be close for questions to be reused.
+    Entries are saved as 'question_bank_entry' records and loaded once per process;
+    only those embedded by the active embedding backend are comparable and loaded.
+    """
+
+    def __init__(self, handler=None, threshold: float = None, adapt_threshold: float = None,
+                 max_age_days: float = None):
+        self.handler = handler
+        self.threshold = QUESTION_BANK_THRESHOLD if threshold is None else threshold
+        self.adapt_threshold = QUESTION_BANK_ADAPT_THRESHOLD if adapt_threshold is None else adapt_threshold
+        self.max_age_days = QUESTION_BANK_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self._entries: Optional[List[Dict]] = None
+        self._resume_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._jd_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "adapted": 0, "misses": 0, "stale": 0, "served_age_days": 0.0}
+
+    def _storage(self):
+        return self.handler or get_dynamodb_handler()
+
+    def _load(self):
+        if self._entries is None:
+            backend = active_embedding_backend()
+            entries = [e for e in self._storage().get_items_by_type(QUESTION_BANK_TYPE)
+                       if e.get('resume_embedding') and e.get('jd_embedding') and embedding_backend(e) == backend]
+            self._entries = []
+            self._append(entries)
+
+    def _append(self, entries: List[Dict]):
+        if not entries:
+            return
+        resume_rows = embedding_matrix([e['resume_embedding'] for e in entries])
+        jd_rows = embedding_matrix([e['jd_embedding'] for e in entries])
+        if self._entries:
+            resume_rows = np.vstack([self._resume_matrix, resume_rows])
+            jd_rows = np.vstack([self._jd_matrix, jd_rows])
+        self._entries.extend(entries)
+        self._resume_matrix, self._jd_matrix = resume_rows, jd_rows
+
+    @traced("question_bank.lookup")
+    def lookup(self, resume: Dict, jd: Dict, num_questions: int = 10) -> Optional[List[str]]:
+        """
+        Returns stored (possibly adapted) questions for a similar pair, or None on a miss.
+        """
+        if not has_embedding(resume) or not has_embedding(jd):
+            return None
+        with self._lock:
+            self._load()
+            self.stats["lookups"] += 1
+            if not self._entries:
+                return self._miss()
+
+            resume_vector = embedding_matrix([resume['embedding']])[0]
+            jd_vector = embedding_matrix([jd['embedding']])[0]
+            similarity = np.minimum(self._resume_matrix @ resume_vector, self._jd_matrix @ jd_vector)
+            now = datetime.utcnow()
+            for i in np.argsort(-similarity):
+                if similarity[i] < self.adapt_threshold:
+                    break
+                entry = self._entries[i]
+                if len(entry.get('questions', [])) < num_questions:
+                    continue
+                age = _age_days(entry.get('created_at'), now)
+                if age > self.max_age_days or (jd.get('last_updated') or "") > (entry.get('created_at') or ""):
+                    self.stats["stale"] += 1
+                    incr("question_bank.stale")
+                    continue
+
+                questions = entry['questions'][:num_questions]
+                self.stats["served_age_days"] += age
+                if similarity[i] >= self.threshold:
+                    self.stats["hits"] += 1
+                    incr("question_bank.hits")
+                    return adapt_questions(questions, entry, resume)
+                self.stats["adapted"] += 1
+                incr("question_bank.adapted")
+                return adapt_questions(questions, entry, resume)
+            return self._miss()
+
+    def _miss(self):
+        self.stats["misses"] += 1
+        incr("question_bank.misses")
+        return None
+
+    def add(self, resume: Dict, jd: Dict, questions: List[str]) -> bool:
+        """Stores freshly generated questions for a pair."""
+        if not has_embedding(resume) or not has_embedding(jd) or not questions:
+            return False
+        entry = {
+            "id": f"{QUESTION_BANK_TYPE}#{uuid.uuid4()}",
+            "type": QUESTION_BANK_TYPE,
+            "resume_id": resume.get('id'),
+            "resume_name": resume.get('name'),
+            "resume_skills": _skills(resume),
+            "jd_id": jd.get('id'),
+            "jd_level": jd.get('level'),
+            "questions": list(questions),
+            "created_at": datetime.utcnow().isoformat(),
+            "embedding_backend": embedding_backend(resume),
+            "resume_embedding": [float(v) for v in resume['embedding']],
+            "jd_embedding": [float(v) for v in jd['embedding']],
+        }
+        with self._lock:
+            self._load()
+            self._append([entry])
+        return self._storage().save_item(entry)
+
+    def report(self) -> Dict:
+        """Hit rate (served as-is or adapted), miss and stale counts, and the mean age of served entries."""
+        with self._lock:
+            served = self.stats["hits"] + self.stats["adapted"]
+            return {
+                "entries": len(self._entries or []),
+                "lookups": self.stats["lookups"],
+                "hits": self.stats["hits"],
+                "adapted": self.stats["adapted"],
+                "misses": self.stats["misses"],
+                "stale_skipped": self.stats["stale"],
+                "hit_rate": round(served / self.stats["lookups"], 4) if self.stats["lookups"] else None,
+                "mean_served_age_days": round(self.stats["served_age_days"] / served, 2) if served else None,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_question_bank() -> QuestionBank:
+    """Returns the process-wide question bank."""
+    return QuestionBank()
@@ -1,11 +1,25 @@
 # src/question_generation/question_generator.py
-import boto3
 import json
+from src.aws_clients import get_client
+from src.observability.tracing import record_llm_usage, span, traced
+from src.question_generation.question_bank import get_question_bank
 
-bedrock = boto3.client(service_name='bedrock-runtime', region_name='eu-central-1') # Ensure your region is correct
+BEDROCK_REGION = 'eu-central-1' # Ensure your region is correct
+
+@traced("generate_interview_questions")
+def generate_interview_questions(resume_data, job_description_data, num_questions=10, use_bank=True):
+    """
+    Generates interview questions using AWS Bedrock's Messages API.
+
+    With use_bank, questions stored for a near-identical (resume, JD) pair are
+    served (or lightly adapted) from the question bank instead of calling Claude.
+    """
+    bank = get_question_bank() if use_bank and isinstance(resume_data, dict) and isinstance(job_description_data, dict) else None
+    if bank:
+        cached = bank.lookup(resume_data, job_description_data, num_questions=num_questions)
+        if cached is not None:
+            return cached
 
-def generate_interview_questions(resume_data, job_description_data, num_questions=10):
-    """Generates interview questions using AWS Bedrock's Messages API."""
     model_id = 'anthropic.claude-3-haiku-20240307-v1:0'  
 
     messages = [
@@ -31,10 +45,15 @@ def generate_interview_questions(resume_data, job_description_data, num_question
     content_type = 'application/json'
 
     try:
-        response = bedrock.invoke_model(body=body, modelId=model_id, accept=accept, contentType=content_type)
-        response_body = json.loads(response.get('body').read())
+        with span("bedrock.claude", task="interview_questions"):
+            response = get_client('bedrock-runtime', region_name=BEDROCK_REGION).invoke_model(body=body, modelId=model_id, accept=accept, contentType=content_type)
+            response_body = json.loads(response.get('body').read())
+        record_llm_usage(response_body)
         generated_text = response_body['content'][0]['text'] # Adjust response parsing for Messages API
-        return generated_text.split("\n")
+        questions = generated_text.split("\n")
+        if bank:
+            bank.add(resume_data, job_description_data, questions)
+        return questions
     except Exception as e:
         print(f"Error during Bedrock Messages API invocation: {e}")
         return [f"Error generating questions (Messages API): {e}"]
@@ -0,0 +1,148 @@
+# src/resume_processing/experience_parser.py
+"""
+Total years of experience and a level bucket from a resume's experience entries.
+
+The extracted 'start_date' / 'end_date' strings ("January 2021", "03/2019",
+"Present") are parsed with dateparser. Overlapping positions count once, and
+entries without usable dates fall back to their 'duration' ("2 years 6 months").
+The results are stored on the resume at ingest as 'experience_years' and
+'experience_level', the columns the matcher's pre-filter index reads.
+
+Backfill resumes stored before this existed with:
+
+    python -m src.resume_processing.experience_parser
+"""
+import argparse
+import math
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional
+from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler, get_dynamodb_handler
+from src.search.filter_index import LEVEL_BOUNDS, LEVELS
+
+# (level, years up to but excluding)
+LEVEL_BUCKETS = list(zip(LEVELS, LEVEL_BOUNDS + [math.inf]))
+PRESENT_PATTERN = re.compile(r"^(present|current|currently|now|today|ongoing|to date|date)$", re.IGNORECASE)
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(years?|yrs?|months?|mos?)\b", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"(?:19|20)\d{2}")
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str, end: bool = False) -> Optional[date]:
+    """
+    A resume date string as a date, or None.
+
+    Missing parts are filled from the start of the period ("2020" -> Jan 1, "March 2020"
+    -> March 1), or from its end for end dates, so "Jan 2020 - Dec 2020" spans a full year.
+    """
+    text = " ".join(str(text or "").split())
+    if not text:
+        return None
+    if YEAR_PATTERN.fullmatch(text):
+        return date(int(text), 12, 31) if end else date(int(text), 1, 1)
+    import dateparser
+
+    parsed = dateparser.parse(text, settings={
+        "PREFER_DAY_OF_MONTH": "last" if end else "first",
+        "PREFER_DATES_FROM": "past",
+        "REQUIRE_PARTS": ["year"],
+    })
+    return parsed.date() if parsed else None
+
+
+def parse_duration_years(text: str) -> Optional[float]:
+    """Years in a duration string like "2 years 6 months" or "18 mos", or None."""
+    matches = DURATION_PATTERN.findall(str(text or ""))
+    if not matches:
+        return None
+    return sum(float(value) / (12 if unit.lower().startswith("m") else 1) for value, unit in matches)
+
+
+def experience_years(experience: List[Dict], today: Optional[date] = None) -> Optional[float]:
+    """
+    Total years across experience entries, or None if no entry has usable dates or a duration.
+
+    Args:
+        experience: The resume's 'experience' list
+        today: End date for current positions; defaults to today
+    """
+    today = today or date.today()
+    intervals, undated, found = [], 0.0, False
+    for entry in experience or []:
+        if not isinstance(entry, dict):
+            continue
+        start = parse_date(entry.get('start_date')) if entry.get('start_date') else None
+        end_text = " ".join(str(entry.get('end_date') or "").split())
+        duration = parse_duration_years(entry.get('duration'))
+        if start and (PRESENT_PATTERN.match(end_text) or (not end_text and duration is None)):
+            end = today
+        else:
+            end = parse_date(end_text, end=True) if end_text else None
+
+        if start and end and start <= min(end, today):
+            intervals.append((start, min(end, today)))
+            found = True
+        elif duration is not None:
+            undated += duration
+            found = True
+    if not found:
+        return None
+
+    # Overlapping positions (two jobs at once) count once
+    days, span_start, span_end = 0, None, None
+    for start, end in sorted(intervals):
+        if span_end is None or start > span_end:
+            if span_end is not None:
+                days += (span_end - span_start).days
+            span_start, span_end = start, end
+        else:
+            span_end = max(span_end, end)
+    if span_end is not None:
+        days += (span_end - span_start).days
+    return round(days / 365.25 + undated, 1)
+
+
+def experience_level(years: Optional[float]) -> Optional[str]:
+    """Level bucket for a number of years (None stays None)."""
+    if years is None:
+        return None
+    return next(name for name, below in LEVEL_BUCKETS if float(years) < below)
+
+
+def experience_fields(resume: Dict, today: Optional[date] = None) -> Dict:
+    """The 'experience_years' and 'experience_level' fields for a resume record."""
+    years = experience_years(resume.get('experience'), today)
+    return {"experience_years": years, "experience_level": experience_level(years)}
+
+
+def backfill_experience_fields(handler: Optional[DynamoDBHandler] = None, recompute: bool = False) -> Dict:
+    """
+    Adds the experience fields to stored resumes that don't have them yet (or to all, with recompute).
+
+    Returns:
+        Counts of resumes scanned and updated
+    """
+    handler = handler or get_dynamodb_handler()
+    resumes = handler.get_all_resumes()
+    updated = 0
+    for resume in resumes:
+        if recompute or 'experience_years' not in resume:
+            resume.update(experience_fields(resume))
+            # save_item, not save_resume: the corpus stamp is touched once below instead of per record
+            updated += handler.save_item(resume)
+    if updated:
+        handler.touch_corpus()
+    return {"resumes": len(resumes), "updated": updated}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse stored resumes' experience into years and a level bucket.")
+    parser.add_argument("--recompute", action="store_true", help="Recompute resumes that already have the fields")
+    args = parser.parse_args()
+    stats = backfill_experience_fields(recompute=args.recompute)
+    print(f"✅ Updated {stats['updated']:,} of {stats['resumes']:,} resumes")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,37 +2,27 @@
 
 import uuid
 import json
-import boto3
-from langchain_core.documents import Document
-from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler
+from typing import TYPE_CHECKING, Dict, List, Optional
+from src.aws_clients import get_client
+from src.data_automation.pipelines.dynamodb_operations import get_dynamodb_handler
+from src.embeddings.factory import embedding_fields, get_embedder
+from src.matching.materialized_matches import add_resumes_to_match_tables
+from src.matching.semantic_matcher import has_embedding
+from src.observability.tracing import incr, record_llm_usage, span, traced
+from src.resume_processing.experience_parser import experience_fields
+from src.resume_processing.near_duplicates import RESUME_DUPLICATE_TYPE, get_near_duplicate_index
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
 BEDROCK_REGION = "eu-central-1"
-MODEL_ID = "amazon.titan-embed-text-v1"
-
-bedrock = boto3.client(service_name='bedrock-runtime', region_name=BEDROCK_REGION)
-
-# Initialize DynamoDB handler
-dynamodb_handler = DynamoDBHandler(table_name="ResumeJobMatcher")
 
 def get_bedrock_client():
-    return boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+    return get_client("bedrock-runtime", region_name=BEDROCK_REGION)
 
 def embed_text(text):
-    """Calls Amazon Bedrock Titan model to generate an embedding for input text."""
-    if not text or not isinstance(text, str):
-        raise ValueError("Text must be a non-empty string.")
-
-    client = get_bedrock_client()
-    body = { "inputText": text }
-
-    response = client.invoke_model(
-        modelId=MODEL_ID,
-        body=json.dumps(body),
-        contentType="application/json"
-    )
-
-    response_body = json.loads(response["body"].read())
-    return response_body.get("embedding", [])
+    """Embeds input text with the configured embedding backend (EMBEDDING_BACKEND, see src.embeddings.factory)."""
+    return get_embedder().embed_text(text)
 
 def extract_profile_using_llm(text, metadata=None):
     """Uses Claude via Bedrock to extract profile data from raw resume text."""
@@ -66,14 +56,16 @@ Resume:
     })
 
     try:
-        response = bedrock.invoke_model(
-            body=body,
-            modelId=model_id,
-            accept='application/json',
-            contentType='application/json'
-        )
-
-        response_body = json.loads(response.get("body").read())
+        with span("bedrock.claude", task="extract_profile"):
+            response = get_bedrock_client().invoke_model(
+                body=body,
+                modelId=model_id,
+                accept='application/json',
+                contentType='application/json'
+            )
+
+            response_body = json.loads(response.get("body").read())
+        record_llm_usage(response_body)
         content_list = response_body.get("content", [])
         content = "".join([item.get("text", "") for item in content_list]).strip()
 
@@ -104,7 +96,7 @@ Resume:
             "tags": [],
             "interview_summaries": [],
             "metadata": metadata or {},
-            "embedding": embed_text(text)  
+            **embedding_fields(text)
         })
 
         if 'embedding' in parsed and isinstance(parsed['embedding'], list):
@@ -118,27 +110,80 @@ Resume:
         print(f"💥 Error extracting profile with LLM: {e}")
         return None
 
-def process_resume(document: Document):
-    # Check if we already have this resume processed
-    if document.metadata.get('source'):
-        existing_resume = dynamodb_handler.get_resume(document.metadata['source'])
+@traced("process_resume")
+def process_resume(document: "Document", source_index: Optional[Dict[str, List[Dict]]] = None,
+                   update_match_tables: bool = True):
+    """
+    Returns the stored resume for a document, extracting and saving it first if it is new.
+
+    Args:
+        document: The resume document
+        source_index: DynamoDBHandler.get_source_index() output for bulk loads; without it
+            the stored items are looked up by source (a table scan on DynamoDB)
+        update_match_tables: Merge a saved resume into the per-JD top-k rows right away; bulk
+            loads turn this off and run sync_match_tables once for the whole batch
+    """
+    dynamodb_handler = get_dynamodb_handler()
+
+    source = document.metadata.get('source')
+
+    # Check if we already have this resume processed (or linked as a duplicate of one)
+    if source:
+        if source_index is None:
+            existing = dynamodb_handler.get_items_by_source(source)
+        else:
+            existing = dynamodb_handler.hydrate(item['id'] for item in source_index.get(source, []))
+        existing_resume = next((item for item in existing if item.get('type') == 'resume'), None)
+        link = next((item for item in existing if item.get('type') == RESUME_DUPLICATE_TYPE), None)
+        if not existing_resume and link:
+            canonical = dynamodb_handler.hydrate([link['canonical_id']])
+            existing_resume = canonical[0] if canonical else None
         if existing_resume:
+            incr("cache.resume.hits")
+            changed = False
+            if not has_embedding(existing_resume):
+                # Embedded by another backend: move it into the active vector space without re-extracting
+                existing_resume.update(embedding_fields(document.page_content))
+                changed = True
+            if 'experience_years' not in existing_resume:
+                # Stored before experience parsing: derive the pre-filter fields once
+                existing_resume.update(experience_fields(existing_resume))
+                changed = True
+            if changed and dynamodb_handler.save_resume(existing_resume) and update_match_tables:
+                add_resumes_to_match_tables(dynamodb_handler, [existing_resume])
             return existing_resume
-    
+        incr("cache.resume.misses")
+
+    # A near-duplicate of a stored resume (same CV re-uploaded, other format) is linked to it, not re-extracted
+    duplicates = get_near_duplicate_index()
+    canonical, signature = duplicates.check(document.page_content, source)
+    if canonical:
+        return canonical
+
     # Process new resume
     extracted_data = extract_profile_using_llm(document.page_content, metadata=document.metadata)
     
     if extracted_data:
         # Add type field to distinguish between resumes and job descriptions
         extracted_data['type'] = 'resume'
+        # Total years and level bucket, for the matcher's pre-filter
+        extracted_data.update(experience_fields(extracted_data))
+        if signature is not None:
+            extracted_data['minhash'] = signature.tolist()
         # Save to DynamoDB
-        dynamodb_handler.save_resume(extracted_data)
+        if dynamodb_handler.save_resume(extracted_data):
+            if signature is not None:
+                duplicates.add(extracted_data['id'], signature)
+            if update_match_tables:
+                add_resumes_to_match_tables(dynamodb_handler, [extracted_data])
     
     return extracted_data
 
     #return extract_profile_using_llm(document.page_content, metadata=document.metadata)
 
 if __name__ == "__main__":
+    from langchain_core.documents import Document
+
     sample_resume_text = """
     John Doe
     john.doe@email.com | (123) 456-7890 | linkedin.com/in/johndoe
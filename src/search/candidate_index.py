@@ -0,0 +1,122 @@
+# src/search/candidate_index.py
+import bisect
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# Keeps skill spellings like "c++", "c#" and "node.js" as single tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def _tokenize(text: str) -> List[str]:
+    return [t.rstrip(".") for t in TOKEN_PATTERN.findall((text or "").lower()) if t.rstrip(".")]
+
+
+class CandidateSearchIndex:
+    """
+    Prefix/token index over candidate names, emails and skills.
+
+    Only small summaries (id, name, email, a few skills) are held here; the
+    full resume is loaded separately once a candidate is picked.
+    """
+
+    def __init__(self):
+        self._summaries: Dict[str, Dict] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._tokens_by_id: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []  # Sorted, for prefix lookups with bisect
+
+    @classmethod
+    def build(cls, resumes: Iterable[Dict]) -> "CandidateSearchIndex":
+        index = cls()
+        for resume in resumes:
+            index.add(resume)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def add(self, resume: Dict):
+        """Indexes (or re-indexes) one resume record."""
+        resume_id = resume.get("id")
+        if not resume_id:
+            return
+        if resume_id in self._summaries:
+            self.remove(resume_id)
+
+        contact = resume.get("contact") if isinstance(resume.get("contact"), dict) else {}
+        skills = resume.get("skills") if isinstance(resume.get("skills"), list) else []
+        self._summaries[resume_id] = {
+            "id": resume_id,
+            "name": resume.get("name") or "Unnamed Candidate",
+            "email": contact.get("email"),
+            "skills": [str(s) for s in skills[:8]],
+        }
+
+        email = contact.get("email") or ""
+        text = " ".join([resume.get("name") or "", email, email.split("@")[0]] + [str(s) for s in skills])
+        tokens = set(_tokenize(text))
+        self._tokens_by_id[resume_id] = tokens
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+            self._postings[token].add(resume_id)
+
+    def remove(self, resume_id: str):
+        """Drops a resume from the index."""
+        if self._summaries.pop(resume_id, None) is None:
+            return
+        for token in self._tokens_by_id.pop(resume_id, ()):
+            ids = self._postings[token]
+            ids.discard(resume_id)
+            if not ids:
+                del self._postings[token]
+                self._vocabulary.pop(bisect.bisect_left(self._vocabulary, token))
+
+    def _ids_with_prefix(self, prefix: str) -> Set[str]:
+        ids: Set[str] = set()
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            ids |= self._postings[token]
+        return ids
+
+    def search(self, query: str = "", page: int = 0, page_size: int = 20) -> Dict:
+        """
+        Finds candidates whose name, email or skills match every query term (as a prefix).
+
+        Args:
+            query: Free text, e.g. "ali python"; empty lists everyone.
+            page: Zero-based page number.
+            page_size: Results per page.
+
+        Returns:
+            A dictionary with 'results' (candidate summaries for the page), 'total', 'page' and 'pages'.
+        """
+        terms = _tokenize(query)
+        if terms:
+            candidate_ids: Optional[Set[str]] = None
+            for term in terms:
+                matches = self._ids_with_prefix(term)
+                candidate_ids = matches if candidate_ids is None else candidate_ids & matches
+                if not candidate_ids:
+                    break
+            candidate_ids = candidate_ids or set()
+            # Whole-token matches rank above prefix-only matches
+            exact = lambda cid: sum(cid in self._postings.get(term, ()) for term in terms)
+            ordered = sorted(candidate_ids, key=lambda cid: (-exact(cid), self._summaries[cid]["name"].lower()))
+        else:
+            ordered = sorted(self._summaries, key=lambda cid: self._summaries[cid]["name"].lower())
+
+        total = len(ordered)
+        pages = max(1, math.ceil(total / page_size))
+        page = min(max(page, 0), pages - 1)
+        window = ordered[page * page_size:(page + 1) * page_size]
+        return {
+            "results": [dict(self._summaries[cid]) for cid in window],
+            "total": total,
+            "page": page,
+            "pages": pages,
+        }
@@ -0,0 +1,81 @@
+# src/search/filter_index.py
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+# Experience level buckets, named like the JD levels, and the years at which each next one starts
+LEVELS = ["Junior", "Mid-Level", "Senior", "Principal"]
+LEVEL_BOUNDS = [2.0, 5.0, 8.0]
+
+
+def _years(value) -> float:
+    return float(value) if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool) else np.nan
+
+
+class ResumeFilterIndex:
+    """
+    Columnar filter index over resumes: experience years, level bucket and skills.
+
+    Years and level codes are numpy columns and each skill has a sorted array of
+    row numbers, so a filter is a few vectorized comparisons and intersections.
+    The matcher then scores only the selected rows. Resumes without parsed
+    experience are left out by any years or level filter.
+    """
+
+    def __init__(self, resumes: List[Dict]):
+        self.resumes = resumes
+        self.years = np.array([_years(r.get('experience_years')) for r in resumes], dtype=np.float32)
+        # Level from the stored bucket, else from the years (-1 = unknown)
+        codes = np.digitize(np.nan_to_num(self.years, nan=-1.0), LEVEL_BOUNDS).astype(np.int8)
+        codes[np.isnan(self.years)] = -1
+        for i, resume in enumerate(resumes):
+            if resume.get('experience_level') in LEVELS:
+                codes[i] = LEVELS.index(resume['experience_level'])
+        self.level_codes = codes
+
+        postings: Dict[str, List[int]] = {}
+        for i, resume in enumerate(resumes):
+            skills = resume.get('skills') if isinstance(resume.get('skills'), list) else []
+            for skill in {str(s).strip().lower() for s in skills if str(s).strip()}:
+                postings.setdefault(skill, []).append(i)
+        self._skill_rows = {skill: np.array(rows, dtype=np.int32) for skill, rows in postings.items()}
+
+    @classmethod
+    def build(cls, resumes: Iterable[Dict]) -> "ResumeFilterIndex":
+        return cls([r for r in resumes if isinstance(r, dict)])
+
+    def __len__(self) -> int:
+        return len(self.resumes)
+
+    def skills(self) -> List[str]:
+        """Indexed skills, most common first (for filter pickers)."""
+        return sorted(self._skill_rows, key=lambda s: (-len(self._skill_rows[s]), s))
+
+    def select(self, levels: Optional[List[str]] = None, min_years: Optional[float] = None,
+               max_years: Optional[float] = None, skills: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Row numbers of the resumes passing every given filter.
+
+        Args:
+            levels: Keep resumes in any of these level buckets
+            min_years: Keep resumes with at least this many years of experience
+            max_years: Keep resumes with at most this many years
+            skills: Keep resumes listing all of these skills (case-insensitive)
+        """
+        mask = np.ones(len(self.resumes), dtype=bool)
+        if levels:
+            mask &= np.isin(self.level_codes, [LEVELS.index(level) for level in levels if level in LEVELS])
+        with np.errstate(invalid="ignore"):
+            if min_years is not None:
+                mask &= self.years >= min_years
+            if max_years is not None:
+                mask &= self.years <= max_years
+        rows = np.flatnonzero(mask)
+        for skill in skills or []:
+            rows = np.intersect1d(rows, self._skill_rows.get(str(skill).strip().lower(), np.zeros(0, np.int32)),
+                                  assume_unique=True)
+        return rows
+
+    def filter(self, **filters) -> List[Dict]:
+        """The resumes passing the filters (see select), in index order."""
+        return [self.resumes[i] for i in self.select(**filters)]
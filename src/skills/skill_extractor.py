@@ -0,0 +1,262 @@
+# src/skills/skill_extractor.py
+"""
+Rule-based skill and technology extraction, without LLM calls.
+
+A lexicon of canonical names and their aliases is compiled into spaCy
+PhraseMatchers. They run as a pipeline component, so nlp.pipe can spread
+thousands of documents over worker processes. The matches fill or refresh
+'skills' on resumes and 'technologies_mentioned' on JD levels:
+
+    python -m src.skills.skill_extractor --processes 8
+    python -m src.skills.skill_extractor --from-s3 --replace
+
+Only a blank English tokenizer is needed, not a trained spaCy model. Terms of
+one or two characters (Go, R, C) and names that are also everyday words
+(CASE_SENSITIVE_TERMS: Spring, Swift, Lambda, ...) match case-sensitively,
+everything else case-insensitively. Aliases are kept to unambiguous spellings;
+generic words ("containers", "node", "ml") would tag resumes that only mention them.
+"""
+import argparse
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+from src.data_automation.pipelines.dynamodb_operations import DynamoDBHandler, get_dynamodb_handler
+from src.observability.tracing import incr, span
+
+TECHNOLOGY = "technology"
+SKILL = "skill"
+# Canonical name -> aliases, per category
+DEFAULT_LEXICON = {
+    TECHNOLOGY: {
+        "Python": ["python3"], "Java": [], "Scala": [], "Go": ["golang"], "Rust": [], "C++": ["cpp"], "C#": ["csharp"],
+        "JavaScript": ["javascript", "ecmascript"], "TypeScript": [], "Kotlin": [], "Swift": [], "R": [], "Ruby": [],
+        "PHP": [], "Bash": ["shell scripting"], "SQL": [], "NoSQL": [], "GraphQL": [],
+        "AWS": ["amazon web services"], "Azure": ["microsoft azure"], "GCP": ["google cloud", "google cloud platform"],
+        "Lambda": ["aws lambda"], "S3": ["amazon s3"], "EC2": [], "ECS": [], "EKS": [], "Bedrock": ["amazon bedrock"],
+        "SageMaker": ["amazon sagemaker"], "DynamoDB": ["dynamo db"], "Athena": ["amazon athena"], "Glue": ["aws glue"],
+        "Redshift": ["amazon redshift"], "BigQuery": ["big query"], "Snowflake": [], "Databricks": [],
+        "PostgreSQL": ["postgres"], "MySQL": [], "SQL Server": ["mssql"], "Oracle": [], "MongoDB": ["mongo"],
+        "Redis": [], "Elasticsearch": ["elastic search"], "OpenSearch": [], "Cassandra": [],
+        "Docker": [], "Kubernetes": ["k8s"], "Terraform": [], "CloudFormation": [], "Ansible": [],
+        "Helm": [], "Jenkins": [], "GitHub Actions": [], "GitLab CI": [], "CI/CD": ["ci / cd", "continuous integration"],
+        "Git": [], "Linux": [], "Spark": ["apache spark", "pyspark"], "Hadoop": [], "Airflow": ["apache airflow"],
+        "Kafka": ["apache kafka"], "Flink": ["apache flink"], "dbt": [], "Pandas": [], "NumPy": [], "scikit-learn": ["sklearn"],
+        "PyTorch": [], "TensorFlow": [], "Keras": [], "Hugging Face": ["huggingface"], "LangChain": [],
+        "spaCy": [], "NLTK": [], "MLflow": [], "Tableau": [], "Power BI": ["powerbi"], "Looker": [], "Excel": [],
+        "React": ["react.js", "reactjs"], "Angular": [], "Vue": ["vue.js"], "Node.js": ["nodejs"],
+        "Django": [], "Flask": [], "FastAPI": [], "Spring": ["spring boot"], ".NET": ["dotnet"], "REST APIs": ["rest api", "restful"],
+        "gRPC": [], "Microservices": ["microservice"], "Streamlit": [], "Jira": [],
+    },
+    SKILL: {
+        "Machine Learning": ["ML"], "Deep Learning": [], "NLP": ["natural language processing"],
+        "Computer Vision": [], "Data Engineering": [], "Data Modeling": ["data modelling"], "ETL": [],
+        "Data Analysis": ["data analytics"], "Statistics": [], "MLOps": [], "DevOps": [], "Cloud Architecture": [],
+        "System Design": [], "Distributed Systems": [], "Unit Testing": ["unit tests"], "Test Automation": [],
+        "Agile": [], "Scrum": [], "Kanban": [], "Code Review": ["code reviews"], "Mentoring": ["mentorship"],
+        "Stakeholder Management": [], "Project Management": [], "Communication": [], "Leadership": [],
+    },
+}
+# Technology names that are also everyday words ("spring", "swift", "excel"); only their capitalized spelling counts
+CASE_SENSITIVE_TERMS = frozenset({
+    "Go", "R", "Swift", "Ruby", "Rust", "Spring", "Excel", "Oracle", "Glue", "Lambda", "Athena", "Bedrock",
+    "Snowflake", "Spark", "Airflow", "Helm", "Flask", "React", "Looker",
+})
+# Corpus terms join the lexicon once they occur this often and look like a name, not a sentence
+MIN_CORPUS_TERM_COUNT = 2
+MAX_TERM_WORDS = 3
+BATCH_SIZE = 256
+# nlp.pipe worker processes (0 = one per CPU); fewer texts than PARALLEL_MIN_TEXTS stay in-process
+SKILL_EXTRACTOR_PROCESSES = int(os.getenv("SKILL_EXTRACTOR_PROCESSES", "0"))
+PARALLEL_MIN_TEXTS = 1000
+COMPONENT_NAME = "skill_phrase_matcher"
+
+
+def build_lexicon(records: Iterable[Dict] = (), base: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    Lexicon entries keyed by canonical name: {'category': ..., 'aliases': [...]}.
+
+    DEFAULT_LEXICON (or `base`) is extended with the short skill and
+    technology names already stored on records, so what Claude extracted once
+    is found again by the matcher.
+    """
+    lexicon = {
+        canonical: {"category": category, "aliases": list(aliases)}
+        for category, entries in (base or DEFAULT_LEXICON).items()
+        for canonical, aliases in entries.items()
+    }
+    known = {term.lower() for canonical, entry in lexicon.items() for term in [canonical, *entry["aliases"]]}
+
+    spellings = defaultdict(Counter)
+    categories = {}
+    for record in records:
+        fields = [('technologies_mentioned', TECHNOLOGY)] if record.get('type') == 'job_description' else [('skills', SKILL)]
+        for field, category in fields:
+            for term in record.get(field) or []:
+                term = " ".join(str(term).split())
+                if term and len(term.split()) <= MAX_TERM_WORDS and term.lower() not in known:
+                    spellings[term.lower()][term] += 1
+                    categories.setdefault(term.lower(), category)
+    for key, counts in spellings.items():
+        if sum(counts.values()) >= MIN_CORPUS_TERM_COUNT:
+            lexicon[counts.most_common(1)[0][0]] = {"category": categories[key], "aliases": []}
+    return lexicon
+
+
+class SkillPhraseMatcher:
+    """Pipeline component: stores lexicon matches in doc.spans['skills'], labelled with the canonical name."""
+
+    def __init__(self, nlp, lexicon: Dict[str, Dict]):
+        from spacy.matcher import PhraseMatcher
+
+        self.matchers = [PhraseMatcher(nlp.vocab, attr="LOWER"), PhraseMatcher(nlp.vocab, attr="ORTH")]
+        for canonical, entry in lexicon.items():
+            by_attr = ([], [])
+            for term in dict.fromkeys([canonical, *entry["aliases"]]):
+                by_attr[len(term) <= 2 or term in CASE_SENSITIVE_TERMS].append(nlp.make_doc(term))
+            for matcher, patterns in zip(self.matchers, by_attr):
+                if patterns:
+                    matcher.add(canonical, patterns)
+
+    def __call__(self, doc):
+        from spacy.tokens import Span
+
+        matches = [m for matcher in self.matchers for m in matcher(doc)]
+        doc.spans["skills"] = [Span(doc, start, end, label=match_id) for match_id, start, end in sorted(matches, key=lambda m: m[1])]
+        return doc
+
+
+def _make_component(nlp, name: str, lexicon: Dict):
+    return SkillPhraseMatcher(nlp, lexicon)
+
+
+class SkillExtractor:
+    """Finds lexicon skills and technologies in texts with a tokenizer-only spaCy pipeline."""
+
+    def __init__(self, lexicon: Optional[Dict[str, Dict]] = None, n_process: int = SKILL_EXTRACTOR_PROCESSES,
+                 batch_size: int = BATCH_SIZE):
+        import spacy
+        from spacy.language import Language
+
+        if not Language.has_factory(COMPONENT_NAME):
+            Language.factory(COMPONENT_NAME, func=_make_component)
+        self.lexicon = lexicon if lexicon is not None else build_lexicon()
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe(COMPONENT_NAME, config={"lexicon": self.lexicon})
+        # Span labels are hashes; map them back here, since the workers' string stores don't come back with the docs
+        self._canonical = {self.nlp.vocab.strings.add(canonical): canonical for canonical in self.lexicon}
+        self.n_process = n_process or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def extract(self, texts: List[str]) -> List[List[str]]:
+        """Canonical names found in each text, in order of first mention."""
+        n_process = self.n_process if len(texts) >= PARALLEL_MIN_TEXTS else 1
+        incr("skills.texts", len(texts))
+        with span("skills.extract", texts=len(texts), processes=n_process):
+            return [
+                list(dict.fromkeys(self._canonical[s.label] for s in doc.spans["skills"]))
+                for doc in self.nlp.pipe((t or "" for t in texts), batch_size=self.batch_size, n_process=n_process)
+            ]
+
+    def technologies(self, names: List[str]) -> List[str]:
+        return [name for name in names if self.lexicon[name]["category"] == TECHNOLOGY]
+
+
+def record_text(record: Dict) -> str:
+    """The text a stored resume or JD level is matched against, rebuilt from its extracted fields."""
+    if record.get('type') == 'job_description':
+        parts = [record.get('title'), record.get('experience'), record.get('focus'),
+                 *(record.get('core_requirements') or []), *(record.get('soft_skills') or []),
+                 *(record.get('technologies_mentioned') or [])]
+    else:
+        parts = []
+        for exp in record.get('experience') or []:
+            parts += [exp.get('title'), *(exp.get('responsibilities') or [])]
+        for project in record.get('projects') or []:
+            parts += [project.get('name'), project.get('description'), *(project.get('technologies') or [])]
+        parts += record.get('skills') or []
+    return "\n".join(str(p) for p in parts if p)
+
+
+def _merge(existing: List[str], found: List[str], replace: bool) -> List[str]:
+    if replace and found:
+        return found
+    seen = {str(e).lower() for e in existing}
+    return list(existing) + [f for f in found if f.lower() not in seen]
+
+
+def refresh_corpus_skills(handler: Optional[DynamoDBHandler] = None, replace: bool = False,
+                          texts_by_source: Optional[Dict[str, str]] = None, n_process: int = SKILL_EXTRACTOR_PROCESSES) -> Dict:
+    """
+    Fills 'skills' on every stored resume and 'technologies_mentioned' on every JD level from the lexicon.
+
+    Args:
+        handler: Storage handler; defaults to the shared one
+        replace: Overwrite the fields with the matches instead of adding new ones
+            (a record with no matches keeps its values)
+        texts_by_source: Raw document text by metadata.source (e.g. re-read from S3);
+            resumes without one are matched against their extracted fields
+        n_process: nlp.pipe worker processes (0 = one per CPU)
+
+    Returns:
+        Counts of records scanned and updated, and the timing
+    """
+    handler = handler or get_dynamodb_handler()
+    started = time.perf_counter()
+    resumes = handler.get_all_resumes()
+    jds = handler.get_all_job_descriptions()
+    extractor = SkillExtractor(build_lexicon(resumes + jds), n_process=n_process)
+
+    texts_by_source = texts_by_source or {}
+    texts = [texts_by_source.get((r.get('metadata') or {}).get('source')) or record_text(r) for r in resumes]
+    texts += [record_text(jd) for jd in jds]
+    found = extractor.extract(texts)
+    extracted_s = time.perf_counter() - started
+
+    updated = 0
+    for record, names in zip(resumes + jds, found):
+        field = 'technologies_mentioned' if record.get('type') == 'job_description' else 'skills'
+        names = extractor.technologies(names) if field == 'technologies_mentioned' else names
+        merged = _merge(record.get(field) or [], names, replace)
+        if merged != list(record.get(field) or []):
+            record[field] = merged
+            # save_item, not save_resume: the corpus stamp is touched once below instead of per record
+            updated += handler.save_item(record)
+    if updated:
+        handler.touch_corpus()
+
+    return {
+        "resumes": len(resumes),
+        "job_descriptions": len(jds),
+        "updated": updated,
+        "lexicon_terms": len(extractor.lexicon),
+        "extract_s": round(extracted_s, 2),
+        "docs_per_s": round(len(texts) / extracted_s, 1) if extracted_s else None,
+        "total_s": round(time.perf_counter() - started, 2),
+    }
+
+
+def _texts_from_s3(bucket: str, prefix: str) -> Dict[str, str]:
+    from src.data_automation.pipelines.data_loader import load_and_extract_text_from_all_folders_s3
+
+    documents = load_and_extract_text_from_all_folders_s3(bucket, prefix).get("Resumes", [])
+    return {doc.metadata.get('source'): doc.page_content for doc in documents if doc and doc.metadata.get('source')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill resume skills and JD technologies from the skill lexicon, without LLM calls.")
+    parser.add_argument("--replace", action="store_true", help="Overwrite the fields instead of adding new matches")
+    parser.add_argument("--processes", type=int, default=SKILL_EXTRACTOR_PROCESSES, help="nlp.pipe workers (0 = one per CPU)")
+    parser.add_argument("--from-s3", action="store_true", help="Match resumes against their raw S3 documents")
+    parser.add_argument("--bucket", default="zmakarimayi-testing-data-upload")
+    parser.add_argument("--prefix", default="Data")
+    args = parser.parse_args()
+
+    texts = _texts_from_s3(args.bucket, args.prefix) if args.from_s3 else None
+    stats = refresh_corpus_skills(replace=args.replace, texts_by_source=texts, n_process=args.processes)
+    print(f"✅ Updated {stats['updated']:,} of {stats['resumes'] + stats['job_descriptions']:,} records "
+          f"({stats['lexicon_terms']:,} lexicon terms, {stats['docs_per_s']:,} docs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# src/storage/base.py
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+
+def project_item(item: Dict, attributes: List[str]) -> Dict:
+    """Keeps only the given attribute paths of an item ('contact.email' keeps {'contact': {'email': ...}})."""
+    projected: Dict = {}
+    for attribute in attributes:
+        *parents, leaf = attribute.split('.')
+        source, target = item, projected
+        for part in parents:
+            source = source.get(part) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(part, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return projected
+
+
+class StorageBackend(ABC):
+    """
+    Item store behind DynamoDBHandler.
+
+    Items are dicts keyed by 'id'. 'type' (resume, job_description, ...) and
+    'metadata.source' (the S3 document an item was extracted from) are the
+    lookup fields every backend must be able to query on.
+    """
+
+    @abstractmethod
+    def put_item(self, item: Dict) -> None:
+        """Inserts or replaces an item."""
+
+    @abstractmethod
+    def get_item(self, item_id: str) -> Optional[Dict]:
+        """Returns the item with this id, or None."""
+
+    @abstractmethod
+    def put_item_if_version(self, item: Dict, expected_version: Optional[int]) -> bool:
+        """
+        Writes an item only if the stored copy is still at expected_version, atomically.
+
+        The stored 'version' attribute counts writes (missing = 0); None expects no
+        stored item with this id at all. The item is written with 'version' set to
+        expected_version + 1.
+
+        Returns:
+            False if another writer got there first (re-read and retry)
+        """
+
+    @abstractmethod
+    def delete_item(self, item_id: str) -> None:
+        """Deletes the item with this id (no error if it does not exist)."""
+
+    def get_items(self, item_ids: Iterable[str]) -> List[Dict]:
+        """Returns the items with these ids (missing ones are skipped); backends override this with a batched read."""
+        items = (self.get_item(item_id) for item_id in item_ids)
+        return [item for item in items if item is not None]
+
+    @abstractmethod
+    def query_by_type(self, item_type: str, attributes: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Returns every item of a given type.
+
+        attributes, if given, limits each item to these fields; nested fields are
+        dotted paths such as 'contact.email'.
+        """
+
+    @abstractmethod
+    def query_by_source(self, source: str, item_type: Optional[str] = None) -> List[Dict]:
+        """Returns the items extracted from a source document, optionally of one type."""
@@ -0,0 +1,160 @@
+# src/storage/corpus_snapshot.py
+"""
+Local columnar snapshot of the corpus, for a fast cold start.
+
+Resume and JD records are written to one Parquet file: each record as a JSON
+column, plus the embedding as a fixed-width float32 column so it loads as a
+single matrix. The file carries the storage corpus stamp it was taken at and
+the corpus version of its contents and the embedding backend that was active;
+it is only used while the stamp in storage and the active backend still match.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.embeddings.factory import active_embedding_backend
+from src.matching.semantic_matcher import has_embedding
+from src.observability.tracing import traced
+from src.storage.corpus_version import compute_corpus_version
+
+# Empty string disables the snapshot
+SNAPSHOT_PATH = os.getenv("CORPUS_SNAPSHOT_PATH", os.path.join("data", "corpus_snapshot.parquet"))
+KINDS = ("resume", "job_description")
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _embedding_dim(records: List[Dict]) -> int:
+    for record in records:
+        if has_embedding(record):
+            return len(record['embedding'])
+    return 0
+
+
+def write_corpus_snapshot(resumes: List[Dict], jds: List[Dict], stamp: Optional[str],
+                          path: Optional[str] = None) -> bool:
+    """
+    Writes the corpus to the snapshot file, replacing any earlier one.
+
+    Args:
+        resumes: Resume records (projections are fine; they are stored as given)
+        jds: Job description records
+        stamp: The storage corpus stamp read *before* the records were loaded
+        path: Snapshot file; defaults to SNAPSHOT_PATH
+
+    Returns:
+        True if the snapshot was written
+    """
+    path = SNAPSHOT_PATH if path is None else path
+    if not path or not stamp:
+        return False
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("⚠️ pyarrow is not installed; skipping the corpus snapshot")
+        return False
+
+    try:
+        records = [(kind, r) for kind, group in zip(KINDS, (resumes, jds)) for r in group if isinstance(r, dict)]
+        dim = _embedding_dim([r for _, r in records])
+        matrix = np.zeros((len(records), dim), dtype=np.float32)
+        embedded = np.zeros(len(records), dtype=bool)
+        bodies = []
+        for i, (_, record) in enumerate(records):
+            embedding = record.get('embedding')
+            if dim and has_embedding(record) and len(embedding) == dim:
+                matrix[i] = np.asarray([float(v) for v in embedding], dtype=np.float32)
+                embedded[i] = True
+            bodies.append(json.dumps({k: v for k, v in record.items() if k != 'embedding'}, default=_json_default))
+
+        embeddings = pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1)), dim)
+        table = pa.table({
+            "kind": pa.array([kind for kind, _ in records]).dictionary_encode(),
+            "id": [r.get('id') for _, r in records],
+            "record": bodies,
+            "has_embedding": embedded,
+            "embedding": embeddings,
+        }).replace_schema_metadata({
+            "stamp": stamp,
+            "corpus_version": compute_corpus_version([r for _, r in records]),
+            "dim": str(dim),
+            "embedding_backend": active_embedding_backend(),
+            "created_at": datetime.utcnow().isoformat(),
+        })
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        staging = f"{path}.{os.getpid()}.tmp"
+        pq.write_table(table, staging)
+        os.replace(staging, path)  # Readers see the old file or the new one, never half of one
+        return True
+    except Exception as e:
+        print(f"Error writing corpus snapshot to {path}: {e}")
+        return False
+
+
+@traced("storage.load_snapshot")
+def load_corpus_snapshot(stamp: Optional[str], path: Optional[str] = None) -> Optional[Tuple[List[Dict], List[Dict]]]:
+    """
+    Loads the corpus from the snapshot if it was taken at `stamp`.
+
+    Embeddings come back as read-only float32 rows of one matrix rather than
+    lists of floats, which is most of the saving over a storage scan.
+
+    Returns:
+        (resumes, jds), or None when the snapshot is missing, stale or unreadable
+    """
+    path = SNAPSHOT_PATH if path is None else path
+    if not path or not stamp or not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+
+    try:
+        started = time.perf_counter()
+        metadata = {k.decode(): v.decode() for k, v in (pq.read_schema(path).metadata or {}).items()}
+        if metadata.get("stamp") != stamp:
+            print("Corpus snapshot is stale; loading from storage")
+            return None
+        if metadata.get("embedding_backend") != active_embedding_backend():
+            # has_embedding was decided for another vector space
+            print("Corpus snapshot was written for another embedding backend; loading from storage")
+            return None
+
+        table = pq.read_table(path)
+        dim = int(metadata["dim"])
+        matrix = table.column("embedding").combine_chunks().flatten().to_numpy().reshape(-1, dim) if dim else None
+        if matrix is not None:
+            matrix.flags.writeable = False
+        embedded = table.column("has_embedding").to_numpy()
+        loaded = {kind: [] for kind in KINDS}
+        for i, (kind, body) in enumerate(zip(table.column("kind").to_pylist(), table.column("record").to_pylist())):
+            record = json.loads(body)
+            if embedded[i]:
+                record['embedding'] = matrix[i]
+            loaded[kind].append(record)
+
+        if compute_corpus_version(loaded["resume"] + loaded["job_description"]) != metadata.get("corpus_version"):
+            print(f"Corpus snapshot {path} doesn't match its corpus version; loading from storage")
+            return None
+        print(f"Loaded {len(loaded['resume'])} resumes and {len(loaded['job_description'])} job descriptions "
+              f"from the corpus snapshot in {time.perf_counter() - started:.2f}s")
+        return loaded["resume"], loaded["job_description"]
+    except Exception as e:
+        print(f"Error reading corpus snapshot {path}: {e}")
+        return None
+
+
+def refresh_corpus_snapshot(handler, path: Optional[str] = None) -> bool:
+    """Re-reads the corpus from storage (resumes as projections) and rewrites the snapshot."""
+    stamp = handler.get_corpus_stamp() or handler.touch_corpus()
+    return write_corpus_snapshot(handler.get_resume_projections(), handler.get_all_job_descriptions(), stamp, path)
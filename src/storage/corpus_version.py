@@ -0,0 +1,17 @@
+# src/storage/corpus_version.py
+import hashlib
+from typing import Dict, Iterable
+
+
+def compute_corpus_version(records: Iterable[Dict]) -> str:
+    """
+    Returns a short stamp that changes whenever a record is added, removed or re-saved.
+
+    Built from each record's id and last_updated, so it is cheap to compute and
+    independent of record order.
+    """
+    digest = hashlib.sha1()
+    for key in sorted(f"{r.get('id')}@{r.get('last_updated', '')}" for r in records if isinstance(r, dict)):
+        digest.update(key.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
@@ -0,0 +1,127 @@
+# src/storage/dynamodb_backend.py
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from src.aws_clients import get_resource
+from src.storage.base import StorageBackend
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_SIZE = 100
+BATCH_GET_MAX_RETRIES = 5
+
+
+def convert_floats_to_decimals(data):
+    """Recursively convert all float values to Decimals (DynamoDB rejects floats)"""
+    if isinstance(data, dict):
+        return {k: convert_floats_to_decimals(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        # Special handling for embedding lists
+        if data and all(isinstance(x, (float, int)) for x in data):
+            return [Decimal(str(x)) for x in data]
+        return [convert_floats_to_decimals(v) for v in data]
+    elif isinstance(data, float):
+        return Decimal(str(data))
+    return data
+
+
+def projection_expression(attributes: List[str]) -> Dict:
+    """
+    ProjectionExpression for dotted attribute paths, with every name behind a
+    placeholder (several fields, e.g. 'name' and 'type', are reserved words).
+    """
+    placeholders, paths = {}, []
+    for attribute in attributes:
+        for part in attribute.split('.'):
+            placeholders.setdefault(part, f"#p{len(placeholders)}")
+        paths.append('.'.join(placeholders[part] for part in attribute.split('.')))
+    return {
+        "ProjectionExpression": ", ".join(paths),
+        "ExpressionAttributeNames": {placeholder: part for part, placeholder in placeholders.items()},
+    }
+
+
+class DynamoDBBackend(StorageBackend):
+    """Live DynamoDB table. type/source lookups are filtered scans, since the table has no secondary indexes."""
+
+    def __init__(self, table_name: str, region_name: str = "eu-central-1"):
+        self.table_name = table_name
+        self.region_name = region_name
+        self._table = None
+
+    @property
+    def table(self):
+        # The boto3 resource is only created on the first actual read or write
+        if self._table is None:
+            self._table = get_resource('dynamodb', region_name=self.region_name).Table(self.table_name)
+        return self._table
+
+    def _scan(self, filter_expression=None, attributes: Optional[List[str]] = None) -> List[Dict]:
+        """Scans the whole table, following LastEvaluatedKey across 1 MB pages."""
+        kwargs = {"FilterExpression": filter_expression} if filter_expression is not None else {}
+        if attributes:
+            kwargs.update(projection_expression(attributes))
+        items = []
+        while True:
+            response = self.table.scan(**kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return items
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def put_item(self, item: Dict) -> None:
+        self.table.put_item(Item=convert_floats_to_decimals(item))
+
+    def put_item_if_version(self, item: Dict, expected_version: Optional[int]) -> bool:
+        from boto3.dynamodb.conditions import Attr
+        from botocore.exceptions import ClientError
+
+        if expected_version is None:
+            condition = Attr('id').not_exists()
+        elif expected_version == 0:
+            condition = Attr('id').exists() & (Attr('version').not_exists() | Attr('version').eq(0))
+        else:
+            condition = Attr('version').eq(expected_version)
+        item = dict(item, version=(expected_version or 0) + 1)
+        try:
+            self.table.put_item(Item=convert_floats_to_decimals(item), ConditionExpression=condition)
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+    def get_item(self, item_id: str) -> Optional[Dict]:
+        return self.table.get_item(Key={'id': item_id}).get('Item')
+
+    def get_items(self, item_ids: Iterable[str]) -> List[Dict]:
+        """BatchGetItem in chunks of 100, retrying UnprocessedKeys with exponential backoff."""
+        resource = get_resource('dynamodb', region_name=self.region_name)
+        ids = list(dict.fromkeys(item_ids))
+        found = {}
+        for start in range(0, len(ids), BATCH_GET_SIZE):
+            request = {self.table_name: {"Keys": [{'id': item_id} for item_id in ids[start:start + BATCH_GET_SIZE]]}}
+            for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+                response = resource.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    found[item['id']] = item
+                request = response.get('UnprocessedKeys') or {}
+                if not request:
+                    break
+                if attempt == BATCH_GET_MAX_RETRIES:
+                    raise RuntimeError(f"BatchGetItem left {len(request[self.table_name]['Keys'])} keys unprocessed")
+                time.sleep(0.05 * 2 ** attempt)
+        return [found[item_id] for item_id in ids if item_id in found]
+
+    def delete_item(self, item_id: str) -> None:
+        self.table.delete_item(Key={'id': item_id})
+
+    def query_by_type(self, item_type: str, attributes: Optional[List[str]] = None) -> List[Dict]:
+        from boto3.dynamodb.conditions import Attr
+        return self._scan(Attr('type').eq(item_type), attributes=attributes)
+
+    def query_by_source(self, source: str, item_type: Optional[str] = None) -> List[Dict]:
+        from boto3.dynamodb.conditions import Attr
+        condition = Attr('metadata.source').eq(source)
+        if item_type:
+            condition = condition & Attr('type').eq(item_type)
+        return self._scan(condition)
@@ -0,0 +1,29 @@
+# src/storage/factory.py
+import os
+from src.storage.base import StorageBackend
+
+# "dynamodb" (default) or "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "dynamodb")
+SQLITE_DIR = os.getenv("SQLITE_DIR", "data")
+
+
+def create_storage_backend(table_name: str, region_name: str = "eu-central-1", backend: str = None) -> StorageBackend:
+    """
+    Builds the storage backend for a table.
+
+    Args:
+        table_name: Logical table name (DynamoDB table, or the SQLite file name).
+        region_name: AWS region for the DynamoDB backend.
+        backend: "dynamodb" or "sqlite"; defaults to the STORAGE_BACKEND env var.
+
+    Returns:
+        A StorageBackend instance.
+    """
+    backend = (backend or STORAGE_BACKEND).lower()
+    if backend == "sqlite":
+        from src.storage.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(os.path.join(SQLITE_DIR, f"{table_name}.sqlite3"))
+    if backend == "dynamodb":
+        from src.storage.dynamodb_backend import DynamoDBBackend
+        return DynamoDBBackend(table_name, region_name=region_name)
+    raise ValueError(f"Unknown storage backend: {backend!r} (expected 'dynamodb' or 'sqlite')")
@@ -0,0 +1,139 @@
+# src/storage/sqlite_backend.py
+import json
+import os
+import sqlite3
+import threading
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.storage.base import StorageBackend, project_item
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    source TEXT,
+    data TEXT NOT NULL,
+    embedding BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_items_type ON items(type);
+CREATE INDEX IF NOT EXISTS idx_items_source ON items(source, type);
+"""
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Local single-file store for small deployments and test runs.
+
+    'id', 'type' and 'metadata.source' are indexed columns, and embeddings are
+    stored as float32 BLOBs next to the JSON body, so loading a corpus is an
+    indexed read with no Decimal conversion. Numbers come back as int/float.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared across Streamlit's script threads, serialized by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def _to_row(self, item: Dict):
+        body = dict(item)
+        embedding = body.pop("embedding", None)
+        blob = np.asarray([float(x) for x in embedding], dtype=np.float32).tobytes() if embedding else None
+        source = (body.get("metadata") or {}).get("source")
+        return (body["id"], body.get("type"), source, json.dumps(body, default=_json_default), blob)
+
+    @staticmethod
+    def _from_row(data: str, blob: Optional[bytes]) -> Dict:
+        item = json.loads(data)
+        if blob is not None:
+            item["embedding"] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return item
+
+    def _query(self, sql: str, params=(), attributes: Optional[List[str]] = None) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if attributes:
+            # Skip decoding the embedding BLOB when it isn't asked for
+            wanted = "embedding" in attributes
+            return [project_item(self._from_row(data, blob if wanted else None), attributes) for data, blob in rows]
+        return [self._from_row(data, blob) for data, blob in rows]
+
+    def put_item(self, item: Dict) -> None:
+        self.put_items([item])
+
+    def put_items(self, items: List[Dict]) -> None:
+        """Writes many items in one transaction."""
+        rows = [self._to_row(item) for item in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items (id, type, source, data, embedding) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def put_item_if_version(self, item: Dict, expected_version: Optional[int]) -> bool:
+        """Checks and writes in one IMMEDIATE transaction, which also holds off other processes' writers."""
+        row = self._to_row(dict(item, version=(expected_version or 0) + 1))
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                stored = self._conn.execute("SELECT data FROM items WHERE id = ?", (row[0],)).fetchone()
+                if expected_version is None:
+                    matches = stored is None
+                else:
+                    matches = stored is not None and int(json.loads(stored[0]).get("version") or 0) == expected_version
+                if matches:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO items (id, type, source, data, embedding) VALUES (?, ?, ?, ?, ?)", row
+                    )
+                self._conn.commit()
+                return matches
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def get_item(self, item_id: str) -> Optional[Dict]:
+        items = self._query("SELECT data, embedding FROM items WHERE id = ?", (item_id,))
+        return items[0] if items else None
+
+    def get_items(self, item_ids: Iterable[str]) -> List[Dict]:
+        """Reads the items with one IN query per 500 ids (SQLite's bound-parameter limit is 999)."""
+        ids = list(dict.fromkeys(item_ids))
+        found = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for item in self._query(f"SELECT data, embedding FROM items WHERE id IN ({placeholders})", chunk):
+                found[item["id"]] = item
+        return [found[item_id] for item_id in ids if item_id in found]
+
+    def delete_item(self, item_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            self._conn.commit()
+
+    def query_by_type(self, item_type: str, attributes: Optional[List[str]] = None) -> List[Dict]:
+        return self._query("SELECT data, embedding FROM items WHERE type = ?", (item_type,), attributes=attributes)
+
+    def query_by_source(self, source: str, item_type: Optional[str] = None) -> List[Dict]:
+        if item_type:
+            return self._query("SELECT data, embedding FROM items WHERE source = ? AND type = ?", (source, item_type))
+        return self._query("SELECT data, embedding FROM items WHERE source = ?", (source,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()